@@ -0,0 +1,257 @@
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional
+
+from tinydb import Query, TinyDB
+
+# Campos gravados por CryptoAssetsManager.save_crypto_asset
+ASSET_FIELDS = (
+    "preco_medio",
+    "percentual",
+    "pontos",
+    "meta_moeda",
+    "total_carteira",
+)
+
+
+class AssetStorage(ABC):
+    """
+    Interface dos backends de armazenamento dos ativos, indexados pelo campo "crypto".
+    """
+
+    @abstractmethod
+    def get(self, crypto: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def all(self) -> List[Dict[str, Any]]:
+        pass
+
+    def upsert(self, asset_data: Dict[str, Any]):
+        self.upsert_many([asset_data])
+
+    @abstractmethod
+    def upsert_many(self, assets: Iterable[Dict[str, Any]]):
+        pass
+
+    @abstractmethod
+    def delete_many(self, cryptos: Iterable[str]):
+        pass
+
+    def apply(self, assets: Iterable[Dict[str, Any]], removed: Iterable[str]):
+        """
+        Grava e remove ativos na mesma operação (uma transação, quando o backend suporta).
+        """
+        assets = list(assets)
+        removed = list(removed)
+        if assets:
+            self.upsert_many(assets)
+        if removed:
+            self.delete_many(removed)
+
+    def sync(self):
+        """
+        Garante que as escritas já feitas estejam gravadas em disco (fsync).
+        """
+
+    def close(self):
+        pass
+
+
+class TinyDBAssetStorage(AssetStorage):
+    def __init__(self, db_path: str = "crypto_db.json"):
+        """
+        Backend original em arquivo JSON (TinyDB).
+        """
+        self.db = TinyDB(db_path)
+        self.crypto_table = self.db.table("crypto_assets")
+
+    def get(self, crypto):
+        CryptoAsset = Query()
+        return self.crypto_table.get(CryptoAsset.crypto == crypto)
+
+    def all(self):
+        return self.crypto_table.all()
+
+    def upsert_many(self, assets):
+        # Agrupa em uma atualização e uma inserção: cada operação reescreve o arquivo
+        CryptoAsset = Query()
+        assets = list(assets)
+        existing = {asset["crypto"] for asset in self.crypto_table.all()}
+        updates = [
+            (asset_data, CryptoAsset.crypto == asset_data["crypto"])
+            for asset_data in assets
+            if asset_data["crypto"] in existing
+        ]
+        inserts = [
+            asset_data for asset_data in assets if asset_data["crypto"] not in existing
+        ]
+        if updates:
+            self.crypto_table.update_multiple(updates)
+        if inserts:
+            self.crypto_table.insert_multiple(inserts)
+
+    def delete_many(self, cryptos):
+        cryptos = list(cryptos)
+        if cryptos:
+            CryptoAsset = Query()
+            self.crypto_table.remove(CryptoAsset.crypto.one_of(cryptos))
+
+    def sync(self):
+        # O JSONStorage do TinyDB já faz flush e fsync a cada escrita
+        pass
+
+    def close(self):
+        self.db.close()
+
+
+class SQLiteAssetStorage(AssetStorage):
+    def __init__(self, db_path: str = "crypto_db.sqlite3"):
+        """
+        Backend SQLite em modo WAL, com chave primária em "crypto".
+
+        Cada thread usa a sua própria conexão; com WAL, leitores (como a thread
+        do Telegram) não bloqueiam a escrita do ciclo principal.
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crypto_assets (
+                crypto TEXT PRIMARY KEY,
+                preco_medio REAL,
+                percentual REAL,
+                pontos REAL,
+                meta_moeda REAL,
+                total_carteira REAL,
+                extra TEXT NOT NULL DEFAULT '{}'
+            )
+            """
+        )
+        connection.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=10)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        asset = json.loads(row["extra"])
+        asset["crypto"] = row["crypto"]
+        for field in ASSET_FIELDS:
+            asset[field] = row[field]
+        return asset
+
+    def get(self, crypto):
+        row = (
+            self._connection()
+            .execute("SELECT * FROM crypto_assets WHERE crypto = ?", (crypto,))
+            .fetchone()
+        )
+        return self._to_dict(row) if row else None
+
+    def all(self):
+        rows = self._connection().execute(
+            "SELECT * FROM crypto_assets ORDER BY rowid"
+        )
+        return [self._to_dict(row) for row in rows]
+
+    def upsert_many(self, assets):
+        connection = self._connection()
+        with connection:
+            self._upsert_rows(connection, assets)
+
+    def delete_many(self, cryptos):
+        connection = self._connection()
+        with connection:
+            self._delete_rows(connection, cryptos)
+
+    def apply(self, assets, removed):
+        connection = self._connection()
+        with connection:
+            self._upsert_rows(connection, assets)
+            self._delete_rows(connection, removed)
+
+    @staticmethod
+    def _upsert_rows(connection: sqlite3.Connection, assets):
+        rows = []
+        for asset_data in assets:
+            extra = {
+                key: value
+                for key, value in asset_data.items()
+                if key != "crypto" and key not in ASSET_FIELDS
+            }
+            rows.append(
+                (asset_data["crypto"],)
+                + tuple(asset_data.get(field) for field in ASSET_FIELDS)
+                + (json.dumps(extra),)
+            )
+        # Campos extras (ex.: meta_dollar) são preservados quando não informados
+        connection.executemany(
+            """
+            INSERT INTO crypto_assets
+                (crypto, preco_medio, percentual, pontos, meta_moeda, total_carteira, extra)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(crypto) DO UPDATE SET
+                preco_medio = excluded.preco_medio,
+                percentual = excluded.percentual,
+                pontos = excluded.pontos,
+                meta_moeda = excluded.meta_moeda,
+                total_carteira = excluded.total_carteira,
+                extra = CASE WHEN excluded.extra = '{}'
+                    THEN crypto_assets.extra ELSE excluded.extra END
+            """,
+            rows,
+        )
+
+    @staticmethod
+    def _delete_rows(connection: sqlite3.Connection, cryptos):
+        connection.executemany(
+            "DELETE FROM crypto_assets WHERE crypto = ?",
+            [(crypto,) for crypto in cryptos],
+        )
+
+    def sync(self):
+        # Com synchronous=NORMAL o commit não faz fsync do WAL; o checkpoint FULL faz
+        self._connection().execute("PRAGMA wal_checkpoint(FULL)")
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+def open_storage(db_path: str) -> AssetStorage:
+    """
+    Escolhe o backend pela extensão do arquivo: .db/.sqlite/.sqlite3 usam SQLite.
+    """
+    if db_path.endswith((".db", ".sqlite", ".sqlite3")):
+        return SQLiteAssetStorage(db_path)
+    return TinyDBAssetStorage(db_path)
+
+
+def migrate_tinydb_to_sqlite(json_path: str, sqlite_path: str) -> int:
+    """
+    Copia todos os ativos do arquivo TinyDB para o SQLite.
+
+    :return: Quantidade de ativos migrados.
+    """
+    source = TinyDBAssetStorage(json_path)
+    target = SQLiteAssetStorage(sqlite_path)
+    try:
+        assets = [dict(asset) for asset in source.all()]
+        target.upsert_many(assets)
+        return len(assets)
+    finally:
+        source.close()
+        target.close()
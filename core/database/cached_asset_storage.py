@@ -0,0 +1,166 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from core.database.asset_storage import AssetStorage
+
+logger = logging.getLogger(__name__)
+
+
+class CachedAssetStorage(AssetStorage):
+    def __init__(self, storage: AssetStorage, flush_interval: float = 5.0):
+        """
+        Cache write-back na frente de um AssetStorage.
+
+        Todos os ativos são carregados uma vez para um dicionário indexado por
+        símbolo; leituras vêm da memória e escritas apenas marcam o ativo como
+        sujo. Os ativos sujos são gravados em lote no intervalo configurado e
+        no fechamento, seguidos de fsync.
+
+        :param storage: Backend persistente (TinyDB ou SQLite).
+        :param flush_interval: Intervalo, em segundos, entre gravações em lote.
+        """
+        self.storage = storage
+        self.flush_interval = flush_interval
+        self._assets: Dict[str, Dict[str, Any]] = {
+            asset["crypto"]: dict(asset) for asset in storage.all()
+        }
+        self._dirty = set()
+        self._deleted = set()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        self.flushed_assets = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    def get(self, crypto):
+        with self._lock:
+            asset = self._assets.get(crypto)
+            if asset is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(asset)
+
+    def all(self):
+        with self._lock:
+            self.hits += 1
+            return [dict(asset) for asset in self._assets.values()]
+
+    def upsert_many(self, assets):
+        with self._lock:
+            self._upsert(assets)
+
+    def delete_many(self, cryptos):
+        with self._lock:
+            self._delete(cryptos)
+
+    def apply(self, assets, removed):
+        # Sob o mesmo lock: leitores veem o conjunto anterior ou o novo, nunca uma mistura
+        with self._lock:
+            self._upsert(assets)
+            self._delete(removed)
+
+    def _upsert(self, assets):
+        for asset_data in assets:
+            crypto = asset_data["crypto"]
+            # Mesmo comportamento do upsert: campos não informados são mantidos
+            self._assets.setdefault(crypto, {}).update(asset_data)
+            self._dirty.add(crypto)
+            self._deleted.discard(crypto)
+
+    def _delete(self, cryptos):
+        for crypto in cryptos:
+            self._assets.pop(crypto, None)
+            self._dirty.discard(crypto)
+            self._deleted.add(crypto)
+
+    def flush(self) -> int:
+        """
+        Grava os ativos sujos no backend em um único lote e faz fsync.
+
+        :return: Quantidade de ativos gravados ou removidos.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty and not self._deleted:
+                    return 0
+                dirty = [dict(self._assets[crypto]) for crypto in self._dirty]
+                deleted = list(self._deleted)
+                self._dirty = set()
+                self._deleted = set()
+
+            start = time.perf_counter()
+            try:
+                self.storage.apply(dirty, deleted)
+                self.storage.sync()
+            except Exception:
+                # Devolve os ativos à fila para a próxima tentativa
+                with self._lock:
+                    for asset in dirty:
+                        if asset["crypto"] not in self._deleted:
+                            self._dirty.add(asset["crypto"])
+                    for crypto in deleted:
+                        if crypto not in self._dirty:
+                            self._deleted.add(crypto)
+                raise
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            self.flushes += 1
+            self.flushed_assets += len(dirty) + len(deleted)
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            return len(dirty) + len(deleted)
+
+    def sync(self):
+        self.flush()
+
+    def start(self):
+        """
+        Inicia a gravação periódica em segundo plano.
+        """
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Erro ao gravar ativos no banco: {e}")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        self.flush()
+        self.storage.close()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "assets": len(self._assets),
+                "dirty": len(self._dirty) + len(self._deleted),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else None,
+                "flushes": self.flushes,
+                "flushed_assets": self.flushed_assets,
+                "last_flush_ms": self.last_flush_ms,
+                "max_flush_ms": self.max_flush_ms,
+            }
@@ -1,20 +1,21 @@
-from tinydb import TinyDB, Query
+from core.database.asset_storage import AssetStorage, open_storage
 
 
 class CryptoAssetsManager:
-    def __init__(self, db_path="crypto_db.json"):
+    def __init__(self, db_path="crypto_db.json", storage: AssetStorage = None):
         """
         Gerenciador para acessar dados do arquivo crypto_db.json.
+
+        :param db_path: Arquivo do banco; .db/.sqlite/.sqlite3 usam o backend SQLite.
+        :param storage: Backend já instanciado, se preferir escolhê-lo diretamente.
         """
-        self.db = TinyDB(db_path)
-        self.crypto_table = self.db.table("crypto_assets")
+        self.storage = storage or open_storage(db_path)
 
     def get_asset_data(self, crypto_name):
-        CryptoAsset = Query()
-        return self.crypto_table.get(CryptoAsset.crypto == crypto_name)
+        return self.storage.get(crypto_name)
 
     def get_all_assets(self):
-        return self.crypto_table.all()
+        return self.storage.all()
 
     def get_asset_percentage(self, crypto_name):
         asset = self.get_asset_data(crypto_name)
@@ -40,9 +41,6 @@ class CryptoAssetsManager:
         """
         Salva ou atualiza os dados de um ativo no banco de dados.
         """
-        CryptoAsset = Query()
-        existing_asset = self.crypto_table.get(CryptoAsset.crypto == crypto)
-
         asset_data = {
             "crypto": crypto,
             "preco_medio": preco_medio,
@@ -51,8 +49,19 @@ class CryptoAssetsManager:
             "meta_moeda": meta_moeda,
             "total_carteira": total_carteira,
         }
+        self.storage.upsert(asset_data)
+
+    def apply_changes(self, assets, removed=()):
+        """
+        Grava vários ativos e remove outros de uma só vez.
 
-        if existing_asset:
-            self.crypto_table.update(asset_data, CryptoAsset.crypto == crypto)
-        else:
-            self.crypto_table.insert(asset_data)
+        :param assets: Dicionários completos dos ativos novos ou alterados.
+        :param removed: Nomes dos ativos a remover.
+        """
+        self.storage.apply(assets, removed)
+
+    def close(self):
+        """
+        Grava pendências e fecha o banco de dados.
+        """
+        self.storage.close()
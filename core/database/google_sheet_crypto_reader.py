@@ -1,16 +1,62 @@
-import pandas as pd
+import csv
+import io
+import re
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional
 
+from core.services.http_transport import HttpTransport, get_http_transport
 from src.config import get_config
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Coluna da planilha -> campo no banco de dados
+SHEET_COLUMNS = {
+    "Crypto": "crypto",
+    "Preço Médio": "preco_medio",
+    "Percentual": "percentual",
+    "Pontos": "pontos",
+    "meta Moeda": "meta_moeda",
+    "Total (Carteira)": "total_carteira",
+}
+
+# "R$ 1.234,56", "$10,00", "12,5%", "0.0005", "-3"
+_NUMBER_PATTERN = re.compile(r"^(?:R?\$)?\s*([-+]?[\d.]*\d(?:,\d*)?)\s*%?$")
+
+
+def parse_number(text: str, thousands: bool = False) -> Optional[float]:
+    """
+    Converte um número no formato da planilha para float.
+
+    Com vírgula decimal, os pontos são separadores de milhar; sem vírgula, o
+    ponto só é removido quando thousands=True (caso do preço médio).
+
+    :param text: Texto da célula.
+    :param thousands: Trata o ponto como separador de milhar mesmo sem vírgula.
+    :return: Valor convertido, ou None para célula vazia.
+    """
+    text = text.strip()
+    if not text:
+        return None
+    match = _NUMBER_PATTERN.match(text)
+    if match is None:
+        # Ex.: notação científica exportada pela planilha
+        return float(text)
+    number = match.group(1)
+    if thousands or "," in number:
+        number = number.replace(".", "")
+    return float(number.replace(",", "."))
+
 
 class GoogleSheetCryptoReader:
-    def __init__(self, sheet_url: str):
+    def __init__(self, sheet_url: str, transport: HttpTransport = None):
         """
         Classe para acessar e processar dados de uma aba específica de uma planilha no Google Sheets.
 
         :param sheet_url: URL pública da planilha no formato Google Sheets.
+        :param transport: Transporte HTTP do modo streaming (usa o compartilhado por padrão).
         """
         self.sheet_url = sheet_url
+        self.transport = transport
 
     def get_csv_url(self) -> str:
         """
@@ -21,12 +67,14 @@ class GoogleSheetCryptoReader:
         base_url = self.sheet_url.split("/edit")[0]
         return f"{base_url}/gviz/tq?tqx=out:csv"
 
-    def fetch_crypto_table(self) -> pd.DataFrame:
+    def fetch_crypto_table(self) -> "pd.DataFrame":
         """
         Busca os dados da aba "Cypto" da planilha e retorna como um DataFrame.
 
         :return: pandas.DataFrame com os dados da aba "Cypto".
         """
+        import pandas as pd
+
         try:
             # Obtém o URL do CSV
             csv_url = self.get_csv_url()
@@ -38,6 +86,79 @@ class GoogleSheetCryptoReader:
         except Exception as e:
             raise RuntimeError(f"Erro ao buscar os dados da planilha: {e}")
 
+    def parse_csv(self, content: bytes) -> "pd.DataFrame":
+        """
+        Converte o CSV já baixado (ex.: pelo SheetWatcher) em DataFrame.
+
+        :param content: Conteúdo do CSV em bytes.
+        :return: pandas.DataFrame com os dados da aba "Cypto".
+        """
+        import pandas as pd
+
+        return pd.read_csv(io.BytesIO(content))
+
+    def fetch_crypto_assets(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Modo streaming, sem pandas: lê o CSV linha a linha enquanto baixa.
+
+        :return: Ativos indexados pelo nome, no formato salvo no banco de dados.
+        """
+        transport = self.transport or get_http_transport()
+        try:
+            with transport.get(self.get_csv_url(), stream=True) as response:
+                response.raise_for_status()
+                response.encoding = response.encoding or "utf-8"
+                return self.parse_crypto_assets(
+                    response.iter_lines(decode_unicode=True)
+                )
+        except Exception as e:
+            raise RuntimeError(f"Erro ao buscar os dados da planilha: {e}")
+
+    def parse_crypto_assets(self, lines: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Lê apenas as colunas de SHEET_COLUMNS e converte os números em uma passada.
+
+        :param lines: Linhas do CSV (ou o conteúdo em bytes, já baixado).
+        :return: Ativos indexados pelo nome; em nomes repetidos, vale a última linha.
+        """
+        if isinstance(lines, bytes):
+            lines = lines.decode("utf-8").splitlines()
+        rows = csv.reader(lines)
+        header = next(rows, None)
+        if header is None:
+            return {}
+        header = [column.strip() for column in header]
+        missing = [column for column in SHEET_COLUMNS if column not in header]
+        if missing:
+            raise KeyError(f"Colunas ausentes na planilha: {missing}")
+        crypto_i, preco_i, percentual_i, pontos_i, meta_i, total_i = (
+            header.index(column) for column in SHEET_COLUMNS
+        )
+        width = max(crypto_i, preco_i, percentual_i, pontos_i, meta_i, total_i) + 1
+        nan = float("nan")
+
+        assets = {}
+        for row in rows:
+            if len(row) < width:
+                row = row + [""] * (width - len(row))
+            crypto = row[crypto_i].strip()
+            # Linhas sem nome de ativo (totais, linhas em branco) são ignoradas
+            if not crypto:
+                continue
+            preco_medio = parse_number(row[preco_i], thousands=True)
+            percentual = parse_number(row[percentual_i])
+            pontos = parse_number(row[pontos_i])
+            meta_moeda = parse_number(row[meta_i])
+            assets[crypto] = {
+                "crypto": crypto,
+                "preco_medio": nan if preco_medio is None else preco_medio,
+                "percentual": nan if percentual is None else percentual,
+                "pontos": nan if pontos is None else pontos,
+                "meta_moeda": nan if meta_moeda is None else meta_moeda,
+                "total_carteira": parse_number(row[total_i]),
+            }
+        return assets
+
 
 if __name__ == "__main__":
     # Configuração inicial
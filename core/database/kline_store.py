@@ -0,0 +1,208 @@
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Colunas gravadas por símbolo: open_time em milissegundos (int64) e OHLCV (float64)
+KLINE_COLUMNS = (
+    ("open_time", np.int64),
+    ("open", np.float64),
+    ("high", np.float64),
+    ("low", np.float64),
+    ("close", np.float64),
+    ("volume", np.float64),
+)
+
+INTERVAL_MS = {
+    "1m": 60_000,
+    "3m": 3 * 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "1h": 3_600_000,
+    "2h": 2 * 3_600_000,
+    "4h": 4 * 3_600_000,
+    "6h": 6 * 3_600_000,
+    "8h": 8 * 3_600_000,
+    "12h": 12 * 3_600_000,
+    "1d": 86_400_000,
+}
+
+
+class KlineStore:
+    def __init__(self, root: str = "klines", interval: str = "1m"):
+        """
+        Histórico local de candles em arquivos colunares por símbolo.
+
+        Cada símbolo tem um arquivo binário por coluna (root/interval/SYMBOL/coluna.bin),
+        só com anexação no final. As consultas mapeiam os arquivos em memória
+        (np.memmap) e devolvem fatias, sem copiar os dados.
+
+        :param root: Diretório base do histórico.
+        :param interval: Intervalo dos candles (ex.: "1m", "1h").
+        """
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"Intervalo de kline não suportado: {interval}")
+        self.root = root
+        self.interval = interval
+        self.interval_ms = INTERVAL_MS[interval]
+        self._maps: Dict[str, Tuple[int, Dict[str, np.memmap]]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self._repaired = set()
+
+    def _symbol_dir(self, symbol: str) -> str:
+        return os.path.join(self.root, self.interval, symbol.upper())
+
+    def _column_path(self, symbol: str, column: str) -> str:
+        return os.path.join(self._symbol_dir(symbol), f"{column}.bin")
+
+    def _lock(self, symbol: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(symbol.upper(), threading.Lock())
+
+    def symbols(self) -> List[str]:
+        directory = os.path.join(self.root, self.interval)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(os.listdir(directory))
+
+    def _repair(self, symbol: str, force: bool = False):
+        """
+        Corta as colunas no menor número de linhas completas, desfazendo uma
+        anexação interrompida no meio.
+        """
+        if symbol in self._repaired and not force:
+            return
+        sizes = []
+        for column, _ in KLINE_COLUMNS:
+            path = self._column_path(symbol, column)
+            sizes.append(os.path.getsize(path) if os.path.exists(path) else 0)
+        rows = min(
+            size // np.dtype(dtype).itemsize
+            for (_, dtype), size in zip(KLINE_COLUMNS, sizes)
+        )
+        # Compara em bytes: uma escrita cortada deixa bytes de uma linha parcial
+        for (column, dtype), size in zip(KLINE_COLUMNS, sizes):
+            if size != rows * np.dtype(dtype).itemsize:
+                with open(self._column_path(symbol, column), "r+b") as file:
+                    file.truncate(rows * np.dtype(dtype).itemsize)
+        self._repaired.add(symbol)
+
+    def count(self, symbol: str) -> int:
+        symbol = symbol.upper()
+        with self._lock(symbol):
+            self._repair(symbol)
+            path = self._column_path(symbol, "open_time")
+            if not os.path.exists(path):
+                return 0
+            return os.path.getsize(path) // np.dtype(np.int64).itemsize
+
+    def last_open_time(self, symbol: str) -> Optional[int]:
+        """
+        Retorna o open time do último candle salvo, ou None se não há histórico.
+        """
+        if not self.count(symbol):
+            return None
+        with open(self._column_path(symbol, "open_time"), "rb") as file:
+            file.seek(-8, os.SEEK_END)
+            return int(np.frombuffer(file.read(8), dtype=np.int64)[0])
+
+    def append(self, symbol: str, klines: List[list]) -> int:
+        """
+        Anexa candles no formato da Binance; os já salvos são ignorados.
+
+        :return: Quantidade de candles gravados.
+        """
+        symbol = symbol.upper()
+        last = self.last_open_time(symbol)
+        rows = [kline for kline in klines if last is None or kline[0] > last]
+        if not rows:
+            return 0
+        columns = {
+            column: np.array([row[i] for row in rows], dtype=dtype)
+            for i, (column, dtype) in enumerate(KLINE_COLUMNS)
+        }
+        if np.any(np.diff(columns["open_time"]) <= 0):
+            raise ValueError(f"Candles fora de ordem para {symbol}.")
+
+        with self._lock(symbol):
+            os.makedirs(self._symbol_dir(symbol), exist_ok=True)
+            self._repair(symbol, force=True)
+            # open_time por último: ele define quantas linhas estão completas
+            for column, _ in reversed(KLINE_COLUMNS):
+                with open(self._column_path(symbol, column), "ab") as file:
+                    file.write(columns[column].tobytes())
+                    file.flush()
+                    os.fsync(file.fileno())
+        return len(rows)
+
+    def _mapped(self, symbol: str) -> Optional[Dict[str, np.memmap]]:
+        rows = self.count(symbol)
+        if not rows:
+            return None
+        cached = self._maps.get(symbol)
+        if cached is not None and cached[0] == rows:
+            return cached[1]
+        # Remapeia só quando o arquivo cresceu
+        maps = {
+            column: np.memmap(
+                self._column_path(symbol, column), dtype=dtype, mode="r", shape=(rows,)
+            )
+            for column, dtype in KLINE_COLUMNS
+        }
+        self._maps[symbol] = (rows, maps)
+        return maps
+
+    def query(
+        self, symbol: str, start: int = None, end: int = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Retorna os candles com start <= open_time < end como visões somente leitura.
+
+        :param start: Início, em milissegundos (opcional).
+        :param end: Fim exclusivo, em milissegundos (opcional).
+        :return: Dicionário coluna -> array (vazio se não há histórico).
+        """
+        symbol = symbol.upper()
+        maps = self._mapped(symbol)
+        if maps is None:
+            return {column: np.empty(0, dtype=dtype) for column, dtype in KLINE_COLUMNS}
+        open_time = maps["open_time"]
+        first = 0 if start is None else int(np.searchsorted(open_time, start, "left"))
+        last = (
+            len(open_time)
+            if end is None
+            else int(np.searchsorted(open_time, end, "left"))
+        )
+        return {column: values[first:last] for column, values in maps.items()}
+
+    def close_matrix(
+        self, symbols: Iterable[str], start: int, end: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Alinha os fechamentos de vários símbolos em uma grade regular de tempo.
+
+        Candles ausentes repetem o último fechamento conhecido (NaN antes do primeiro).
+
+        :return: (timestamps, matriz tempo x símbolo de fechamentos).
+        """
+        symbols = list(symbols)
+        start -= start % self.interval_ms
+        timestamps = np.arange(start, end, self.interval_ms, dtype=np.int64)
+        matrix = np.full((len(timestamps), len(symbols)), np.nan)
+        for j, symbol in enumerate(symbols):
+            data = self.query(symbol, start, end)
+            if not len(data["open_time"]):
+                continue
+            positions = (data["open_time"] - start) // self.interval_ms
+            matrix[positions, j] = data["close"]
+            # Preenche lacunas com o último valor válido
+            valid = ~np.isnan(matrix[:, j])
+            index = np.where(valid, np.arange(len(timestamps)), 0)
+            np.maximum.accumulate(index, out=index)
+            filled = matrix[index, j]
+            filled[: np.argmax(valid)] = np.nan
+            matrix[:, j] = filled
+        return timestamps, matrix
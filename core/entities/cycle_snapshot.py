@@ -0,0 +1,38 @@
+class CycleSnapshot:
+    __slots__ = (
+        "finished_at",
+        "duration_ms",
+        "portfolio_value",
+        "assets",
+        "recommendations",
+        "orders",
+    )
+
+    def __init__(
+        self,
+        finished_at,
+        duration_ms,
+        portfolio_value,
+        assets,
+        recommendations,
+        orders,
+    ):
+        """
+        Resultado imutável do último ciclo de análise, lido pelos comandos do Telegram.
+
+        :param finished_at: Horário (epoch) do fim do ciclo.
+        :param duration_ms: Duração do ciclo, em milissegundos.
+        :param portfolio_value: Valor total do portfólio, em dólares.
+        :param assets: Ativos no formato de calculate_portfolio_details.
+        :param recommendations: Recomendações do AssetAnalyzer.
+        :param orders: Lista de OrderResult das ordens enviadas.
+        """
+        self.finished_at = finished_at
+        self.duration_ms = duration_ms
+        self.portfolio_value = portfolio_value
+        self.assets = tuple(dict(asset) for asset in assets)
+        self.recommendations = tuple(dict(r) for r in recommendations)
+        self.orders = tuple(orders)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
@@ -0,0 +1,45 @@
+class OrderResult:
+    __slots__ = (
+        "symbol",
+        "action",
+        "quantity",
+        "price",
+        "status",
+        "order_id",
+        "latency_ms",
+        "error",
+    )
+
+    def __init__(
+        self,
+        symbol,
+        action,
+        quantity,
+        price,
+        status,
+        order_id=None,
+        latency_ms=0.0,
+        error=None,
+    ):
+        self.symbol = symbol
+        self.action = action
+        self.quantity = quantity
+        self.price = price
+        self.status = status
+        self.order_id = order_id
+        self.latency_ms = latency_ms
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __str__(self):
+        return (
+            f"Ordem: {self.action} {self.symbol}, Quantidade: {self.quantity}, "
+            f"Preço: {self.price}, Status: {self.status}, ID: {self.order_id}, "
+            f"Latência: {self.latency_ms:.1f} ms"
+        )
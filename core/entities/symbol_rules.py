@@ -0,0 +1,100 @@
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+
+# Filtros do exchangeInfo lidos pelas regras de negociação
+RULE_FILTERS = ("LOT_SIZE", "NOTIONAL", "PRICE_FILTER")
+
+
+def _precision(value: float) -> int:
+    return abs(Decimal(str(value)).as_tuple().exponent)
+
+
+class SymbolRules:
+    __slots__ = (
+        "symbol",
+        "min_qty",
+        "step_size",
+        "min_notional",
+        "max_notional",
+        "tick_size",
+        "quantity_precision",
+        "price_precision",
+    )
+
+    def __init__(
+        self, symbol, min_qty, step_size, min_notional, max_notional, tick_size
+    ):
+        self.symbol = symbol
+        self.min_qty = float(min_qty)
+        self.step_size = float(step_size)
+        self.min_notional = float(min_notional)
+        self.max_notional = float(max_notional)
+        self.tick_size = float(tick_size)
+        self.quantity_precision = _precision(self.step_size)
+        self.price_precision = _precision(self.tick_size)
+
+    @classmethod
+    def from_market(cls, market: Dict[str, Any]) -> "SymbolRules":
+        filters = {f["filterType"]: f for f in market["filters"]}
+        lot_size = filters["LOT_SIZE"]
+        notional = filters["NOTIONAL"]
+        return cls(
+            symbol=market["symbol"],
+            min_qty=lot_size["minQty"],
+            step_size=lot_size["stepSize"],
+            min_notional=notional["minNotional"],
+            max_notional=notional.get("maxNotional", float("inf")),
+            tick_size=filters["PRICE_FILTER"]["tickSize"],
+        )
+
+    def format_quantity(self, quantity: float) -> str:
+        """
+        Formata a quantidade com a precisão do stepSize do par.
+        """
+        formatted_quantity = f"{quantity:.{self.quantity_precision}f}"
+        return (
+            formatted_quantity.rstrip("0").rstrip(".")
+            if "." in formatted_quantity
+            else formatted_quantity
+        )
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "min_qty": self.min_qty,
+            "step_size": self.step_size,
+            "min_notional": self.min_notional,
+            "max_notional": self.max_notional,
+            "tick_size": self.tick_size,
+        }
+
+    def __str__(self):
+        return (
+            f"Regras: {self.symbol}, Passo: {self.step_size}, "
+            f"Notional mínimo: {self.min_notional}, Tick: {self.tick_size}"
+        )
+
+
+class SymbolRulesIndex:
+    def __init__(self, rules: Dict[str, SymbolRules]):
+        """
+        Índice das regras de negociação por símbolo, montado uma vez por versão do exchangeInfo.
+        """
+        self.rules = rules
+
+    @classmethod
+    def from_exchange_info(cls, exchange_info: Dict[str, Any]) -> "SymbolRulesIndex":
+        rules = {}
+        for market in exchange_info["symbols"]:
+            try:
+                rules[market["symbol"]] = SymbolRules.from_market(market)
+            except KeyError:
+                # Mercado sem algum dos filtros usados nas ordens
+                continue
+        return cls(rules)
+
+    def get(self, symbol: str) -> Optional[SymbolRules]:
+        return self.rules.get(symbol)
+
+    def __len__(self):
+        return len(self.rules)
@@ -0,0 +1,57 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from core.services.binance_private_service import BinancePrivateService
+from core.services.binance_public_service import BinancePublicService
+
+
+class _AsyncAdapter:
+    def __init__(self, executor: ThreadPoolExecutor):
+        self.executor = executor
+
+    async def _call(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, partial(function, *args, **kwargs)
+        )
+
+
+class AsyncBinancePublicService(_AsyncAdapter):
+    def __init__(self, service: BinancePublicService, executor: ThreadPoolExecutor):
+        """
+        Versão assíncrona do BinancePublicService.
+
+        As chamadas reaproveitam o serviço síncrono (pool de conexões, cache de
+        preços e relógio) e rodam no executor compartilhado do loop de eventos.
+        """
+        super().__init__(executor)
+        self.service = service
+
+    async def get_current_price(self, asset_name):
+        return await self._call(self.service.get_current_price, asset_name)
+
+    async def get_current_prices(self, symbols=None):
+        return await self._call(self.service.get_current_prices, symbols)
+
+    async def get_exchange_info(self, symbols=None):
+        return await self._call(self.service.get_exchange_info, symbols)
+
+
+class AsyncBinancePrivateService(_AsyncAdapter):
+    def __init__(self, service: BinancePrivateService, executor: ThreadPoolExecutor):
+        """
+        Versão assíncrona do BinancePrivateService.
+        """
+        super().__init__(executor)
+        self.service = service
+
+    async def get_account_assets(self):
+        return await self._call(self.service.get_account_assets)
+
+    async def place_buy_order(self, symbol: str, quantity: str, price: float):
+        return await self._call(self.service.place_buy_order, symbol, quantity, price)
+
+    async def place_sell_order(self, symbol: str, quantity: str, price: float):
+        return await self._call(self.service.place_sell_order, symbol, quantity, price)
+
@@ -1,47 +1,68 @@
-import requests
+import json
+
 from config import get_config
+from core.services.binance_payloads import loads
+from core.services.http_transport import HttpTransport, get_http_transport
+from core.services.rate_governor import NORMAL, RateGovernor, get_rate_governor
+
+
+class BinanceAPIError(Exception):
+    def __init__(self, status_code, text):
+        """
+        Erro retornado pela API da Binance, com o código de erro da resposta.
+        """
+        super().__init__(f"Erro na requisição: {status_code} - {text}")
+        self.status_code = status_code
+        self.code = None
+        try:
+            self.code = json.loads(text).get("code")
+        except (ValueError, AttributeError):
+            pass
 
 
 class BinanceBaseService:
-    def __init__(self):
+    def __init__(
+        self, transport: HttpTransport = None, rate_governor: RateGovernor = None
+    ):
         config = get_config()
         self.base_url = config["base_url"]
+        self.transport = transport or get_http_transport()
+        self.rate_governor = rate_governor or get_rate_governor()
 
-    def _make_request(self, endpoint, request_type: str, params=None, headers=None):
+    def _make_request(
+        self,
+        endpoint,
+        request_type: str,
+        params=None,
+        headers=None,
+        priority=NORMAL,
+        decoder=None,
+    ):
         """
         Realiza uma requisição genérica para a API da Binance.
+        :param priority: Prioridade no governador de limites (HIGH, NORMAL ou LOW).
+        :param decoder: Função que lê o corpo bruto (bytes); por padrão, o JSON inteiro.
         """
         url = self.base_url + endpoint
         params = params or {}
         headers = headers or {}
 
+        self.rate_governor.acquire(endpoint, params, request_type, priority)
+
         if request_type.upper() == "GET":
-            response = requests.get(url, params=params, headers=headers)
+            response = self.transport.get(url, params=params, headers=headers)
         elif request_type.upper() == "POST":
-            response = requests.post(url, data=params, headers=headers)
+            response = self.transport.post(url, data=params, headers=headers)
         elif request_type.upper() == "PUT":
-            response = requests.put(url, data=params, headers=headers)
+            response = self.transport.put(url, data=params, headers=headers)
         elif request_type.upper() == "DELETE":
-            response = requests.delete(url, params=params, headers=headers)
+            response = self.transport.delete(url, params=params, headers=headers)
         else:
             raise ValueError(f"Tipo de requisi o desconhecido: {request_type}")
+        self.rate_governor.update_from_response(response)
         if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(
-                f"Erro na requisição: {response.status_code} - {response.text}"
-            )
-
-    def _get_server_time(self):
-        """
-        Obtém o tempo atual do servidor da Binance para sincronizar o timestamp.
-        """
-        url = self.base_url + "/api/v3/time"
-        response = requests.get(url)  # Chama requests diretamente para evitar recursão
-        if response.status_code == 200:
-            data = response.json()
-            return data["serverTime"]
+            if decoder is not None:
+                return decoder(response.content)
+            return loads(response.content)
         else:
-            raise Exception(
-                f"Erro ao obter tempo do servidor: {response.status_code} - {response.text}"
-            )
+            raise BinanceAPIError(response.status_code, response.text)
@@ -0,0 +1,184 @@
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from core.entities.symbol_rules import RULE_FILTERS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Esquemas dos endpoints: só os campos usados pelo bot são extraídos.
+# As respostas da Binance mantêm a ordem das chaves, o que permite ler os
+# objetos simples direto dos bytes, sem montar um dict por item.
+_TICKER_PRICE = re.compile(rb'\{"symbol":"([^"]+)","price":"([^"]+)"\}')
+# Até quantos pares a busca direta nos bytes é mais rápida que varrer a lista
+_LOOKUP_LIMIT = 16
+_ACCOUNT_BALANCE = re.compile(
+    rb'\{"asset":"([^"]+)","free":"([^"]+)","locked":"([^"]+)"\}'
+)
+
+# Campos de cada mercado do exchangeInfo mantidos em memória
+MARKET_FIELDS = ("symbol", "status", "baseAsset", "quoteAsset")
+# Mercados do exchangeInfo lidos um a um: os campos de MARKET_FIELDS e os
+# objetos de filtro (sem objetos aninhados) saem dos bytes; orderTypes,
+# permissionSets etc. nunca são decodificados
+_MARKET = re.compile(
+    rb'\{"symbol":"([^"]+)","status":"([^"]+)","baseAsset":"([^"]+)",'
+)
+_QUOTE_ASSET = re.compile(rb'"quoteAsset":"([^"]+)"')
+_FILTERS = re.compile(rb'"filters":\[([^\]]*)\]')
+_RULE_FILTER = re.compile(
+    rb'\{"filterType":"(?:'
+    + b"|".join(re.escape(name.encode("ascii")) for name in RULE_FILTERS)
+    + rb')"[^{}]*\}'
+)
+
+
+def loads(content) -> Any:
+    """
+    Decodifica JSON com orjson quando disponível, ou com o json da biblioteca padrão.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _is_zero(amount: bytes) -> bool:
+    # "0.00000000" -> b""; evita converter os saldos zerados para float
+    return not amount.strip(b"0.")
+
+
+def decode_ticker_prices(
+    content: bytes, symbols: Optional[Iterable[str]] = None
+) -> Dict[str, float]:
+    """
+    Lê /api/v3/ticker/price (um par ou a lista completa) como símbolo -> preço.
+
+    :param content: Corpo bruto da resposta.
+    :param symbols: Pares de interesse; até _LOOKUP_LIMIT pares, só eles são lidos.
+    """
+    symbols = list(symbols or ())
+    n_tickers = content.count(b'"symbol":')
+    if 0 < len(symbols) <= _LOOKUP_LIMIT and (
+        content.count(b'{"symbol":"') == content.count(b'","price":"') == n_tickers
+    ):
+        # Poucos pares: cada um é procurado direto nos bytes, sem varrer a lista
+        prices = {}
+        for symbol in symbols:
+            key = b'{"symbol":"%s","price":"' % symbol.encode("ascii")
+            start = content.find(key)
+            if start >= 0:
+                start += len(key)
+                prices[symbol] = float(content[start : content.index(b'"', start)])
+        return prices
+
+    wanted = {symbol.encode("ascii") for symbol in symbols} if symbols else None
+    matches = _TICKER_PRICE.findall(content)
+    if len(matches) != n_tickers:
+        # Formato inesperado (espaços, ordem das chaves): decodificação completa
+        data = loads(content)
+        tickers = data if isinstance(data, list) else [data]
+        matches = [
+            (ticker["symbol"].encode("ascii"), ticker["price"]) for ticker in tickers
+        ]
+    return {
+        symbol.decode("ascii"): float(price)
+        for symbol, price in matches
+        if wanted is None or symbol in wanted
+    }
+
+
+def decode_account_balances(content: bytes) -> List[Dict[str, Any]]:
+    """
+    Lê os saldos de /api/v3/account, descartando os ativos zerados.
+
+    :return: Lista no formato de BinancePrivateService.get_account_assets.
+    """
+    matches = _ACCOUNT_BALANCE.findall(content)
+    if len(matches) != content.count(b'"asset":'):
+        matches = [
+            (
+                balance["asset"].encode("ascii"),
+                balance["free"].encode("ascii"),
+                balance["locked"].encode("ascii"),
+            )
+            for balance in loads(content)["balances"]
+        ]
+    return [
+        {
+            "asset": asset.decode("ascii"),
+            "free": float(free),
+            "locked": float(locked),
+        }
+        for asset, free, locked in matches
+        if not (_is_zero(free) and _is_zero(locked))
+    ]
+
+
+def decode_exchange_info(
+    content: bytes, symbols: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """
+    Reduz o exchangeInfo aos campos de MARKET_FIELDS e aos filtros de RULE_FILTERS.
+
+    A projeção acontece na leitura: cada mercado é delimitado nos bytes e só os
+    filtros usados são decodificados, sem montar a resposta completa. O
+    resultado tem o mesmo formato da resposta original ({"symbols": [...]}),
+    então SymbolRulesIndex e o ExchangeInfoCache continuam funcionando; campos
+    voláteis como serverTime ficam de fora.
+
+    :param symbols: Pares de interesse; os demais mercados são descartados.
+    """
+    wanted = set(symbols) if symbols else None
+    starts = list(_MARKET.finditer(content))
+    if len(starts) != content.count(b'"symbol":'):
+        return _decode_exchange_info_full(content, wanted)
+
+    markets = []
+    # Filtros mantidos de todos os mercados, decodificados em uma única chamada
+    rules = []
+    ends = [match.start() for match in starts[1:]] + [len(content)]
+    for match, end in zip(starts, ends):
+        symbol = match.group(1).decode("ascii")
+        if wanted is not None and symbol not in wanted:
+            continue
+        quote_asset = _QUOTE_ASSET.search(content, match.end(), end)
+        filters = _FILTERS.search(content, match.end(), end)
+        if quote_asset is None or filters is None:
+            return _decode_exchange_info_full(content, wanted)
+        kept = _RULE_FILTER.findall(filters.group(1))
+        rules.extend(kept)
+        markets.append(
+            {
+                "symbol": symbol,
+                "status": match.group(2).decode("ascii"),
+                "baseAsset": match.group(3).decode("ascii"),
+                "quoteAsset": quote_asset.group(1).decode("ascii"),
+                "filters": len(kept),
+            }
+        )
+
+    decoded = iter(loads(b"[" + b",".join(rules) + b"]"))
+    for market in markets:
+        market["filters"] = [next(decoded) for _ in range(market["filters"])]
+    return {"symbols": markets}
+
+
+def _decode_exchange_info_full(
+    content: bytes, wanted: Optional[Set[str]]
+) -> Dict[str, Any]:
+    # Formato inesperado: decodifica a resposta inteira e projeta depois
+    markets = []
+    for market in loads(content)["symbols"]:
+        if wanted is not None and market["symbol"] not in wanted:
+            continue
+        projected = {
+            field: market[field] for field in MARKET_FIELDS if field in market
+        }
+        projected["filters"] = [
+            rule for rule in market["filters"] if rule["filterType"] in RULE_FILTERS
+        ]
+        markets.append(projected)
+    return {"symbols": markets}
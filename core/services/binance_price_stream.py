@@ -0,0 +1,183 @@
+import json
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import websocket
+
+logger = logging.getLogger(__name__)
+
+
+class BinancePriceStream:
+    def __init__(
+        self,
+        ws_url: str = "wss://stream.binance.com:9443/ws",
+        stream_type: str = "miniTicker",
+        max_price_age: float = 30.0,
+        max_backoff: float = 30.0,
+    ):
+        """
+        Feed de preços via WebSocket para os símbolos do portfólio.
+
+        Os preços ficam em uma tabela em memória escrita apenas pela thread do
+        WebSocket; cada entrada é substituída por inteiro, então as leituras
+        não precisam de lock.
+
+        :param ws_url: Endpoint WebSocket bruto (/ws) da Binance ou de um servidor local.
+        :param stream_type: "miniTicker" (último preço) ou "bookTicker" (preço médio do book).
+        :param max_price_age: Idade máxima, em segundos, para um preço ser considerado válido.
+        :param max_backoff: Espera máxima, em segundos, entre tentativas de reconexão.
+        """
+        if stream_type not in ("miniTicker", "bookTicker"):
+            raise ValueError(f"Tipo de stream desconhecido: {stream_type}")
+        self.ws_url = ws_url
+        self.stream_type = stream_type
+        self.max_price_age = max_price_age
+        self.max_backoff = max_backoff
+        self.prices: Dict[str, Tuple[float, float]] = {}
+        self.connected = False
+        self.reconnects = 0
+        self._symbols: frozenset = frozenset()
+        self._listeners: List[Callable[[str, float], None]] = []
+        self._ws: Optional[websocket.WebSocketApp] = None
+        self._request_id = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_listener(self, callback: Callable[[str, float], None]):
+        """
+        Registra uma função chamada a cada novo preço com (symbol, price).
+        """
+        self._listeners.append(callback)
+
+    def subscribe(self, symbols: Iterable[str]):
+        """
+        Garante a assinatura dos símbolos informados, sem derrubar a conexão.
+        """
+        symbols = frozenset(symbol.upper() for symbol in symbols)
+        new_symbols = symbols - self._symbols
+        if not new_symbols:
+            return
+        self._symbols = self._symbols | new_symbols
+        if self.connected:
+            self._send_subscription("SUBSCRIBE", new_symbols)
+
+    def unsubscribe(self, symbols: Iterable[str]):
+        symbols = frozenset(symbol.upper() for symbol in symbols) & self._symbols
+        if not symbols:
+            return
+        self._symbols = self._symbols - symbols
+        for symbol in symbols:
+            self.prices.pop(symbol, None)
+        if self.connected:
+            self._send_subscription("UNSUBSCRIBE", symbols)
+
+    def get_price(self, symbol: str) -> Optional[float]:
+        """
+        Retorna o último preço do símbolo, ou None se ausente ou desatualizado.
+        """
+        entry = self.prices.get(symbol.upper())
+        if entry is None or time.time() - entry[1] > self.max_price_age:
+            return None
+        return entry[0]
+
+    def get_prices(self, symbols: Iterable[str] = None) -> Optional[Dict[str, float]]:
+        """
+        Retorna os preços válidos dos símbolos pedidos (ou de todos os assinados).
+        Retorna None se algum símbolo pedido não tiver preço válido.
+        """
+        symbols = self._symbols if symbols is None else symbols
+        prices = {}
+        for symbol in symbols:
+            price = self.get_price(symbol)
+            if price is None:
+                return None
+            prices[symbol.upper()] = price
+        return prices
+
+    def start(self):
+        """
+        Inicia a conexão em uma thread separada, com reconexão automática.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._ws:
+            self._ws.close()
+
+    def _run(self):
+        backoff = 1.0
+        while not self._stop_event.is_set():
+            started = time.time()
+            self._ws = websocket.WebSocketApp(
+                self.ws_url,
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close,
+            )
+            self._ws.run_forever(ping_interval=60, ping_timeout=10)
+            self.connected = False
+            if self._stop_event.is_set():
+                break
+            # Conexões que duraram bastante reiniciam a espera exponencial
+            if time.time() - started > 60:
+                backoff = 1.0
+            self.reconnects += 1
+            logger.warning(
+                f"WebSocket de preços desconectado; reconectando em {backoff:.0f}s..."
+            )
+            self._stop_event.wait(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def _on_open(self, ws):
+        self.connected = True
+        logger.info(f"WebSocket de preços conectado: {self.ws_url}")
+        if self._symbols:
+            self._send_subscription("SUBSCRIBE", self._symbols)
+
+    def _on_message(self, ws, message):
+        try:
+            data = json.loads(message)
+        except ValueError:
+            logger.warning(f"Mensagem inválida do WebSocket: {message[:200]}")
+            return
+        if "stream" in data and "data" in data:
+            data = data["data"]
+        symbol = data.get("s") if isinstance(data, dict) else None
+        if not symbol:
+            return
+
+        if self.stream_type == "bookTicker":
+            price = (float(data["b"]) + float(data["a"])) / 2
+        else:
+            price = float(data["c"])
+
+        self.prices[symbol] = (price, time.time())
+        for listener in self._listeners:
+            try:
+                listener(symbol, price)
+            except Exception as e:
+                logger.error(f"Erro no listener de preços: {e}")
+
+    def _on_error(self, ws, error):
+        logger.error(f"Erro no WebSocket de preços: {error}")
+
+    def _on_close(self, ws, status_code, message):
+        self.connected = False
+
+    def _send_subscription(self, method: str, symbols: Iterable[str]):
+        self._request_id += 1
+        params = [f"{symbol.lower()}@{self.stream_type}" for symbol in sorted(symbols)]
+        try:
+            self._ws.send(
+                json.dumps({"method": method, "params": params, "id": self._request_id})
+            )
+        except Exception as e:
+            logger.error(f"Erro ao enviar {method} para o WebSocket: {e}")
@@ -1,18 +1,50 @@
+import logging
+
 from core.services.telegram_notifier import TelegramNotifier
+from core.services.telegram_outbox import TelegramOutbox
 from src.config import get_config
-from .binance_base_service import BinanceBaseService
+from .binance_base_service import BinanceAPIError, BinanceBaseService
+from .binance_payloads import decode_account_balances
+from .clock_sync import ServerClock
+from .http_transport import HttpTransport
+from .rate_governor import HIGH, NORMAL, RateGovernor
 from core.utils.crypto_utils import create_signature
 
+logger = logging.getLogger(__name__)
+
 
 class BinancePrivateService(BinanceBaseService):
-    def __init__(self):
-        super().__init__()
+    def __init__(
+        self,
+        transport: HttpTransport = None,
+        rate_governor: RateGovernor = None,
+        api_key: str = None,
+        api_secret: str = None,
+        telegram_chat_id: str = None,
+    ):
+        """
+        :param api_key: API Key da conta; por padrão vem da configuração.
+        :param api_secret: API Secret da conta; por padrão vem da configuração.
+        :param telegram_chat_id: Chat que recebe as notificações de ordens.
+        """
+        super().__init__(transport, rate_governor)
         config = get_config()
-        self.telegram_notifier = TelegramNotifier(config["telegram_bot_token"])
-        self.api_key = config["api_key"]
-        self.api_secret = config["api_secret"]
+        self.telegram_notifier = TelegramNotifier(
+            config["telegram_bot_token"], transport=self.transport
+        )
+        self.api_key = api_key or config["api_key"]
+        self.api_secret = api_secret or config["api_secret"]
+        self.telegram_chat_id = telegram_chat_id or config["telegram_chat_id"]
         if not self.api_key or not self.api_secret:
             raise ValueError("API Key e Secret não foram encontradas.")
+        # Notificações agrupadas por ciclo e enviadas fora do caminho das ordens
+        self.notifications = TelegramOutbox(self.telegram_notifier)
+        self.clock = ServerClock(
+            self.base_url,
+            self.transport,
+            sync_interval=config["clock_sync_interval"],
+            rate_governor=self.rate_governor,
+        )
 
     def _get_headers(self):
         """
@@ -20,51 +52,110 @@ class BinancePrivateService(BinanceBaseService):
         """
         return {"X-MBX-APIKEY": self.api_key}
 
-    def _make_request(self, endpoint, params=None, request_type: str = "GET"):
+    def _make_request(
+        self,
+        endpoint,
+        params=None,
+        request_type: str = "GET",
+        priority=NORMAL,
+        decoder=None,
+    ):
         """
         Realiza uma requisição autenticada para a API da Binance.
         """
         headers = self._get_headers()
-        params = params or {}
+        params = dict(params or {})
+
+        try:
+            return super()._make_request(
+                endpoint,
+                request_type=request_type,
+                params=self._sign(params),
+                headers=headers,
+                priority=priority,
+                decoder=decoder,
+            )
+        except BinanceAPIError as e:
+            # -1021: timestamp fora do recvWindow; ressincroniza e tenta uma vez
+            if e.code != -1021:
+                raise
+            self.clock.sync()
+            return super()._make_request(
+                endpoint,
+                request_type=request_type,
+                params=self._sign(params),
+                headers=headers,
+                priority=priority,
+                decoder=decoder,
+            )
+
+    def _sign(self, params):
+        """
+        Adiciona timestamp local (corrigido pelo offset do servidor), recvWindow e assinatura.
+        """
+        signed_params = dict(params)
+        signed_params["timestamp"] = self.clock.timestamp()
+        signed_params["recvWindow"] = 5000
+        signed_params["signature"] = create_signature(signed_params, self.api_secret)
+        return signed_params
+
+    def _make_api_key_request(self, endpoint, params=None, request_type: str = "GET"):
+        """
+        Realiza uma requisição que exige apenas a API Key, sem assinatura (ex.: listenKey).
+        """
+        return BinanceBaseService._make_request(
+            self,
+            endpoint,
+            request_type=request_type,
+            params=params,
+            headers=self._get_headers(),
+        )
 
-        # Adiciona timestamp e recvWindow
-        params["timestamp"] = self._get_server_time()
-        params["recvWindow"] = 5000
+    def create_listen_key(self) -> str:
+        """
+        Cria um listenKey para o user data stream.
+        """
+        return self._make_api_key_request(
+            "/api/v3/userDataStream", request_type="POST"
+        )["listenKey"]
 
-        # Adiciona a assinatura
-        params["signature"] = create_signature(params, self.api_secret)
+    def keepalive_listen_key(self, listen_key: str):
+        """
+        Estende a validade do listenKey por mais 60 minutos.
+        """
+        self._make_api_key_request(
+            "/api/v3/userDataStream", {"listenKey": listen_key}, request_type="PUT"
+        )
 
-        # Faz a requisição usando o método da classe base
-        return super()._make_request(
-            endpoint, request_type=request_type, params=params, headers=headers
+    def close_listen_key(self, listen_key: str):
+        self._make_api_key_request(
+            "/api/v3/userDataStream", {"listenKey": listen_key}, request_type="DELETE"
         )
 
+    def get_account_info(self, priority=NORMAL):
+        """
+        Obtém os dados brutos da conta (/api/v3/account).
+        """
+        return self._make_request("/api/v3/account", priority=priority)
+
     def get_account_assets(self):
         """
         Obtém os ativos da conta na Binance com quantidade livre e em uso.
         """
         try:
-            endpoint = "/api/v3/account"
-            account_info = self._make_request(endpoint)
-            if account_info:
-                return [
-                    {
-                        "asset": asset["asset"],
-                        "free": float(asset["free"]),
-                        "locked": float(asset["locked"]),
-                    }
-                    for asset in account_info["balances"]
-                    if float(asset["free"]) > 0 or float(asset["locked"]) > 0
-                ]
-            return []
+            # Só os saldos não zerados são convertidos (a conta lista centenas)
+            return self._make_request(
+                "/api/v3/account", decoder=decode_account_balances
+            )
         except Exception as e:
             raise Exception(f"Erro ao obter ativos da conta: {e}") from e
 
     def _send_order(self, symbol, side, quantity, price):
         """
-        Método genérico para enviar ordens de teste (compra ou venda) para a Binance.
+        Método genérico para enviar ordens (compra ou venda) para a Binance.
+        :return: Resposta da Binance com orderId e status da ordem.
         """
-        # Parâmetros comuns para a ordem de teste
+        # Parâmetros comuns para a ordem
         params = {
             "symbol": symbol,
             "side": side,
@@ -75,53 +166,48 @@ class BinancePrivateService(BinanceBaseService):
         }
 
         try:
-            # Envia a ordem de teste via requisição HTTP
+            # Envia a ordem via requisição HTTP
             endpoint = "/api/v3/order"
-            self._make_request(endpoint, params, request_type="POST")
-
-            print(f"Ordem de teste {side.lower()} enviada com sucesso!")
-
-            # Envia a notificação via Telegram
-            message = (
-                f"Ordem de {side.lower()} enviada: {symbol} - {quantity} - {price}"
+            response = self._make_request(
+                endpoint, params, request_type="POST", priority=HIGH
             )
-            self.telegram_notifier.send_message(
-                message, get_config()["telegram_chat_id"]
-            )
-
         except Exception as e:
-            print(f"Erro ao enviar ordem de teste: {e}")
+            logger.error(f"Erro ao enviar ordem: {e}")
+            raise
+
+        logger.info(f"Ordem {side.lower()} enviada com sucesso!")
+
+        # A notificação via Telegram sai do caminho crítico da ordem
+        message = f"Ordem de {side.lower()} enviada: {symbol} - {quantity} - {price}"
+        self.notifications.enqueue(message, self.telegram_chat_id)
+        return response
 
     def place_buy_order(self, symbol: str, quantity: str, price: float):
         """
-        Simula uma ordem de compra utilizando a API da Binance.
+        Envia uma ordem de compra LIMIT utilizando a API da Binance.
         """
         if not symbol or not quantity or not price:
             raise ValueError("Parâmetros inválidos para a ordem de compra.")
 
-        print("\n--- Ordem de Compra ---")
-        print(f"Ativo: {symbol}")
-        print(f"Quantidade: {quantity}")
-        print(f"Preço: {price}")
-        print("Tipo de Ordem: LIMIT")
-        print("----------------------\n")
+        logger.info(
+            f"--- Ordem de Compra --- Ativo: {symbol}, Quantidade: {quantity}, "
+            f"Preço: {price}, Tipo de Ordem: LIMIT"
+        )
 
         # Chama o método genérico para enviar a ordem de compra
-        self._send_order(symbol, "BUY", quantity, price)
+        return self._send_order(symbol, "BUY", quantity, price)
 
     def place_sell_order(self, symbol: str, quantity: str, price: float):
         """
-        Simula uma ordem de venda utilizando a API da Binance.
+        Envia uma ordem de venda LIMIT utilizando a API da Binance.
         """
         if not symbol or not quantity or not price:
             raise ValueError("Parâmetros inválidos para a ordem de venda.")
 
-        print("\n--- Ordem de Venda ---")
-        print(f"Ativo: {symbol}")
-        print(f"Quantidade: {quantity}")
-        print(f"Preço: {price}")
-        print("Tipo de Ordem: LIMIT")
-        print("----------------------\n")
+        logger.info(
+            f"--- Ordem de Venda --- Ativo: {symbol}, Quantidade: {quantity}, "
+            f"Preço: {price}, Tipo de Ordem: LIMIT"
+        )
 
         # Chama o método genérico para enviar a ordem de venda
-        self._send_order(symbol, "SELL", quantity, price)
+        return self._send_order(symbol, "SELL", quantity, price)
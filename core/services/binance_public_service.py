@@ -1,7 +1,26 @@
+import json
+
 from .binance_base_service import BinanceBaseService
+from .binance_payloads import decode_exchange_info, decode_ticker_prices
+from .http_transport import HttpTransport
+from .rate_governor import LOW, NORMAL, RateGovernor
 
 
 class BinancePublicService(BinanceBaseService):
+    def __init__(
+        self,
+        transport: HttpTransport = None,
+        price_stream=None,
+        rate_governor: RateGovernor = None,
+    ):
+        """
+        :param transport: Transporte HTTP; por padrão usa o pool compartilhado.
+        :param price_stream: BinancePriceStream opcional; quando presente, os preços
+            vêm da tabela em memória e o REST fica como fallback.
+        """
+        super().__init__(transport, rate_governor)
+        self.price_stream = price_stream
+
     def get_current_price(self, asset_name):
         """
         Obtém o preço atual de um ativo em relação ao USDT usando o endpoint público.
@@ -14,9 +33,15 @@ class BinancePublicService(BinanceBaseService):
         else:
             symbol = f"{asset_name.upper()}USDT"
 
+        if self.price_stream is not None:
+            self.price_stream.subscribe([symbol])
+            price = self.price_stream.get_price(symbol)
+            if price is not None:
+                return 1 / price if asset_name.upper() == "BRL" else price
+
         endpoint = "/api/v3/ticker/price"
         params = {"symbol": symbol}
-        data = self._make_request(endpoint, params=params)
+        data = self._make_request(endpoint, params=params, request_type="GET")
 
         if "price" in data:
             if asset_name.upper() == "BRL":
@@ -26,23 +51,69 @@ class BinancePublicService(BinanceBaseService):
             print(f"Preço para {symbol} não encontrado.")
             return None
 
-    def get_current_prices(self):
+    def get_current_prices(self, symbols=None):
         """
         Obtém os preços de todos os ativos da Binance usando o endpoint público.
+        :param symbols: Pares de interesse; com o stream ativo, se todos tiverem
+            preço válido em memória, a consulta REST é evitada.
         """
+        if self.price_stream is not None and symbols:
+            self.price_stream.subscribe(symbols)
+            prices = self.price_stream.get_prices(symbols)
+            if prices is not None:
+                return prices
+
+        # A listagem completa tem milhares de pares; só os pedidos são convertidos
         endpoint = "/api/v3/ticker/price"
-        data = self._make_request(endpoint, request_type="GET")
-        if data:
-            return {price["symbol"]: float(price["price"]) for price in data}
-        else:
-            return {}
+        return self._make_request(
+            endpoint,
+            request_type="GET",
+            decoder=lambda content: decode_ticker_prices(content, symbols),
+        )
 
-    def get_exchange_info(self):
+    def get_exchange_info(self, symbols=None, priority=NORMAL):
         """
         Obtém as informações do par de negociação, incluindo restrições de quantidade e preço.
+        :param symbols: Lista opcional de pares; limita a resposta a esses mercados.
         """
         endpoint = "/api/v3/exchangeInfo"
+        params = {}
+        if symbols:
+            params["symbols"] = json.dumps(list(symbols), separators=(",", ":"))
 
-        data = self._make_request(endpoint, request_type="GET")
+        data = self._make_request(
+            endpoint,
+            request_type="GET",
+            params=params,
+            priority=priority,
+            decoder=decode_exchange_info,
+        )
 
         return data
+
+    def get_klines(
+        self,
+        symbol,
+        interval="1m",
+        start_time=None,
+        end_time=None,
+        limit=1000,
+        priority=LOW,
+    ):
+        """
+        Obtém candles (klines) de um par, do mais antigo para o mais recente.
+        :param start_time: Início, em milissegundos (open time do primeiro candle).
+        :param end_time: Fim opcional, em milissegundos.
+        :param limit: Quantidade máxima de candles (até 1000).
+        :return: Lista no formato da Binance: [open_time, open, high, low, close, volume, close_time, ...].
+        """
+        endpoint = "/api/v3/klines"
+        params = {"symbol": symbol, "interval": interval, "limit": limit}
+        if start_time is not None:
+            params["startTime"] = int(start_time)
+        if end_time is not None:
+            params["endTime"] = int(end_time)
+
+        return self._make_request(
+            endpoint, request_type="GET", params=params, priority=priority
+        )
@@ -0,0 +1,268 @@
+import json
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import websocket
+
+from core.services.binance_private_service import BinancePrivateService
+from core.services.rate_governor import LOW, NORMAL
+
+logger = logging.getLogger(__name__)
+
+
+class BalanceBook:
+    def __init__(self):
+        """
+        Saldos da conta em memória, atualizados pelos eventos do user data stream.
+        """
+        self.balances: Dict[str, Dict[str, float]] = {}
+        self.ready = False
+        # Horário do último estado absoluto de cada ativo e do último snapshot;
+        # eventos com horário anterior já estão refletidos nos saldos
+        self._event_times: Dict[str, int] = {}
+        self._snapshot_time = 0
+        self._lock = threading.Lock()
+
+    def apply_snapshot(self, balances: List[Dict], update_time: int):
+        """
+        Reconcilia com o snapshot REST, preservando ativos alterados por eventos mais recentes.
+        """
+        with self._lock:
+            snapshot_assets = set()
+            for balance in balances:
+                asset = balance["asset"]
+                snapshot_assets.add(asset)
+                if self._event_times.get(asset, 0) > update_time:
+                    continue
+                self.balances[asset] = {
+                    "free": float(balance["free"]),
+                    "locked": float(balance["locked"]),
+                }
+            for asset in list(self.balances):
+                if (
+                    asset not in snapshot_assets
+                    and self._event_times.get(asset, 0) <= update_time
+                ):
+                    del self.balances[asset]
+            self._snapshot_time = max(self._snapshot_time, update_time)
+            self.ready = True
+
+    def apply_account_position(self, event: Dict):
+        """
+        Aplica um evento outboundAccountPosition (saldos absolutos).
+        """
+        event_time = event.get("u", event.get("E", 0))
+        with self._lock:
+            for balance in event["B"]:
+                # Evento atrasado: não sobrescreve um estado mais recente
+                if event_time < self._last_update(balance["a"]):
+                    continue
+                self.balances[balance["a"]] = {
+                    "free": float(balance["f"]),
+                    "locked": float(balance["l"]),
+                }
+                self._event_times[balance["a"]] = event_time
+
+    def apply_balance_update(self, event: Dict):
+        """
+        Aplica um evento balanceUpdate (depósito, saque ou transferência).
+
+        O delta é ignorado se o saldo do ativo já vem de um evento absoluto ou
+        de um snapshot posterior, que já o incluem.
+        """
+        asset = event["a"]
+        event_time = event.get("T", event.get("E", 0))
+        with self._lock:
+            if event_time <= self._last_update(asset):
+                return
+            balance = self.balances.setdefault(asset, {"free": 0.0, "locked": 0.0})
+            self.balances[asset] = {
+                "free": balance["free"] + float(event["d"]),
+                "locked": balance["locked"],
+            }
+            self._event_times[asset] = event_time
+
+    def _last_update(self, asset: str) -> int:
+        return max(self._event_times.get(asset, 0), self._snapshot_time)
+
+    def get_balance(self, asset: str) -> Optional[Dict[str, float]]:
+        with self._lock:
+            balance = self.balances.get(asset)
+            return dict(balance) if balance is not None else None
+
+    def get_account_assets(self) -> List[Dict[str, float]]:
+        with self._lock:
+            return [
+                {"asset": asset, "free": balance["free"], "locked": balance["locked"]}
+                for asset, balance in self.balances.items()
+                if balance["free"] > 0 or balance["locked"] > 0
+            ]
+
+
+class BinanceUserDataStream:
+    def __init__(
+        self,
+        private_service: BinancePrivateService,
+        ws_url: str = "wss://stream.binance.com:9443/ws",
+        keepalive_interval: float = 1800.0,
+        reconcile_interval: float = 600.0,
+    ):
+        """
+        User data stream da Binance com livro de saldos em memória.
+
+        O listenKey é renovado periodicamente e um snapshot REST de /api/v3/account
+        é usado apenas na conexão e a cada reconcile_interval segundos.
+
+        :param private_service: Serviço privado da Binance.
+        :param ws_url: Endpoint WebSocket bruto (/ws) da Binance ou de um servidor local.
+        :param keepalive_interval: Intervalo, em segundos, do keepalive do listenKey.
+        :param reconcile_interval: Intervalo, em segundos, da reconciliação via REST.
+        """
+        self.private_service = private_service
+        self.ws_url = ws_url
+        self.keepalive_interval = keepalive_interval
+        self.reconcile_interval = reconcile_interval
+        self.book = BalanceBook()
+        self.listen_key: Optional[str] = None
+        self.connected = False
+        self._listeners: List[Callable[[str], None]] = []
+        self._ws: Optional[websocket.WebSocketApp] = None
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def add_listener(self, callback: Callable[[str], None]):
+        """
+        Registra uma função chamada com o nome do ativo a cada mudança de saldo.
+        """
+        self._listeners.append(callback)
+
+    def get_account_assets(self) -> List[Dict[str, float]]:
+        """
+        Retorna os saldos em memória, no mesmo formato de BinancePrivateService.
+        Enquanto o primeiro snapshot não chegou, consulta a API diretamente.
+        """
+        if not self.book.ready:
+            return self.private_service.get_account_assets()
+        return self.book.get_account_assets()
+
+    def get_balance(self, asset: str) -> Optional[Dict[str, float]]:
+        """
+        Retorna o saldo em memória de um ativo ({"free", "locked"}), se houver.
+        """
+        return self.book.get_balance(asset)
+
+    def reconcile(self, priority=NORMAL):
+        """
+        Reconcilia o livro de saldos com um snapshot REST da conta.
+        """
+        account_info = self.private_service.get_account_info(priority=priority)
+        self.book.apply_snapshot(
+            account_info["balances"], account_info.get("updateTime", 0)
+        )
+        logger.debug("Saldos reconciliados com /api/v3/account.")
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop_event.clear()
+        for target in (self._run_socket, self._run_maintenance):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop_event.set()
+        if self._ws:
+            self._ws.close()
+        if self.listen_key:
+            try:
+                self.private_service.close_listen_key(self.listen_key)
+            except Exception as e:
+                logger.warning(f"Erro ao encerrar o listenKey: {e}")
+
+    def _run_socket(self):
+        backoff = 1.0
+        while not self._stop_event.is_set():
+            try:
+                self.listen_key = self.private_service.create_listen_key()
+                self._ws = websocket.WebSocketApp(
+                    f"{self.ws_url}/{self.listen_key}",
+                    on_open=self._on_open,
+                    on_message=self._on_message,
+                    on_error=self._on_error,
+                    on_close=self._on_close,
+                )
+                started = time.time()
+                self._ws.run_forever(ping_interval=60, ping_timeout=10)
+                if time.time() - started > 60:
+                    backoff = 1.0
+            except Exception as e:
+                logger.error(f"Erro no user data stream: {e}")
+            self.connected = False
+            if self._stop_event.is_set():
+                break
+            logger.warning(
+                f"User data stream desconectado; reconectando em {backoff:.0f}s..."
+            )
+            self._stop_event.wait(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    def _run_maintenance(self):
+        last_keepalive = time.time()
+        last_reconcile = 0.0
+        while not self._stop_event.wait(5.0):
+            now = time.time()
+            try:
+                if self.listen_key and now - last_keepalive >= self.keepalive_interval:
+                    self.private_service.keepalive_listen_key(self.listen_key)
+                    last_keepalive = now
+                if self.connected and now - last_reconcile >= self.reconcile_interval:
+                    self.reconcile(priority=LOW)
+                    last_reconcile = now
+            except Exception as e:
+                logger.error(f"Erro na manutenção do user data stream: {e}")
+
+    def _on_open(self, ws):
+        self.connected = True
+        logger.info("User data stream conectado.")
+        # O snapshot é tirado depois da conexão para não perder eventos
+        try:
+            self.reconcile()
+        except Exception as e:
+            logger.error(f"Erro ao obter snapshot da conta: {e}")
+
+    def _on_message(self, ws, message):
+        try:
+            event = json.loads(message)
+        except ValueError:
+            logger.warning(f"Mensagem inválida do user data stream: {message[:200]}")
+            return
+
+        event_type = event.get("e")
+        if event_type == "outboundAccountPosition":
+            self.book.apply_account_position(event)
+            assets = [balance["a"] for balance in event["B"]]
+        elif event_type == "balanceUpdate":
+            self.book.apply_balance_update(event)
+            assets = [event["a"]]
+        elif event_type == "listenKeyExpired":
+            logger.warning("listenKey expirado; reconectando.")
+            ws.close()
+            return
+        else:
+            return
+
+        for asset in assets:
+            for listener in self._listeners:
+                try:
+                    listener(asset)
+                except Exception as e:
+                    logger.error(f"Erro no listener de saldos: {e}")
+
+    def _on_error(self, ws, error):
+        logger.error(f"Erro no user data stream: {error}")
+
+    def _on_close(self, ws, status_code, message):
+        self.connected = False
@@ -0,0 +1,128 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from core.services.http_transport import HttpTransport
+from core.services.rate_governor import RateGovernor
+
+logger = logging.getLogger(__name__)
+
+
+class ServerClock:
+    def __init__(
+        self,
+        base_url: str,
+        transport: HttpTransport,
+        sync_interval: float = 300.0,
+        samples: int = 5,
+        rate_governor: RateGovernor = None,
+    ):
+        """
+        Mantém o deslocamento (offset) entre o relógio local e o da Binance.
+
+        Cada sincronização faz algumas amostras de /api/v3/time, compensa metade
+        do tempo de ida e volta (RTT) e usa a amostra de menor RTT, que é a de
+        menor incerteza.
+
+        :param base_url: URL base da API da Binance.
+        :param transport: Transporte HTTP compartilhado.
+        :param sync_interval: Intervalo, em segundos, entre sincronizações em segundo plano.
+        :param samples: Quantidade de amostras por sincronização.
+        :param rate_governor: Governador de limites que contabiliza as amostras.
+        """
+        self.url = base_url + "/api/v3/time"
+        self.transport = transport
+        self.sync_interval = sync_interval
+        self.samples = samples
+        self.rate_governor = rate_governor
+        self.offset_ms = 0.0
+        self.rtt_ms = 0.0
+        self.drift_ms_per_hour = 0.0
+        self.last_sync: Optional[float] = None
+        self.sync_count = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self):
+        if self.rate_governor:
+            self.rate_governor.acquire("/api/v3/time")
+        local_before = time.time() * 1000
+        response = self.transport.get(self.url)
+        local_after = time.time() * 1000
+        if self.rate_governor:
+            self.rate_governor.update_from_response(response)
+        if response.status_code != 200:
+            raise Exception(
+                f"Erro ao obter tempo do servidor: {response.status_code} - {response.text}"
+            )
+        server_time = response.json()["serverTime"]
+        rtt = local_after - local_before
+        return server_time - (local_before + rtt / 2), rtt
+
+    def sync(self):
+        """
+        Mede o offset atual do relógio da Binance.
+        """
+        best_offset, best_rtt = None, None
+        for _ in range(self.samples):
+            offset, rtt = self._sample()
+            if best_rtt is None or rtt < best_rtt:
+                best_offset, best_rtt = offset, rtt
+
+        now = time.time()
+        with self._lock:
+            if self.last_sync is not None:
+                elapsed_hours = (now - self.last_sync) / 3600
+                if elapsed_hours > 0:
+                    self.drift_ms_per_hour = (
+                        best_offset - self.offset_ms
+                    ) / elapsed_hours
+            self.offset_ms = best_offset
+            self.rtt_ms = best_rtt
+            self.last_sync = now
+            self.sync_count += 1
+
+        logger.debug(
+            f"Relógio sincronizado com a Binance: offset {best_offset:.1f} ms, RTT {best_rtt:.1f} ms"
+        )
+
+    def timestamp(self) -> int:
+        """
+        Retorna o timestamp estimado do servidor, em milissegundos, sem acesso à rede.
+        """
+        if self.last_sync is None:
+            self.sync()
+        return int(time.time() * 1000 + self.offset_ms)
+
+    def start(self):
+        """
+        Inicia a sincronização periódica em uma thread separada.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.sync()
+            except Exception as e:
+                logger.error(f"Erro ao sincronizar relógio com a Binance: {e}")
+            self._stop_event.wait(self.sync_interval)
+
+    def get_metrics(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "offset_ms": self.offset_ms,
+                "rtt_ms": self.rtt_ms,
+                "drift_ms_per_hour": self.drift_ms_per_hour,
+                "last_sync": self.last_sync,
+                "sync_count": self.sync_count,
+            }
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from core.services.binance_public_service import BinancePublicService
+from core.services.rate_governor import LOW, NORMAL
+
+logger = logging.getLogger(__name__)
+
+
+class ExchangeInfoCache:
+    def __init__(
+        self,
+        public_service: BinancePublicService,
+        ttl: float = 3600.0,
+        snapshot_path: Optional[str] = "exchange_info_cache.json",
+    ):
+        """
+        Cache em memória do exchangeInfo da Binance, com snapshot em disco.
+
+        As leituras de cada ciclo vêm da memória; a atualização acontece em
+        segundo plano quando o TTL expira ou quando surgem novos símbolos.
+
+        :param public_service: Serviço público da Binance.
+        :param ttl: Validade do cache, em segundos.
+        :param snapshot_path: Arquivo do snapshot em disco (None desativa).
+        """
+        self.public_service = public_service
+        self.ttl = ttl
+        self.snapshot_path = snapshot_path
+        self.version = 0
+        self._data: Optional[Dict[str, Any]] = None
+        self._digest: Optional[str] = None
+        self._fetched_at = 0.0
+        self._symbols: Optional[frozenset] = None
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._load_snapshot()
+
+    def get(self, symbols: Iterable[str] = None) -> Dict[str, Any]:
+        """
+        Retorna o exchangeInfo em memória, buscando na Binance apenas quando não há dados.
+
+        :param symbols: Pares do portfólio; se houver pares fora do escopo atual,
+            uma atualização é feita para incluí-los.
+        """
+        if symbols is not None:
+            self._extend_scope(symbols)
+        if self._data is None:
+            self.refresh()
+        elif self.is_stale():
+            self._refresh_in_background()
+        return self._data
+
+    def is_stale(self) -> bool:
+        return time.time() - self._fetched_at > self.ttl
+
+    def refresh(self, priority=NORMAL):
+        """
+        Busca o exchangeInfo e substitui o cache somente se o conteúdo mudou.
+        """
+        with self._refreshing:
+            symbols = self._symbols
+            try:
+                data = self.public_service.get_exchange_info(
+                    symbols=sorted(symbols) if symbols else None, priority=priority
+                )
+            except Exception as e:
+                if not symbols:
+                    raise
+                # Um par inexistente invalida a consulta inteira; usa a lista completa.
+                logger.warning(
+                    f"Falha na consulta do exchangeInfo por símbolos ({e}). "
+                    f"Buscando a lista completa."
+                )
+                data = self.public_service.get_exchange_info(priority=priority)
+            self._store(data, time.time())
+
+    def _store(self, data: Dict[str, Any], fetched_at: float, persist: bool = True):
+        payload = json.dumps(data, sort_keys=True, separators=(",", ":"))
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        with self._lock:
+            self._fetched_at = fetched_at
+            if digest == self._digest:
+                logger.debug("exchangeInfo sem alterações; cache mantido.")
+                return
+            self._data = data
+            self._digest = digest
+            self.version += 1
+        logger.info(f"exchangeInfo atualizado (versão {self.version}).")
+        if persist:
+            self._save_snapshot(payload, fetched_at)
+
+    def _extend_scope(self, symbols: Iterable[str]):
+        symbols = frozenset(symbol.upper() for symbol in symbols)
+        current = self._symbols
+        if current is not None and symbols <= current:
+            return
+        with self._lock:
+            self._symbols = symbols | (current or frozenset())
+        if self._data is not None:
+            cached = {market["symbol"] for market in self._data.get("symbols", [])}
+            if not symbols <= cached:
+                self.refresh()
+
+    def _refresh_in_background(self):
+        if self._refreshing.locked():
+            return
+        threading.Thread(target=self._safe_refresh, daemon=True).start()
+
+    def _safe_refresh(self):
+        # Com dados em memória, a atualização pode ceder lugar às chamadas do ciclo
+        try:
+            self.refresh(priority=LOW)
+        except Exception as e:
+            logger.error(f"Erro ao atualizar o exchangeInfo: {e}")
+
+    def start(self):
+        """
+        Inicia a atualização periódica em uma thread separada.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _run(self):
+        while not self._stop_event.wait(min(self.ttl, 60.0)):
+            if self.is_stale():
+                self._safe_refresh()
+
+    def _load_snapshot(self):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as file:
+                snapshot = json.load(file)
+            self._store(snapshot["data"], snapshot["fetched_at"], persist=False)
+            logger.info(f"Snapshot do exchangeInfo carregado de {self.snapshot_path}.")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Snapshot do exchangeInfo ignorado: {e}")
+
+    def _save_snapshot(self, payload: str, fetched_at: float):
+        if not self.snapshot_path:
+            return
+        temp_path = f"{self.snapshot_path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                file.write(f'{{"fetched_at":{fetched_at},"data":{payload}}}')
+            os.replace(temp_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"Não foi possível salvar o snapshot do exchangeInfo: {e}")
@@ -0,0 +1,163 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyStats:
+    def __init__(self, window: int = 200):
+        """
+        Acumula estatísticas de latência das requisições de um host.
+        :param window: Quantidade de amostras recentes usadas nos percentis.
+        """
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples = deque(maxlen=window)
+
+    def record(self, elapsed_ms: float, ok: bool = True):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.samples.append(elapsed_ms)
+        if not ok:
+            self.errors += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+
+        def percentile(p):
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "max_ms": self.max_ms,
+        }
+
+
+class HttpTransport:
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 10,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.3,
+    ):
+        """
+        Camada de transporte HTTP compartilhada, com conexões persistentes por host.
+
+        :param pool_connections: Quantidade de pools (hosts) mantidos em cache.
+        :param pool_maxsize: Conexões keep-alive mantidas por host.
+        :param connect_timeout: Timeout de conexão, em segundos.
+        :param read_timeout: Timeout de leitura, em segundos.
+        :param max_retries: Tentativas extras em falhas de conexão e respostas 5xx.
+        :param backoff_factor: Fator de espera exponencial entre as tentativas.
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        # POST fica fora das repetições automáticas para não duplicar ordens.
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(["GET", "PUT", "DELETE"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._stats: Dict[str, LatencyStats] = {}
+        self._stats_lock = threading.Lock()
+
+    def request(self, method: str, url: str, timeout=None, **kwargs):
+        """
+        Executa uma requisição reaproveitando a conexão do pool do host.
+        :return: requests.Response
+        """
+        host = urlsplit(url).netloc
+        start = time.perf_counter()
+        ok = False
+        try:
+            response = self.session.request(
+                method.upper(), url, timeout=timeout or self.timeout, **kwargs
+            )
+            ok = response.status_code < 400
+            return response
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._stats_lock:
+                stats = self._stats.setdefault(host, LatencyStats())
+                stats.record(elapsed_ms, ok)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Retorna as estatísticas de latência agrupadas por host.
+        """
+        with self._stats_lock:
+            return {host: stats.snapshot() for host, stats in self._stats.items()}
+
+    def close(self):
+        self.session.close()
+
+
+_shared_transport: Optional[HttpTransport] = None
+_shared_lock = threading.Lock()
+
+
+def get_http_transport() -> HttpTransport:
+    """
+    Retorna a instância de transporte compartilhada por todos os serviços.
+    """
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            config = get_config()
+            _shared_transport = HttpTransport(
+                pool_connections=config["http_pool_connections"],
+                pool_maxsize=config["http_pool_maxsize"],
+                connect_timeout=config["http_connect_timeout"],
+                read_timeout=config["http_read_timeout"],
+                max_retries=config["http_max_retries"],
+                backoff_factor=config["http_backoff_factor"],
+            )
+            logger.debug("Transporte HTTP compartilhado inicializado.")
+        return _shared_transport
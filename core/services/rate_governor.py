@@ -0,0 +1,206 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from src.config import get_config
+
+logger = logging.getLogger(__name__)
+
+# Prioridades das chamadas: quanto menor, mais importante
+HIGH = 0
+NORMAL = 1
+LOW = 2
+
+# Peso de cada endpoint usado pelo projeto (REQUEST_WEIGHT da Binance)
+ENDPOINT_WEIGHTS = {
+    "/api/v3/time": 1,
+    "/api/v3/exchangeInfo": 20,
+    "/api/v3/account": 20,
+    "/api/v3/order": 1,
+    "/api/v3/userDataStream": 2,
+    "/api/v3/klines": 2,
+}
+
+
+def weight_for(endpoint: str, params: Optional[Dict] = None) -> int:
+    """
+    Retorna o peso de uma chamada, considerando os parâmetros quando o peso varia.
+    """
+    params = params or {}
+    if endpoint == "/api/v3/ticker/price":
+        return 2 if "symbol" in params else 4
+    return ENDPOINT_WEIGHTS.get(endpoint, 1)
+
+
+class RateLimitExceeded(Exception):
+    pass
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, interval: float):
+        """
+        Balde de tokens que se recompõe por completo a cada intervalo.
+
+        :param capacity: Limite da Binance para o intervalo.
+        :param interval: Duração do intervalo, em segundos.
+        """
+        self.capacity = capacity
+        self.rate = capacity / interval
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self, now: float) -> float:
+        self._refill(now)
+        return self.tokens
+
+    def wait_time(self, amount: float, reserve: float, now: float) -> float:
+        self._refill(now)
+        missing = amount + reserve - self.tokens
+        return max(0.0, missing / self.rate)
+
+    def consume(self, amount: float):
+        self.tokens -= amount
+
+    def sync_used(self, used: float, now: float):
+        """
+        Ajusta o saldo com o uso informado pela Binance, se ele for maior que o estimado.
+        """
+        self._refill(now)
+        self.tokens = min(self.tokens, self.capacity - used)
+
+
+class RateGovernor:
+    def __init__(
+        self,
+        weight_limit: int = 6000,
+        orders_per_10s: int = 100,
+        orders_per_day: int = 200000,
+        low_priority_reserve: float = 0.2,
+        max_wait: float = 10.0,
+    ):
+        """
+        Controla o peso das requisições e a contagem de ordens antes de atingir os limites.
+
+        Os contadores são estimados localmente e corrigidos pelos cabeçalhos
+        X-MBX-USED-WEIGHT-1M e X-MBX-ORDER-COUNT-* de cada resposta.
+
+        :param weight_limit: Limite de peso por minuto.
+        :param orders_per_10s: Limite de ordens a cada 10 segundos.
+        :param orders_per_day: Limite de ordens por dia.
+        :param low_priority_reserve: Fração do limite reservada; chamadas de baixa
+            prioridade são descartadas quando invadiriam essa reserva.
+        :param max_wait: Espera máxima, em segundos, antes de desistir de uma chamada.
+        """
+        self.weight = TokenBucket(weight_limit, 60)
+        self.orders = {
+            "10S": TokenBucket(orders_per_10s, 10),
+            "1D": TokenBucket(orders_per_day, 86400),
+        }
+        self.low_priority_reserve = low_priority_reserve * weight_limit
+        self.max_wait = max_wait
+        self.banned_until = 0.0
+        self.shed_count = 0
+        self.delayed_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        method: str = "GET",
+        priority: int = NORMAL,
+    ):
+        """
+        Reserva o peso da chamada, esperando se necessário.
+
+        :raises RateLimitExceeded: Se a chamada for de baixa prioridade e não houver
+            folga, ou se a espera passar de max_wait.
+        """
+        weight = weight_for(endpoint, params)
+        is_order = endpoint == "/api/v3/order" and method.upper() == "POST"
+        reserve = self.low_priority_reserve if priority >= LOW else 0.0
+        deadline = time.monotonic() + self.max_wait
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = max(
+                    self.banned_until - now,
+                    self.weight.wait_time(weight, reserve, now),
+                )
+                if is_order:
+                    for bucket in self.orders.values():
+                        wait = max(wait, bucket.wait_time(1, 0.0, now))
+                if wait <= 0:
+                    self.weight.consume(weight)
+                    if is_order:
+                        for bucket in self.orders.values():
+                            bucket.consume(1)
+                    return
+                if priority >= LOW or now + wait > deadline:
+                    self.shed_count += 1
+                    raise RateLimitExceeded(
+                        f"Limite de requisições próximo; chamada a {endpoint} "
+                        f"descartada (espera estimada de {wait:.1f}s)."
+                    )
+                self.delayed_seconds += wait
+            logger.debug(f"Aguardando {wait:.2f}s pelo limite de peso para {endpoint}.")
+            time.sleep(wait)
+
+    def update_from_response(self, response):
+        """
+        Sincroniza os contadores com os cabeçalhos da resposta e trata 429/418.
+        """
+        headers = response.headers
+        now = time.monotonic()
+        with self._lock:
+            used = headers.get("X-MBX-USED-WEIGHT-1M")
+            if used is not None:
+                self.weight.sync_used(float(used), now)
+            for interval, bucket in self.orders.items():
+                count = headers.get(f"X-MBX-ORDER-COUNT-{interval}")
+                if count is not None:
+                    bucket.sync_used(float(count), now)
+
+            if response.status_code in (418, 429):
+                retry_after = float(headers.get("Retry-After", 60))
+                self.banned_until = max(self.banned_until, now + retry_after)
+                logger.warning(
+                    f"Binance retornou {response.status_code}; pausando chamadas por {retry_after:.0f}s."
+                )
+
+    def get_metrics(self) -> Dict[str, float]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "weight_available": self.weight.available(now),
+                "orders_10s_available": self.orders["10S"].available(now),
+                "orders_1d_available": self.orders["1D"].available(now),
+                "banned_for": max(0.0, self.banned_until - now),
+                "shed_count": self.shed_count,
+                "delayed_seconds": self.delayed_seconds,
+            }
+
+
+_shared_governor: Optional[RateGovernor] = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_governor() -> RateGovernor:
+    """
+    Retorna o governador compartilhado: os limites da Binance valem por IP e por conta.
+    """
+    global _shared_governor
+    with _shared_lock:
+        if _shared_governor is None:
+            config = get_config()
+            _shared_governor = RateGovernor(
+                weight_limit=config["rate_weight_limit"],
+                low_priority_reserve=config["rate_low_priority_reserve"],
+            )
+        return _shared_governor
@@ -0,0 +1,128 @@
+import logging
+import threading
+import time
+from typing import Callable, Set
+
+from core.services.state_manager import StateManager
+
+logger = logging.getLogger(__name__)
+
+# Motivos de despertar do agendador
+PRICE = "price"
+BALANCE = "balance"
+SHEET = "sheet"
+COMMAND = "command"
+HEARTBEAT = "heartbeat"
+
+
+class RebalanceScheduler:
+    def __init__(
+        self,
+        run_cycle: Callable[[], None],
+        state_manager: StateManager,
+        drift_probe: Callable[[], float],
+        max_percentage_difference: float,
+        drift_fraction: float = 0.5,
+        debounce: float = 0.5,
+        max_staleness: float = 60.0,
+    ):
+        """
+        Agenda o ciclo de análise a partir de eventos, em vez de um intervalo fixo.
+
+        Ticks de preço só disparam o ciclo quando o desvio estimado de algum ativo
+        passa de drift_fraction * max_percentage_difference. Mudanças de saldo,
+        da planilha e comandos disparam sempre. Sem eventos, o ciclo roda a cada
+        max_staleness segundos.
+
+        :param run_cycle: Função que executa um ciclo completo.
+        :param state_manager: Estado de execução (pausado/rodando).
+        :param drift_probe: Função que estima o maior desvio percentual atual, sem rede.
+        :param max_percentage_difference: Desvio que leva o analisador a operar.
+        :param drift_fraction: Fração do desvio máximo que dispara o ciclo.
+        :param debounce: Tempo, em segundos, para agrupar eventos próximos.
+        :param max_staleness: Intervalo máximo, em segundos, sem executar o ciclo.
+        """
+        self.run_cycle = run_cycle
+        self.state_manager = state_manager
+        self.drift_probe = drift_probe
+        self.drift_threshold = drift_fraction * max_percentage_difference
+        self.debounce = debounce
+        self.max_staleness = max_staleness
+        self.last_run = 0.0
+        self.cycles = 0
+        self.skipped = 0
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        state_manager.add_listener(lambda running: self.notify(COMMAND))
+
+    def notify(self, reason: str):
+        """
+        Sinaliza um evento; pode ser chamado de qualquer thread.
+        """
+        with self._lock:
+            self._pending.add(reason)
+        self._wake.set()
+
+    def on_price_tick(self, symbol: str, price: float):
+        self.notify(PRICE)
+
+    def on_balance_change(self, asset: str):
+        self.notify(BALANCE)
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake.set()
+
+    def run(self):
+        """
+        Loop principal; bloqueia até stop() ser chamado.
+        """
+        while not self._stop_event.is_set():
+            if not self.state_manager.is_running():
+                logger.info("Bot pausado; aguardando /start.")
+                while not self.state_manager.wait_until_running(1.0):
+                    if self._stop_event.is_set():
+                        return
+                self.notify(COMMAND)
+
+            timeout = max(0.0, self.last_run + self.max_staleness - time.time())
+            if not self._wake.wait(timeout):
+                self.notify(HEARTBEAT)
+            # Agrupa rajadas de eventos em um único ciclo
+            self._stop_event.wait(self.debounce)
+            self._wake.clear()
+            with self._lock:
+                reasons, self._pending = self._pending, set()
+
+            if not self.state_manager.is_running() or self._stop_event.is_set():
+                continue
+            if self._should_run(reasons):
+                self._run_once(reasons)
+            else:
+                self.skipped += 1
+
+    def _should_run(self, reasons: Set[str]) -> bool:
+        if not reasons:
+            return False
+        if self.last_run == 0.0 or reasons - {PRICE}:
+            return True
+        if time.time() - self.last_run >= self.max_staleness:
+            return True
+        try:
+            drift = self.drift_probe()
+        except Exception as e:
+            logger.error(f"Erro ao estimar o desvio do portfólio: {e}")
+            return True
+        return drift >= self.drift_threshold
+
+    def _run_once(self, reasons: Set[str]):
+        logger.debug(f"Executando ciclo ({', '.join(sorted(reasons))}).")
+        try:
+            self.run_cycle()
+        except Exception as e:
+            logger.error(f"Erro durante a execução: {e}")
+        finally:
+            self.last_run = time.time()
+            self.cycles += 1
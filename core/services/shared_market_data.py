@@ -0,0 +1,176 @@
+import json
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.services.binance_payloads import loads
+
+# Cabeçalho: sequência (uint64, ímpar durante a escrita), timestamp (double), tamanho (uint64)
+_HEADER = struct.Struct("<QdQ")
+
+
+class _SeqLockBlock:
+    def __init__(self, name: str = None, size: int = 0):
+        """
+        Bloco de memória compartilhada protegido por seqlock: um único processo
+        escreve e os leitores repetem a leitura se ela coincidir com uma escrita.
+        """
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=_HEADER.size + size)
+            _HEADER.pack_into(self.shm.buf, 0, 0, 0.0, 0)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def capacity(self) -> int:
+        return self.shm.size - _HEADER.size
+
+    def sequence(self) -> int:
+        return _HEADER.unpack_from(self.shm.buf, 0)[0]
+
+    def write(self, payload: bytes):
+        if len(payload) > self.capacity:
+            raise ValueError(
+                f"Dados ({len(payload)} bytes) maiores que a memória compartilhada ({self.capacity} bytes)."
+            )
+        seq = self.sequence()
+        _HEADER.pack_into(self.shm.buf, 0, seq + 1, time.time(), len(payload))
+        self.shm.buf[_HEADER.size : _HEADER.size + len(payload)] = payload
+        _HEADER.pack_into(self.shm.buf, 0, seq + 2, time.time(), len(payload))
+
+    def read(self):
+        """
+        :return: (sequência, timestamp, bytes) de uma leitura consistente.
+        """
+        while True:
+            seq, timestamp, length = _HEADER.unpack_from(self.shm.buf, 0)
+            if seq % 2:
+                time.sleep(0)
+                continue
+            payload = bytes(self.shm.buf[_HEADER.size : _HEADER.size + length])
+            if _HEADER.unpack_from(self.shm.buf, 0)[0] == seq:
+                return seq, timestamp, payload
+
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class SharedMarketData:
+    def __init__(
+        self,
+        symbols: List[str],
+        exchange_info_capacity: int = 32 * 1024 * 1024,
+        names: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Dados públicos de mercado (preços e exchangeInfo) compartilhados entre processos.
+
+        Os preços ficam em um vetor de float64 indexado pela lista de símbolos,
+        que é fixa e enviada aos processos na criação. O exchangeInfo é gravado
+        como JSON e só é decodificado pelos leitores quando muda de versão.
+
+        :param symbols: Símbolos cujos preços são publicados.
+        :param exchange_info_capacity: Espaço reservado para o exchangeInfo, em bytes.
+        :param names: Nomes dos blocos existentes; informado apenas pelos leitores.
+        """
+        self.symbols = list(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        if names is None:
+            self.prices_block = _SeqLockBlock(size=8 * len(self.symbols))
+            self.exchange_info_block = _SeqLockBlock(size=exchange_info_capacity)
+        else:
+            self.prices_block = _SeqLockBlock(name=names["prices"])
+            self.exchange_info_block = _SeqLockBlock(name=names["exchange_info"])
+        self._price_format = struct.Struct(f"<{len(self.symbols)}d")
+        self._exchange_info: Optional[Dict[str, Any]] = None
+        self._exchange_info_seq = -1
+
+    @property
+    def names(self) -> Dict[str, str]:
+        return {
+            "prices": self.prices_block.name,
+            "exchange_info": self.exchange_info_block.name,
+        }
+
+    def publish_prices(self, prices: Dict[str, float]):
+        values = [prices.get(symbol, float("nan")) for symbol in self.symbols]
+        self.prices_block.write(self._price_format.pack(*values))
+
+    def publish_exchange_info(self, exchange_info: Dict[str, Any]):
+        self.exchange_info_block.write(
+            json.dumps(exchange_info, separators=(",", ":")).encode("utf-8")
+        )
+
+    def get_prices(self, symbols: Iterable[str] = None) -> Dict[str, float]:
+        _, _, payload = self.prices_block.read()
+        if not payload:
+            return {}
+        values = self._price_format.unpack(payload)
+        if symbols is None:
+            pairs = zip(self.symbols, values)
+        else:
+            pairs = (
+                (symbol, values[self.index[symbol]])
+                for symbol in symbols
+                if symbol in self.index
+            )
+        # NaN marca símbolos sem preço no último ciclo
+        return {symbol: price for symbol, price in pairs if price == price}
+
+    def get_exchange_info(self) -> Optional[Dict[str, Any]]:
+        """
+        Retorna o exchangeInfo publicado; o mesmo objeto é devolvido até a próxima versão.
+        """
+        if self.exchange_info_block.sequence() != self._exchange_info_seq:
+            seq, _, payload = self.exchange_info_block.read()
+            if payload:
+                self._exchange_info = loads(payload)
+            self._exchange_info_seq = seq
+        return self._exchange_info
+
+    def close(self):
+        self.prices_block.close()
+        self.exchange_info_block.close()
+
+
+class SharedMarketPublicService:
+    def __init__(self, market_data: SharedMarketData):
+        """
+        Substituto do BinancePublicService nos processos de conta: lê os preços
+        publicados na memória compartilhada em vez de chamar a Binance.
+        """
+        self.market_data = market_data
+        self.price_stream = None
+
+    def get_current_prices(self, symbols=None):
+        return self.market_data.get_prices(symbols)
+
+    def get_current_price(self, asset_name):
+        if asset_name.upper() == "USDT":
+            return 1.0
+        if asset_name.upper() == "BRL":
+            price = self.market_data.get_prices(["USDTBRL"]).get("USDTBRL")
+            return 1 / price if price else None
+        return self.market_data.get_prices([f"{asset_name.upper()}USDT"]).get(
+            f"{asset_name.upper()}USDT"
+        )
+
+
+class SharedExchangeInfoCache:
+    def __init__(self, market_data: SharedMarketData):
+        """
+        Substituto do ExchangeInfoCache nos processos de conta.
+        """
+        self.market_data = market_data
+
+    def get(self, symbols: Iterable[str] = None) -> Dict[str, Any]:
+        return self.market_data.get_exchange_info()
@@ -0,0 +1,158 @@
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from core.database.crypto_assets_manager import CryptoAssetsManager
+from core.database.google_sheet_crypto_reader import GoogleSheetCryptoReader
+from core.services.http_transport import HttpTransport, get_http_transport
+from core.use_cases.sync_crypto_data import apply_crypto_assets, parse_crypto_table
+
+logger = logging.getLogger(__name__)
+
+
+class SheetWatcher:
+    def __init__(
+        self,
+        sheet_url: str,
+        db_manager: CryptoAssetsManager,
+        interval: float = 300.0,
+        on_change: Optional[Callable[[Dict[str, Any]], None]] = None,
+        transport: HttpTransport = None,
+        reader_mode: str = "stream",
+        remove_missing: bool = False,
+        max_removed_fraction: float = 0.2,
+    ):
+        """
+        Acompanha a planilha em segundo plano e aplica as metas alteradas sem reiniciar o bot.
+
+        O CSV é baixado com requisições condicionais (ETag / Last-Modified) quando
+        o servidor as suporta; sem elas, o hash do conteúdo evita reprocessar uma
+        planilha que não mudou. As alterações são aplicadas de uma vez no
+        db_manager, que o analisador lê a cada ciclo.
+
+        :param sheet_url: URL da planilha Google Sheets.
+        :param db_manager: Gerenciador do banco usado pelo analisador.
+        :param interval: Intervalo, em segundos, entre verificações.
+        :param on_change: Chamado com o resumo das alterações quando algo muda.
+        :param transport: Transporte HTTP (usa o compartilhado por padrão).
+        :param reader_mode: "stream" (sem pandas) ou "pandas".
+        :param remove_missing: Remove do banco os ativos que saíram da planilha.
+            Desativado por padrão: uma leitura incompleta em segundo plano não
+            deve levar o analisador a vender posições.
+        :param max_removed_fraction: Fração máxima dos ativos que uma única
+            verificação pode remover; acima dela a planilha é ignorada.
+        """
+        self.reader = GoogleSheetCryptoReader(sheet_url)
+        self.db_manager = db_manager
+        self.interval = interval
+        self.on_change = on_change
+        self.transport = transport or get_http_transport()
+        self.reader_mode = reader_mode
+        self.remove_missing = remove_missing
+        self.max_removed_fraction = max_removed_fraction
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._digest: Optional[str] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.fetches = 0
+        self.not_modified = 0
+        self.unchanged = 0
+        self.applied = 0
+        self.errors = 0
+        self.last_fetch_ms = 0.0
+        self.last_parse_ms = 0.0
+        self.last_check = 0.0
+
+    def check(self) -> Optional[Dict[str, Any]]:
+        """
+        Verifica a planilha uma vez.
+
+        :return: Resumo das alterações aplicadas, ou None se nada mudou.
+        """
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+
+        start = time.perf_counter()
+        response = self.transport.get(self.reader.get_csv_url(), headers=headers)
+        self.last_fetch_ms = (time.perf_counter() - start) * 1000
+        self.fetches += 1
+        self.last_check = time.time()
+
+        if response.status_code == 304:
+            self.not_modified += 1
+            return None
+        response.raise_for_status()
+        self._etag = response.headers.get("ETag")
+        self._last_modified = response.headers.get("Last-Modified")
+
+        digest = hashlib.sha256(response.content).hexdigest()
+        if digest == self._digest:
+            self.unchanged += 1
+            return None
+
+        start = time.perf_counter()
+        if self.reader_mode == "pandas":
+            parsed_assets = parse_crypto_table(self.reader.parse_csv(response.content))
+        else:
+            parsed_assets = self.reader.parse_crypto_assets(response.content)
+        changes = apply_crypto_assets(
+            parsed_assets,
+            self.db_manager,
+            remove_missing=self.remove_missing,
+            max_removed_fraction=self.max_removed_fraction,
+        )
+        self.last_parse_ms = (time.perf_counter() - start) * 1000
+        # Só memoriza o hash depois de aplicar, para tentar de novo em caso de erro
+        self._digest = digest
+
+        if not (changes["added"] or changes["changed"] or changes["removed"]):
+            self.unchanged += 1
+            return None
+        self.applied += 1
+        logger.info(
+            f"Planilha atualizada: {len(changes['added'])} adicionado(s), "
+            f"{len(changes['changed'])} alterado(s), {len(changes['removed'])} removido(s)."
+        )
+        if self.on_change:
+            self.on_change(changes)
+        return changes
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Erro ao verificar a planilha: {e}")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "fetches": self.fetches,
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+            "applied": self.applied,
+            "errors": self.errors,
+            "last_fetch_ms": self.last_fetch_ms,
+            "last_parse_ms": self.last_parse_ms,
+            "last_check": self.last_check,
+        }
@@ -1,15 +1,38 @@
+import threading
+
+
 class StateManager:
     def __init__(self):
-        self.running = True
+        self._running = threading.Event()
+        self._running.set()
+        self._listeners = []
+
+    @property
+    def running(self):
+        return self._running.is_set()
+
+    def add_listener(self, callback):
+        """Registra uma função chamada com o novo estado a cada mudança."""
+        self._listeners.append(callback)
 
     def start(self):
         """Inicia o loop."""
-        self.running = True
+        self._running.set()
+        self._notify()
 
     def stop(self):
         """Pausa o loop."""
-        self.running = False
+        self._running.clear()
+        self._notify()
 
     def is_running(self):
         """Verifica se o loop está ativo."""
-        return self.running
+        return self._running.is_set()
+
+    def wait_until_running(self, timeout=None):
+        """Bloqueia até o loop ser retomado; retorna False se o timeout expirar."""
+        return self._running.wait(timeout)
+
+    def _notify(self):
+        for callback in self._listeners:
+            callback(self.is_running())
@@ -0,0 +1,93 @@
+import time
+from typing import Optional
+
+from core.entities.cycle_snapshot import CycleSnapshot
+
+HELP_MESSAGE = (
+    "Comandos disponíveis:\n"
+    "/start - retoma o bot\n"
+    "/stop - pausa o bot\n"
+    "/status - estado atual\n"
+    "/portfolio - ativos do último ciclo\n"
+    "/drift - desvio de cada ativo em relação à meta\n"
+    "/orders - ordens do último ciclo"
+)
+
+NO_SNAPSHOT_MESSAGE = "Nenhum ciclo concluído ainda."
+
+
+def parse_command(text: str) -> Optional[str]:
+    """
+    Extrai o comando de uma mensagem ("/Drift@meu_bot 10" -> "/drift").
+
+    :return: Comando em minúsculas, ou None se a mensagem não for um comando.
+    """
+    text = text.strip()
+    if not text.startswith("/"):
+        return None
+    return text.split()[0].split("@")[0].lower()
+
+
+def _age(snapshot: CycleSnapshot) -> str:
+    return f"Ciclo de {time.time() - snapshot.finished_at:.0f}s atrás."
+
+
+def format_portfolio(snapshot: Optional[CycleSnapshot], limit: int = 20) -> str:
+    """
+    Resumo dos ativos do último ciclo, ordenados por percentual.
+    """
+    if snapshot is None:
+        return NO_SNAPSHOT_MESSAGE
+    lines = [f"Portfólio: ${snapshot.portfolio_value:,.2f}"]
+    for asset in snapshot.assets[:limit]:
+        lines.append(
+            f"{asset['name']}: {asset.get('percentual', 0.0):.2f}% "
+            f"(${asset['value']:,.2f})"
+        )
+    if len(snapshot.assets) > limit:
+        lines.append(f"... e mais {len(snapshot.assets) - limit} ativo(s).")
+    lines.append(_age(snapshot))
+    return "\n".join(lines)
+
+
+def format_drift(snapshot: Optional[CycleSnapshot], limit: int = 20) -> str:
+    """
+    Desvio percentual de cada ativo em relação à meta, do maior para o menor.
+    """
+    if snapshot is None:
+        return NO_SNAPSHOT_MESSAGE
+    with_target = [r for r in snapshot.recommendations if "difference" in r]
+    with_target.sort(key=lambda r: abs(r["difference"]), reverse=True)
+    lines = ["Desvio em relação à meta:"]
+    for recommendation in with_target[:limit]:
+        lines.append(
+            f"{recommendation['name']}: {recommendation['difference']:+.2f}% "
+            f"(atual {recommendation['current_percentage']:.2f}%, "
+            f"meta {recommendation['saved_percentage']:.2f}%) - {recommendation['action']}"
+        )
+    unknown = [r["name"] for r in snapshot.recommendations if "difference" not in r]
+    if unknown:
+        lines.append(f"Fora da planilha: {', '.join(unknown)}")
+    lines.append(_age(snapshot))
+    return "\n".join(lines)
+
+
+def format_orders(snapshot: Optional[CycleSnapshot]) -> str:
+    """
+    Ordens enviadas no último ciclo.
+    """
+    if snapshot is None:
+        return NO_SNAPSHOT_MESSAGE
+    if not snapshot.orders:
+        return f"Nenhuma ordem no último ciclo.\n{_age(snapshot)}"
+    lines = [f"Ordens do último ciclo ({len(snapshot.orders)}):"]
+    for order in snapshot.orders:
+        if order.ok:
+            lines.append(
+                f"{order.action} {order.symbol} {order.quantity} @ {order.price} "
+                f"- {order.status}"
+            )
+        else:
+            lines.append(f"{order.action} {order.symbol} - erro: {order.error}")
+    lines.append(_age(snapshot))
+    return "\n".join(lines)
@@ -1,15 +1,27 @@
 import time
 import requests
 import logging
+from typing import Optional
+
+from core.services.http_transport import HttpTransport, get_http_transport
+from core.services.telegram_commands import (
+    HELP_MESSAGE,
+    format_drift,
+    format_orders,
+    format_portfolio,
+    parse_command,
+)
 
 
 class TelegramNotifier:
-    def __init__(self, bot_token):
+    def __init__(self, bot_token, transport: HttpTransport = None):
         """
         Inicializa o TelegramNotifier com o token do bot.
         :param bot_token: Token do bot fornecido pelo Telegram.
+        :param transport: Transporte HTTP; por padrão usa o pool compartilhado.
         """
         self.bot_token = bot_token
+        self.transport = transport or get_http_transport()
         self.api_url = f"https://api.telegram.org/bot{self.bot_token}"
 
     def send_message(self, message, chat_id):
@@ -19,7 +31,7 @@ class TelegramNotifier:
         :param chat_id: ID do chat no Telegram.
         """
         try:
-            response = requests.post(
+            response = self.transport.post(
                 f"{self.api_url}/sendMessage",
                 json={"chat_id": chat_id, "text": message, "parse_mode": "HTML"},
             )
@@ -28,44 +40,114 @@ class TelegramNotifier:
         except requests.exceptions.RequestException as e:
             logging.error(f"Erro ao enviar mensagem para o Telegram: {e}")
 
-    def get_updates(self, offset):
+    def deliver(self, message, chat_id) -> Optional[float]:
         """
-        Busca atualizações de mensagens do Telegram.
+        Envia uma mensagem sem tratar o limite de envio do Telegram.
+        :param message: Conteúdo da mensagem.
+        :param chat_id: ID do chat no Telegram.
+        :return: None se enviada, ou os segundos de espera (retry_after) em caso de HTTP 429.
+        """
+        response = self.transport.post(
+            f"{self.api_url}/sendMessage",
+            json={"chat_id": chat_id, "text": message, "parse_mode": "HTML"},
+        )
+        if response.status_code == 429:
+            try:
+                parameters = response.json().get("parameters", {})
+            except ValueError:
+                parameters = {}
+            return float(parameters.get("retry_after", 1))
+        response.raise_for_status()
+        return None
+
+    def get_updates(self, offset, timeout: int = 50):
+        """
+        Busca atualizações de mensagens do Telegram por long-polling.
         :param offset: Offset para buscar somente mensagens novas.
-        :return: Lista de atualizações (mensagens).
+        :param timeout: Tempo, em segundos, que o Telegram segura a requisição sem novidades.
+        :return: Lista de atualizações (mensagens), ou None em caso de erro.
         """
         try:
-            response = requests.get(
-                f"{self.api_url}/getUpdates", params={"offset": offset, "timeout": 10}
+            # O timeout de leitura precisa cobrir o long-polling do Telegram.
+            response = self.transport.get(
+                f"{self.api_url}/getUpdates",
+                params={
+                    "offset": offset,
+                    "timeout": timeout,
+                    "allowed_updates": '["message"]',
+                },
+                timeout=(
+                    self.transport.timeout[0],
+                    timeout + self.transport.timeout[1],
+                ),
             )
             response.raise_for_status()
             return response.json().get("result", [])
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             logging.error(f"Erro ao buscar atualizações do Telegram: {e}")
-            return []
+            return None
 
-    def monitor_telegram(self, chat_id, state_manager):
+    def monitor_telegram(self, chat_id, state_manager, snapshot_source=None):
         """
-        Monitora o Telegram por comandos como /start, /stop e /status.
+        Monitora o Telegram por comandos como /start, /stop, /status, /portfolio,
+        /drift e /orders.
+
+        As consultas são respondidas com o último ciclo em memória, sem chamadas
+        à Binance. Mensagens de outros chats são ignoradas.
         :param chat_id: ID do chat onde o bot está operando.
         :param state_manager: Instância do gerenciador de estado.
+        :param snapshot_source: Função que retorna o último CycleSnapshot (ou None).
         """
+        snapshot_source = snapshot_source or (lambda: None)
+        handlers = {
+            "/start": lambda: self._start(state_manager),
+            "/stop": lambda: self._stop(state_manager),
+            "/status": lambda: self._status(state_manager),
+            "/portfolio": lambda: format_portfolio(snapshot_source()),
+            "/drift": lambda: format_drift(snapshot_source()),
+            "/orders": lambda: format_orders(snapshot_source()),
+            "/help": lambda: HELP_MESSAGE,
+        }
         offset = 0
+        errors = 0
 
         while True:
             updates = self.get_updates(offset)
+            if updates is None:
+                # Sem long-polling em caso de erro: espera antes de tentar de novo
+                errors += 1
+                time.sleep(min(2**errors, 60))
+                continue
+            errors = 0
             for update in updates:
                 offset = update["update_id"] + 1
-                message = update["message"]["text"].strip().lower()
+                message = update.get("message") or {}
+                text = message.get("text")
+                if not text:
+                    continue
+                if chat_id and str(message.get("chat", {}).get("id")) != str(chat_id):
+                    continue
+                handler = handlers.get(parse_command(text))
+                if handler is None:
+                    continue
+                try:
+                    reply = handler()
+                except Exception as e:
+                    logging.error(f"Erro ao executar comando {text!r}: {e}")
+                    reply = "Erro ao executar o comando."
+                self.send_message(reply, chat_id)
+
+    @staticmethod
+    def _start(state_manager):
+        state_manager.start()
+        return "O bot foi iniciado."
 
-                if message == "/start":
-                    state_manager.start()
-                    self.send_message("O bot foi iniciado.", chat_id)
-                elif message == "/stop":
-                    state_manager.stop()
-                    self.send_message("O bot foi pausado.", chat_id)
-                elif message == "/status":
-                    status = "rodando" if state_manager.is_running() else "pausado"
-                    self.send_message(f"O bot está atualmente {status}.", chat_id)
+    @staticmethod
+    def _stop(state_manager):
+        state_manager.stop()
+        return "O bot foi pausado."
 
-            time.sleep(1)
+    @staticmethod
+    def _status(state_manager):
+        status = "rodando" if state_manager.is_running() else "pausado"
+        return f"O bot está atualmente {status}."
@@ -0,0 +1,199 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from core.services.telegram_notifier import TelegramNotifier
+
+logger = logging.getLogger(__name__)
+
+# Limite de tamanho de uma mensagem do Telegram
+MAX_MESSAGE_LENGTH = 4096
+
+_FLUSH = object()
+_STOP = object()
+
+
+class TelegramOutbox:
+    def __init__(
+        self,
+        notifier: TelegramNotifier,
+        coalesce_window: float = 2.0,
+        min_interval: float = 1.0,
+        max_attempts: int = 5,
+    ):
+        """
+        Fila de saída das notificações do Telegram, esvaziada por uma thread própria.
+
+        enqueue nunca bloqueia: o caminho das ordens só coloca a mensagem na
+        fila. As mensagens de um mesmo ciclo são agrupadas em um único resumo
+        por chat, enviado em flush() (fim do ciclo) ou coalesce_window segundos
+        após a primeira mensagem pendente. Respostas 429 são repetidas após o
+        retry_after informado pelo Telegram; 5xx e erros de rede, com espera
+        exponencial. Os demais erros (4xx, como chat_id inválido ou HTML mal
+        formado) não se resolvem sozinhos e descartam a mensagem na hora.
+
+        :param notifier: Cliente do Telegram usado no envio.
+        :param coalesce_window: Espera máxima, em segundos, para agrupar mensagens.
+        :param min_interval: Intervalo mínimo, em segundos, entre envios ao mesmo chat.
+        :param max_attempts: Tentativas por mensagem antes de descartá-la.
+        """
+        self.notifier = notifier
+        self.coalesce_window = coalesce_window
+        self.min_interval = min_interval
+        self.max_attempts = max_attempts
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._pending: Dict[Any, List[str]] = {}
+        self._first_pending_at: Optional[float] = None
+        self._last_sent: Dict[Any, float] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self.enqueued = 0
+        self.sent = 0
+        self.digests = 0
+        self.retries = 0
+        self.dropped = 0
+
+    def enqueue(self, message: str, chat_id):
+        """
+        Agenda uma mensagem; retorna imediatamente.
+        """
+        if not chat_id:
+            return
+        self._ensure_started()
+        self.enqueued += 1
+        self._queue.put((chat_id, message))
+
+    def flush(self):
+        """
+        Marca o fim do ciclo: as mensagens pendentes saem em um resumo.
+        """
+        if self._thread is not None:
+            self._queue.put(_FLUSH)
+
+    def close(self, timeout: float = 10.0):
+        """
+        Envia o que estiver pendente e encerra a thread.
+        """
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="telegram-outbox", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            timeout = None
+            if self._first_pending_at is not None:
+                timeout = max(
+                    0.0, self._first_pending_at + self.coalesce_window - time.time()
+                )
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._send_pending()
+                continue
+
+            if item is _STOP:
+                self._send_pending()
+                return
+            if item is _FLUSH:
+                self._send_pending()
+                continue
+            chat_id, message = item
+            self._pending.setdefault(chat_id, []).append(message)
+            if self._first_pending_at is None:
+                self._first_pending_at = time.time()
+
+    def _send_pending(self):
+        pending, self._pending = self._pending, {}
+        self._first_pending_at = None
+        for chat_id, messages in pending.items():
+            if len(messages) > 1:
+                self.digests += 1
+            for text in self._build_digest(messages):
+                self._deliver(text, chat_id)
+
+    @staticmethod
+    def _build_digest(messages: List[str]) -> List[str]:
+        """
+        Junta as mensagens em um resumo, dividido no limite de tamanho do Telegram.
+        """
+        if len(messages) == 1:
+            lines = messages
+        else:
+            lines = [f"Resumo do ciclo ({len(messages)} mensagens):"] + [
+                f"• {message}" for message in messages
+            ]
+        chunks, current = [], ""
+        for line in lines:
+            line = line[:MAX_MESSAGE_LENGTH]
+            if current and len(current) + 1 + len(line) > MAX_MESSAGE_LENGTH:
+                chunks.append(current)
+                current = line
+            else:
+                current = f"{current}\n{line}" if current else line
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _deliver(self, text: str, chat_id):
+        for attempt in range(1, self.max_attempts + 1):
+            wait = self._last_sent.get(chat_id, 0.0) + self.min_interval - time.time()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                retry_after = self.notifier.deliver(text, chat_id)
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                logger.error(f"Erro de rede ao enviar mensagem para o Telegram: {e}")
+                retry_after = min(2**attempt, 30)
+            except requests.exceptions.HTTPError as e:
+                status = getattr(e.response, "status_code", None)
+                if status is None or status < 500:
+                    self.dropped += 1
+                    logger.error(f"Mensagem do Telegram descartada: {e}")
+                    return
+                logger.error(f"Erro do Telegram ao enviar mensagem: {e}")
+                retry_after = min(2**attempt, 30)
+            except Exception as e:
+                self.dropped += 1
+                logger.error(f"Mensagem do Telegram descartada: {e}")
+                return
+            self._last_sent[chat_id] = time.time()
+            if retry_after is None:
+                self.sent += 1
+                return
+            self.retries += 1
+            logger.warning(
+                f"Telegram pediu espera de {retry_after:g}s "
+                f"(tentativa {attempt}/{self.max_attempts})."
+            )
+            time.sleep(retry_after)
+        self.dropped += 1
+        logger.error("Mensagem do Telegram descartada após várias tentativas.")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "digests": self.digests,
+            "retries": self.retries,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+        }
@@ -1,8 +1,12 @@
 import logging
 from typing import List, Dict, Any, Optional
 
+import numpy as np
+
 from config import get_config
 from core.database.crypto_assets_manager import CryptoAssetsManager
+from core.use_cases.portfolio_valuation import PortfolioValuation
+from core.use_cases.vectorized_allocation import VectorizedAllocationEngine
 
 
 logger = logging.getLogger(__name__)
@@ -13,9 +17,13 @@ class AssetAnalyzer:
         self,
         crypto_assets_manager: CryptoAssetsManager,
         max_percentage_difference: float,
+        vectorized: bool = False,
     ):
         self.db_manager = crypto_assets_manager
         self.max_percentage_difference = max_percentage_difference
+        # Usa o motor NumPy em vez do laço por ativo
+        self.vectorized = vectorized
+        self.last_saved_assets: Dict[str, Dict] = {}
 
     def analyze_differences(
         self,
@@ -23,10 +31,17 @@ class AssetAnalyzer:
         portfolio_value: float,
     ) -> List[Dict[str, Any]]:
         logger.info("Analisando diferenças percentuais...")
-        saved_assets = self.db_manager.get_all_assets()
-        saved_asset_dict = {
-            asset_data["crypto"].lower(): asset_data for asset_data in saved_assets
-        }
+        saved_asset_dict = self._load_saved_assets()
+
+        if self.vectorized:
+            return self._analyze_vectorized(
+                [asset["name"] for asset in asset_details],
+                [asset["quantity"] for asset in asset_details],
+                [asset["price"] for asset in asset_details],
+                [asset.get("percentual", np.nan) for asset in asset_details],
+                saved_asset_dict,
+                portfolio_value,
+            )
 
         recommendations = []
 
@@ -39,6 +54,38 @@ class AssetAnalyzer:
 
         return recommendations
 
+    def analyze_valuation(
+        self, valuation: PortfolioValuation
+    ) -> List[Dict[str, Any]]:
+        """
+        Analisa o modelo de valorização incremental do portfólio.
+
+        Quantidades, preços e total vêm de um único snapshot do modelo, do
+        maior para o menor valor, mesmo com ticks chegando durante a análise.
+        """
+        positions, portfolio_value = valuation.snapshot()
+        positions.sort(key=lambda position: position[3], reverse=True)
+        asset_details = [
+            {
+                "name": name,
+                "quantity": quantity,
+                "price": price,
+                "percentual": (
+                    value / portfolio_value * 100 if portfolio_value > 0 else 0.0
+                ),
+            }
+            for name, quantity, price, value in positions
+        ]
+        return self.analyze_differences(asset_details, portfolio_value)
+
+    def _load_saved_assets(self) -> Dict[str, Dict]:
+        saved_assets = self.db_manager.get_all_assets()
+        saved_asset_dict = {
+            asset_data["crypto"].lower(): asset_data for asset_data in saved_assets
+        }
+        self.last_saved_assets = saved_asset_dict
+        return saved_asset_dict
+
     def analyze_asset_difference_percentual(
         self,
         asset: Dict[str, float],
@@ -138,6 +185,80 @@ class AssetAnalyzer:
         }
         return recommendation
 
+    def _analyze_vectorized(
+        self,
+        names: List[str],
+        quantities: List[float],
+        prices: List[float],
+        weights: List[float],
+        saved_asset_dict: Dict[str, Dict],
+        portfolio_value: float,
+    ) -> List[Dict[str, Any]]:
+        """
+        Mesmas decisões de analyze_asset_difference_percentual, calculadas de uma vez.
+
+        :param weights: Percentual atual de cada ativo no portfólio.
+        """
+        if not names:
+            return []
+        saved = [saved_asset_dict.get(name.lower()) for name in names]
+        known = np.array([s is not None for s in saved])
+        result = VectorizedAllocationEngine(
+            self.max_percentage_difference, get_config()["min_order_value"]
+        ).analyze_percentual(
+            quantities=quantities,
+            prices=prices,
+            target_percentual=[s["percentual"] if s else np.nan for s in saved],
+            meta_moeda=[s["meta_moeda"] if s else np.nan for s in saved],
+            preco_medio=[s["preco_medio"] if s else np.nan for s in saved],
+            known=known,
+            weights=weights,
+            portfolio_value=portfolio_value,
+        )
+
+        drift = result["drift"].tolist()
+        difference_total = result["difference_total"].tolist()
+        quantity = result["quantity"].tolist()
+        buy = result["buy"].tolist()
+        sell = result["sell"].tolist()
+
+        recommendations = []
+        for i, name in enumerate(names):
+            if saved[i] is None:
+                logger.warning(
+                    f"{name}: Não encontrado no banco de dados. Recomendado vender tudo."
+                )
+                recommendations.append(
+                    {
+                        "name": name,
+                        "action": "sell_all",
+                        "quantity": quantities[i],
+                        "price": prices[i],
+                        "message": "Ativo não encontrado no portfólio salvo. Recomendado vender tudo.",
+                    }
+                )
+                continue
+
+            recommendation = {
+                "name": name,
+                "current_percentage": weights[i],
+                "saved_percentage": saved[i]["percentual"],
+                "difference": drift[i],
+                "difference_total": difference_total[i],
+                "preco_medio": saved[i]["preco_medio"],
+            }
+            if sell[i]:
+                recommendation["action"] = "sell"
+                recommendation["quantity"] = quantity[i]
+            elif buy[i]:
+                recommendation["action"] = "buy"
+                recommendation["quantity"] = quantity[i]
+            else:
+                recommendation["action"] = "hold"
+            recommendation["price"] = prices[i]
+            recommendations.append(recommendation)
+        return recommendations
+
     def _create_recommendation(
         self, asset: Dict[str, float], saved_asset: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from core.services.async_services import (
+    AsyncBinancePrivateService,
+    AsyncBinancePublicService,
+)
+from core.use_cases.portfolio_analysis import PortfolioAnalysis
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPortfolioAnalysis:
+    def __init__(self, analysis: PortfolioAnalysis, max_workers: int = 8):
+        """
+        Motor assíncrono do ciclo de análise do portfólio.
+
+        Saldos, preços e exchangeInfo são buscados em paralelo e as ordens
+        independentes são enviadas ao mesmo tempo. A lógica de análise e de
+        quantização é a mesma do PortfolioAnalysis síncrono.
+
+        :param analysis: Instância síncrona cujos componentes são reaproveitados.
+        :param max_workers: Tamanho do executor compartilhado pelas chamadas de I/O.
+        """
+        self.analysis = analysis
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="async-io"
+        )
+        self.public_service = AsyncBinancePublicService(
+            analysis.public_service, self.executor
+        )
+        self.private_service = AsyncBinancePrivateService(
+            analysis.portfolio_manager.balance_source, self.executor
+        )
+        self.loop = asyncio.new_event_loop()
+
+    async def _call(self, function, *args, **kwargs):
+        return await self.loop.run_in_executor(
+            self.executor, partial(function, *args, **kwargs)
+        )
+
+    async def analyze_portfolio(self):
+        started = time.perf_counter()
+        portfolio_manager = self.analysis.portfolio_manager
+
+        # Passos 1 a 3 em paralelo: saldos, preços e informações de troca. O
+        # exchangeInfo é pedido para os pares do ciclo anterior; no primeiro
+        # ciclo eles ainda não são conhecidos e a consulta fica para depois
+        logger.info("Buscando saldos, preços e informações de troca em paralelo...")
+        known_symbols = {
+            f"{name}USDT" for name in list(portfolio_manager.valuation.positions)
+        }
+        requests = [
+            self.private_service.get_account_assets(),
+            self._call(portfolio_manager.get_prices),
+        ]
+        if known_symbols:
+            requests.append(
+                self._call(self.analysis.exchange_info_cache.get, sorted(known_symbols))
+            )
+        binance_assets, all_prices, *exchange_info = await asyncio.gather(*requests)
+        combined_assets = await self._call(
+            portfolio_manager.get_combined_assets, binance_assets
+        )
+        if not portfolio_manager.has_known_prices(combined_assets):
+            # Novos ativos na carteira: a listagem paralela pode não cobri-los
+            all_prices = await self._call(
+                portfolio_manager.get_prices, combined_assets
+            )
+
+        asset_details, portfolio_value = portfolio_manager.calculate_portfolio_details(
+            combined_assets, all_prices
+        )
+        symbols = {f"{asset['name']}USDT" for asset in asset_details}
+        if exchange_info and symbols <= known_symbols:
+            exchange_info = exchange_info[0]
+        else:
+            # Primeiro ciclo ou ativos novos: amplia o escopo do exchangeInfo
+            exchange_info = await self._call(
+                self.analysis.exchange_info_cache.get, sorted(symbols)
+            )
+
+        # Passo 4: Analisar diferenças e obter recomendações
+        recommendations = await self._call(
+            self.analysis.asset_analyzer.analyze_valuation,
+            portfolio_manager.valuation,
+        )
+
+        # Passo 5: Enviar as ordens independentes ao mesmo tempo
+        results = await self.execute_recommendations(recommendations, exchange_info)
+        self.analysis.record_snapshot(
+            started, asset_details, portfolio_value, recommendations, results
+        )
+
+    async def execute_recommendations(self, recommendations, exchange_info):
+        orders = self.analysis.build_orders(recommendations)
+        prepared = self.analysis.order_executor.prepare_orders(orders, exchange_info)
+        results = await asyncio.gather(
+            *(
+                self._call(self.analysis.order_executor.execute_order, order)
+                for order in prepared
+            )
+        )
+        self.analysis.log_sell_all(orders)
+        return list(results)
+
+    def run_cycle(self):
+        """
+        Executa um ciclo completo de forma síncrona, no loop de eventos compartilhado.
+        """
+        return self.loop.run_until_complete(self.analyze_portfolio())
+
+    def close(self):
+        self.loop.close()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,98 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable
+
+from core.database.kline_store import KlineStore
+from core.services.binance_base_service import BinanceAPIError
+from core.services.binance_public_service import BinancePublicService
+
+logger = logging.getLogger(__name__)
+
+# Máximo de candles por requisição aceito pela Binance
+PAGE_SIZE = 1000
+
+
+class KlineBackfill:
+    def __init__(
+        self,
+        public_service: BinancePublicService,
+        store: KlineStore,
+        max_workers: int = 4,
+    ):
+        """
+        Preenche o KlineStore com candles da Binance, em paralelo por símbolo.
+
+        Cada símbolo retoma do último candle salvo, então uma execução
+        interrompida continua de onde parou. Só candles já fechados são
+        gravados, mantendo os arquivos apenas com anexação.
+
+        :param public_service: Serviço público da Binance (requisições em prioridade LOW).
+        :param store: Histórico local de candles.
+        :param max_workers: Símbolos baixados ao mesmo tempo.
+        """
+        self.public_service = public_service
+        self.store = store
+        self.max_workers = max_workers
+
+    def backfill(
+        self, symbols: Iterable[str], start_time: int, end_time: int = None
+    ) -> Dict[str, int]:
+        """
+        :param symbols: Pares a preencher (ex.: "BTCUSDT").
+        :param start_time: Início, em milissegundos, para símbolos sem histórico.
+        :param end_time: Fim, em milissegundos; por padrão, agora.
+        :return: Candles gravados por símbolo (-1 quando o símbolo falhou).
+        """
+        symbols = sorted({symbol.upper() for symbol in symbols})
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="klines"
+        ) as executor:
+            futures = {
+                symbol: executor.submit(
+                    self._backfill_symbol, symbol, start_time, end_time
+                )
+                for symbol in symbols
+            }
+        results = {}
+        for symbol, future in futures.items():
+            try:
+                results[symbol] = future.result()
+            except BinanceAPIError as e:
+                logger.warning(f"{symbol}: candles não disponíveis ({e}).")
+                results[symbol] = -1
+        return results
+
+    def update(self, symbols: Iterable[str] = None) -> Dict[str, int]:
+        """
+        Anexa os candles novos dos símbolos que já têm histórico.
+        """
+        symbols = self.store.symbols() if symbols is None else symbols
+        return self.backfill(symbols, start_time=int(time.time() * 1000))
+
+    def _backfill_symbol(self, symbol: str, start_time: int, end_time: int = None) -> int:
+        last = self.store.last_open_time(symbol)
+        cursor = start_time if last is None else last + self.store.interval_ms
+        written = 0
+        while True:
+            now = int(time.time() * 1000)
+            limit_time = now if end_time is None else min(end_time, now)
+            if cursor >= limit_time:
+                break
+            klines = self.public_service.get_klines(
+                symbol,
+                interval=self.store.interval,
+                start_time=cursor,
+                end_time=limit_time - 1,
+                limit=PAGE_SIZE,
+            )
+            # O candle em andamento (close_time no futuro) fica para a próxima vez
+            closed = [kline for kline in klines if kline[6] < now]
+            if closed:
+                written += self.store.append(symbol, closed)
+                cursor = closed[-1][0] + self.store.interval_ms
+            if len(klines) < PAGE_SIZE or not closed:
+                break
+        if written:
+            logger.info(f"{symbol}: {written} candle(s) gravado(s).")
+        return written
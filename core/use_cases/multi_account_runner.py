@@ -0,0 +1,228 @@
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from typing import Any, Dict, List
+
+from core.database.crypto_assets_manager import CryptoAssetsManager
+from core.services.binance_private_service import BinancePrivateService
+from core.services.binance_public_service import BinancePublicService
+from core.services.exchange_info_cache import ExchangeInfoCache
+from core.services.rate_governor import RateGovernor
+from core.services.shared_market_data import (
+    SharedExchangeInfoCache,
+    SharedMarketData,
+    SharedMarketPublicService,
+)
+from core.use_cases.portfolio_analysis import PortfolioAnalysis
+from core.use_cases.sync_crypto_data import sync_crypto_data
+
+logger = logging.getLogger(__name__)
+
+
+def load_accounts(path: str) -> List[Dict[str, Any]]:
+    """
+    Carrega as contas de um arquivo JSON (lista de objetos).
+
+    Campos por conta: name, db_path, planilha, telegram_chat_id,
+    max_percentage_difference e as credenciais em api_key/api_secret ou,
+    de preferência, nos nomes de variáveis de ambiente api_key_env/api_secret_env.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        accounts = json.load(file)
+    for account in accounts:
+        if "api_key_env" in account:
+            account["api_key"] = os.getenv(account["api_key_env"])
+        if "api_secret_env" in account:
+            account["api_secret"] = os.getenv(account["api_secret_env"])
+        if not account.get("api_key") or not account.get("api_secret"):
+            raise ValueError(
+                f"API Key e Secret não foram encontradas para a conta {account.get('name')}."
+            )
+    return accounts
+
+
+def _run_shard(
+    accounts: List[Dict[str, Any]],
+    shared_names: Dict[str, str],
+    symbols: List[str],
+    commands,
+    results,
+    weight_limit: int,
+    default_max_percentage_difference: float,
+):
+    """
+    Processo de um grupo de contas: cada conta tem banco, credenciais e envio de
+    ordens próprios; os dados públicos vêm da memória compartilhada.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - [%(processName)s] %(message)s",
+    )
+    market_data = SharedMarketData(symbols, names=shared_names)
+    public_service = SharedMarketPublicService(market_data)
+    exchange_info_cache = SharedExchangeInfoCache(market_data)
+    # O limite de peso é por IP; cada processo fica com a sua parte
+    rate_governor = RateGovernor(weight_limit=weight_limit)
+
+    analyses = {}
+    outboxes = {}
+    for account in accounts:
+        db_path = account.get("db_path", f"crypto_db_{account['name']}.json")
+        if account.get("planilha"):
+            sync_crypto_data(account["planilha"], db_path=db_path)
+        private_service = BinancePrivateService(
+            rate_governor=rate_governor,
+            api_key=account["api_key"],
+            api_secret=account["api_secret"],
+            telegram_chat_id=account.get("telegram_chat_id"),
+        )
+        private_service.clock.start()
+        outboxes[account["name"]] = private_service.notifications
+        analyses[account["name"]] = PortfolioAnalysis(
+            public_service,
+            private_service,
+            CryptoAssetsManager(db_path=db_path),
+            account.get(
+                "max_percentage_difference", default_max_percentage_difference
+            ),
+            exchange_info_cache=exchange_info_cache,
+        )
+
+    while True:
+        command = commands.get()
+        if command is None:
+            break
+        for name, analysis in analyses.items():
+            start = time.perf_counter()
+            error = None
+            try:
+                analysis.analyze_portfolio()
+            except Exception as e:
+                error = str(e)
+            outboxes[name].flush()
+            results.put(
+                {
+                    "account": name,
+                    "cycle": command,
+                    "latency_ms": (time.perf_counter() - start) * 1000,
+                    "error": error,
+                }
+            )
+    for outbox in outboxes.values():
+        outbox.close()
+    market_data.close()
+
+
+class MultiAccountRunner:
+    def __init__(
+        self,
+        accounts: List[Dict[str, Any]],
+        processes: int,
+        interval: float,
+        weight_limit: int,
+        max_percentage_difference: float,
+    ):
+        """
+        Executa o rebalanceamento de várias contas distribuídas em processos.
+
+        O processo principal busca preços e exchangeInfo uma vez por ciclo e os
+        publica em memória compartilhada; cada processo atende sempre o mesmo
+        grupo de contas, mantendo o estado de cada uma isolado.
+
+        :param accounts: Contas carregadas por load_accounts.
+        :param processes: Quantidade de processos de contas.
+        :param interval: Intervalo mínimo, em segundos, entre ciclos.
+        :param weight_limit: Limite de peso por minuto do IP.
+        :param max_percentage_difference: Desvio padrão para contas sem valor próprio.
+        """
+        self.accounts = accounts
+        self.processes = max(1, min(processes, len(accounts)))
+        self.interval = interval
+        self.weight_limit = weight_limit
+        self.max_percentage_difference = max_percentage_difference
+        # Metade do limite de peso fica com o processo principal (preços e exchangeInfo)
+        self.public_service = BinancePublicService(
+            rate_governor=RateGovernor(weight_limit=weight_limit // 2)
+        )
+        self.exchange_info_cache = ExchangeInfoCache(self.public_service)
+        self.latencies: Dict[str, float] = {}
+
+    def run(self):
+        prices = self.public_service.get_current_prices()
+        market_data = SharedMarketData(sorted(prices))
+        market_data.publish_prices(prices)
+        exchange_info = self.exchange_info_cache.get()
+        market_data.publish_exchange_info(exchange_info)
+        published_version = self.exchange_info_cache.version
+
+        shard_weight = self.weight_limit // (2 * self.processes)
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        shards = []
+        for i in range(self.processes):
+            commands = context.Queue()
+            process = context.Process(
+                target=_run_shard,
+                args=(
+                    self.accounts[i :: self.processes],
+                    market_data.names,
+                    market_data.symbols,
+                    commands,
+                    results,
+                    shard_weight,
+                    self.max_percentage_difference,
+                ),
+                name=f"contas-{i}",
+                daemon=True,
+            )
+            process.start()
+            shards.append((process, commands))
+
+        cycle = 0
+        try:
+            while True:
+                started = time.time()
+                cycle += 1
+                if cycle > 1:
+                    market_data.publish_prices(self.public_service.get_current_prices())
+                    exchange_info = self.exchange_info_cache.get()
+                    if self.exchange_info_cache.version != published_version:
+                        market_data.publish_exchange_info(exchange_info)
+                        published_version = self.exchange_info_cache.version
+
+                for _, commands in shards:
+                    commands.put(cycle)
+                self._collect(results, cycle)
+
+                elapsed = time.time() - started
+                time.sleep(max(0.0, self.interval - elapsed))
+        finally:
+            for process, commands in shards:
+                commands.put(None)
+            for process, _ in shards:
+                process.join(timeout=10)
+            market_data.close()
+
+    def _collect(self, results, cycle: int):
+        pending = len(self.accounts)
+        while pending:
+            try:
+                result = results.get(timeout=300)
+            except queue.Empty:
+                logger.error(f"Ciclo {cycle}: {pending} conta(s) sem resposta.")
+                return
+            if result["cycle"] != cycle:
+                continue
+            pending -= 1
+            self.latencies[result["account"]] = result["latency_ms"]
+            if result["error"]:
+                logger.error(
+                    f"Conta {result['account']}: erro no ciclo ({result['error']})"
+                )
+            else:
+                logger.info(
+                    f"Conta {result['account']}: ciclo concluído em {result['latency_ms']:.0f} ms"
+                )
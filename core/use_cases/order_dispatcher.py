@@ -0,0 +1,55 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from core.entities.order_result import OrderResult
+from core.use_cases.order_executor import OrderExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class OrderDispatcher:
+    def __init__(self, order_executor: OrderExecutor, max_workers: int = 4):
+        """
+        Envia ordens independentes em paralelo, com um pool de tamanho limitado.
+
+        Ordens do mesmo símbolo são enviadas em sequência, na ordem recebida;
+        símbolos diferentes seguem em paralelo.
+
+        :param order_executor: Executor responsável pelo envio de cada ordem.
+        :param max_workers: Quantidade máxima de ordens em voo ao mesmo tempo.
+        """
+        self.order_executor = order_executor
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="orders"
+        )
+
+    def dispatch(self, orders: List[Dict[str, Any]]) -> List[OrderResult]:
+        """
+        Envia ordens já preparadas por OrderExecutor.prepare_orders.
+
+        :return: Um OrderResult por ordem, na mesma ordem da lista recebida.
+        """
+        by_symbol: Dict[str, List[int]] = {}
+        for index, order in enumerate(orders):
+            by_symbol.setdefault(order["symbol"], []).append(index)
+
+        futures = [
+            self.executor.submit(self._run_sequence, [orders[i] for i in indexes])
+            for indexes in by_symbol.values()
+        ]
+
+        results: List[OrderResult] = [None] * len(orders)
+        for indexes, future in zip(by_symbol.values(), futures):
+            for index, result in zip(indexes, future.result()):
+                results[index] = result
+
+        for result in results:
+            logger.info(str(result))
+        return results
+
+    def _run_sequence(self, orders: List[Dict[str, Any]]) -> List[OrderResult]:
+        return [self.order_executor.execute_order(order) for order in orders]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
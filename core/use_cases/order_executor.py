@@ -1,9 +1,12 @@
 import logging
-from decimal import Decimal
-from typing import Dict, Any, Optional
+import threading
+import time
+from typing import Dict, Any, List, Optional
 
 from config import get_config
 from core.database.crypto_assets_manager import CryptoAssetsManager
+from core.entities.order_result import OrderResult
+from core.entities.symbol_rules import SymbolRules, SymbolRulesIndex
 from core.services.binance_private_service import BinancePrivateService
 from core.use_cases.update_average_price import atualizar_preco_medio
 
@@ -14,6 +17,11 @@ class OrderExecutor:
     def __init__(self, private_service: BinancePrivateService, crypto_assets_manager: CryptoAssetsManager = CryptoAssetsManager()):
         self.private_service = private_service  
         self.crypto_assets_manager = crypto_assets_manager
+        self._rules_index = SymbolRulesIndex({})
+        self._indexed_exchange_info = None
+        # atualizar_preco_medio lê e regrava o ativo; com o OrderDispatcher as
+        # ordens terminam em threads diferentes
+        self._preco_medio_lock = threading.Lock()
 
     def place_order(
         self,
@@ -24,60 +32,146 @@ class OrderExecutor:
         exchange_info: Dict[str, Any],
     ):
         try:
-            quantity_adjusted = self._adjust_price(price, quantity, symbol, action)
-            if not quantity_adjusted:
-                return
-            # Obter filtros
-            filters = self._get_filters(symbol, exchange_info)
-            if not filters:
-                return
-            # Formatar quantidade e preço
-            formatted_quantity = self._format_quantity(
-                quantity_adjusted, filters["step_size"]
+            rules = self._get_rules_index(exchange_info).get(symbol)
+            formatted_quantity = self._prepare_quantity(
+                action, symbol, quantity, price, rules
             )
+            if formatted_quantity is None:
+                return None
+        except Exception as e:
+            logger.error(f"Erro ao executar ordem de {action} para {symbol}: {e}")
+            return None
+        return self.execute_order(
+            {
+                "action": action,
+                "symbol": symbol,
+                "quantity": formatted_quantity,
+                "price": price,
+            }
+        )
 
-            # Verificar quantidade válida
-            if float(formatted_quantity) <= 0:
-                logger.error(
-                    f"Quantidade ajustada inválida para {symbol}: {formatted_quantity}"
-                )
-                return
+    def place_orders(
+        self, orders: List[Dict[str, Any]], exchange_info: Dict[str, Any]
+    ) -> List[OrderResult]:
+        """
+        Quantiza um lote de ordens em uma única passada e envia as válidas.
+
+        :param orders: Lista de dicts com "action", "symbol", "quantity" e "price".
+        """
+        return [
+            self.execute_order(order)
+            for order in self.prepare_orders(orders, exchange_info)
+        ]
+
+    def execute_order(self, order: Dict[str, Any]) -> OrderResult:
+        """
+        Envia uma ordem já preparada por prepare_orders.
+        """
+        start = time.perf_counter()
+        try:
+            response = self._execute(
+                order["action"], order["symbol"], order["quantity"], order["price"]
+            ) or {}
+        except Exception as e:
+            logger.error(
+                f"Erro ao executar ordem de {order['action']} para {order['symbol']}: {e}"
+            )
+            return OrderResult(
+                order["symbol"],
+                order["action"],
+                order["quantity"],
+                order["price"],
+                status="ERROR",
+                latency_ms=(time.perf_counter() - start) * 1000,
+                error=str(e),
+            )
+        return OrderResult(
+            order["symbol"],
+            order["action"],
+            order["quantity"],
+            order["price"],
+            status=response.get("status", "UNKNOWN"),
+            order_id=response.get("orderId"),
+            latency_ms=(time.perf_counter() - start) * 1000,
+        )
+
+    def prepare_orders(
+        self, orders: List[Dict[str, Any]], exchange_info: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Aplica limites de valor e a precisão do LOT_SIZE a um lote de ordens.
+
+        :return: Ordens válidas com a quantidade já formatada como string.
+        """
+        rules_index = self._get_rules_index(exchange_info)
+        prepared = []
+        for order in orders:
+            formatted_quantity = self._prepare_quantity(
+                order["action"],
+                order["symbol"],
+                order["quantity"],
+                order["price"],
+                rules_index.get(order["symbol"]),
+            )
+            if formatted_quantity is not None:
+                prepared.append({**order, "quantity": formatted_quantity})
+        return prepared
 
-            # Enviar ordem
-            self._send_order(action, symbol, formatted_quantity, price)
-            if action == "buy":
+    def _prepare_quantity(
+        self,
+        action: str,
+        symbol: str,
+        quantity: float,
+        price: float,
+        rules: Optional[SymbolRules],
+    ) -> Optional[str]:
+        quantity_adjusted = self._adjust_price(price, quantity, symbol, action)
+        if not quantity_adjusted:
+            return None
+        if rules is None:
+            logger.error(f"Erro ao obter filtros para {symbol}: símbolo sem regras")
+            return None
+        # Formatar quantidade
+        formatted_quantity = rules.format_quantity(quantity_adjusted)
+
+        # Verificar quantidade válida
+        if float(formatted_quantity) <= 0:
+            logger.error(
+                f"Quantidade ajustada inválida para {symbol}: {formatted_quantity}"
+            )
+            return None
+        return formatted_quantity
+
+    def _execute(self, action: str, symbol: str, formatted_quantity: str, price):
+        # Enviar ordem
+        response = self._send_order(action, symbol, formatted_quantity, price)
+        if action == "buy":
+            with self._preco_medio_lock:
                 atualizar_preco_medio(
-                    symbol.replace("USDT", ""), formatted_quantity, price, self.crypto_assets_manager
+                    symbol.replace("USDT", ""),
+                    formatted_quantity,
+                    price,
+                    self.crypto_assets_manager,
                 )
-        except Exception as e:
-            logger.error(f"Erro ao executar ordem de {action} para {symbol}: {e}")
+        return response
+
+    def _get_rules_index(self, exchange_info: Dict[str, Any]) -> SymbolRulesIndex:
+        """
+        Retorna o índice de regras, reconstruído apenas quando o exchangeInfo muda.
+        """
+        if exchange_info is not self._indexed_exchange_info:
+            self._rules_index = SymbolRulesIndex.from_exchange_info(exchange_info)
+            self._indexed_exchange_info = exchange_info
+        return self._rules_index
 
     def _get_filters(
         self, symbol: str, exchange_info: Dict[str, Any]
     ) -> Dict[str, float]:
-        try:
-            return {
-                "min_qty": float(
-                    self._get_filter(symbol, exchange_info, "LOT_SIZE")["minQty"]
-                ),
-                "step_size": float(
-                    self._get_filter(symbol, exchange_info, "LOT_SIZE")["stepSize"]
-                ),
-                "min_notional": float(
-                    self._get_filter(symbol, exchange_info, "NOTIONAL")["minNotional"]
-                ),
-                "max_notional": float(
-                    self._get_filter(symbol, exchange_info, "NOTIONAL").get(
-                        "maxNotional", float("inf")
-                    )
-                ),
-                "tick_size": float(
-                    self._get_filter(symbol, exchange_info, "PRICE_FILTER")["tickSize"]
-                ),
-            }
-        except KeyError as e:
-            logger.error(f"Erro ao obter filtros para {symbol}: {e}")
+        rules = self._get_rules_index(exchange_info).get(symbol)
+        if rules is None:
+            logger.error(f"Erro ao obter filtros para {symbol}: símbolo sem regras")
             return None
+        return rules.as_dict()
 
     def _adjust_price(
         self, price: float, quantity: float, symbol: str, action: str
@@ -109,30 +203,6 @@ class OrderExecutor:
                 symbol, float(quantity), price
             )
         else:
-            logger.error(f"Ação desconhecida: {action}")
-            return
+            raise ValueError(f"Ação desconhecida: {action}")
         logger.info(f"Ordem executada: {response}")
-
-    def _get_filter(
-        self, symbol: str, exchange_info: Dict[str, Any], filter_type: str
-    ) -> Dict[str, Any]:
-        for market in exchange_info["symbols"]:
-            if market["symbol"] == symbol:
-                for f in market["filters"]:
-                    if f["filterType"] == filter_type:
-                        return f
-        raise ValueError(
-            f"Filtro {filter_type} não encontrado para o símbolo: {symbol}"
-        )
-
-    def _format_quantity(self, quantity: float, step_size: float) -> str:
-        """
-        Formata a quantidade para uma string com a precisão correta.
-        """
-        precision = abs(Decimal(str(step_size)).as_tuple().exponent)
-        formatted_quantity = f"{quantity:.{precision}f}"
-        return (
-            formatted_quantity.rstrip("0").rstrip(".")
-            if "." in formatted_quantity
-            else formatted_quantity
-        )
+        return response
@@ -1,13 +1,18 @@
 import logging
-from typing import Any, Dict, List
+import time
+from typing import Any, Dict, List, Optional
 
 from core.database.crypto_assets_manager import CryptoAssetsManager
 from core.services.binance_public_service import BinancePublicService
 from core.services.binance_private_service import BinancePrivateService
+from core.services.exchange_info_cache import ExchangeInfoCache
 
 
 from core.use_cases.asset_analyzer import AssetAnalyzer
 from core.use_cases.portfolio_manager import PortfolioManager
+from core.entities.cycle_snapshot import CycleSnapshot
+from core.entities.order_result import OrderResult
+from core.use_cases.order_dispatcher import OrderDispatcher
 from core.use_cases.order_executor import OrderExecutor
 
 logger = logging.getLogger(__name__)
@@ -20,16 +25,32 @@ class PortfolioAnalysis:
         private_service: BinancePrivateService,
         db_manager: CryptoAssetsManager,
         max_percentage_difference: float,
+        exchange_info_cache: ExchangeInfoCache = None,
+        balance_source=None,
+        order_workers: int = 4,
+        vectorized_analysis: bool = False,
     ):
         self.portfolio_manager = PortfolioManager(
-            public_service, private_service, db_manager
+            public_service, private_service, db_manager, balance_source
+        )
+        self.asset_analyzer = AssetAnalyzer(
+            db_manager, max_percentage_difference, vectorized=vectorized_analysis
+        )
+        self.order_executor = OrderExecutor(private_service, db_manager)
+        self.order_dispatcher = OrderDispatcher(
+            self.order_executor, max_workers=order_workers
         )
-        self.asset_analyzer = AssetAnalyzer(db_manager, max_percentage_difference)
-        self.order_executor = OrderExecutor(private_service)
         self.public_service = public_service
         self.db_manager = db_manager
+        self.exchange_info_cache = exchange_info_cache or ExchangeInfoCache(
+            public_service
+        )
+        # Último ciclo concluído; substituído inteiro a cada ciclo
+        self.last_snapshot: Optional[CycleSnapshot] = None
 
     def analyze_portfolio(self):
+        started = time.perf_counter()
+
         # Passo 1: Obter ativos combinados
         combined_assets = self.portfolio_manager.get_combined_assets()
 
@@ -40,19 +61,79 @@ class PortfolioAnalysis:
 
         # Passo 3: Obter informações de troca
         logger.info("Obtendo informações de troca da Binance...")
-        exchange_info = self.public_service.get_exchange_info()
+        exchange_info = self.exchange_info_cache.get(
+            symbols=[f"{asset['name']}USDT" for asset in asset_details]
+        )
 
         # Passo 4: Analisar diferenças e obter recomendações
-        recommendations = self.asset_analyzer.analyze_differences(
-            asset_details, portfolio_value
+        recommendations = self.asset_analyzer.analyze_valuation(
+            self.portfolio_manager.valuation
         )
 
         # Passo 5: Executar ordens com base nas recomendações
-        self.execute_recommendations(recommendations, exchange_info)
+        results = self.execute_recommendations(recommendations, exchange_info)
+        self.record_snapshot(
+            started, asset_details, portfolio_value, recommendations, results
+        )
+
+    def record_snapshot(
+        self,
+        started: float,
+        asset_details: List[Dict[str, Any]],
+        portfolio_value: float,
+        recommendations: List[Dict[str, Any]],
+        results: List[OrderResult],
+    ):
+        """
+        Publica o resultado do ciclo para consultas que não podem chamar a Binance.
+        """
+        self.last_snapshot = CycleSnapshot(
+            finished_at=time.time(),
+            duration_ms=(time.perf_counter() - started) * 1000,
+            portfolio_value=portfolio_value,
+            assets=asset_details,
+            recommendations=recommendations,
+            orders=results,
+        )
+
+    def estimate_max_drift(self) -> float:
+        """
+        Estima o maior desvio percentual entre os ativos a partir do modelo de
+        valorização, atualizado pelos ticks do stream, sem chamadas de rede.
+        Retorna infinito quando não há como estimar.
+        """
+        valuation = self.portfolio_manager.valuation
+        saved_assets = self.asset_analyzer.last_saved_assets
+        if self.public_service.price_stream is None or valuation.total_value <= 0:
+            return float("inf")
+
+        max_drift = 0.0
+        for name in list(valuation.positions):
+            saved_asset = saved_assets.get(name.lower())
+            if not saved_asset or not saved_asset["percentual"]:
+                continue
+            current_percentage = valuation.percentual(name)
+            difference = (current_percentage / saved_asset["percentual"] - 1) * 100
+            max_drift = max(max_drift, abs(difference))
+        return max_drift
 
     def execute_recommendations(
         self, recommendations: List[Dict[str, Any]], exchange_info: Dict[str, Any]
-    ):
+    ) -> List[OrderResult]:
+        orders = self.build_orders(recommendations)
+
+        # Quantiza todas as ordens de uma vez com o índice de regras por símbolo
+        prepared = self.order_executor.prepare_orders(orders, exchange_info)
+        # Envia as ordens independentes em paralelo
+        results = self.order_dispatcher.dispatch(prepared)
+        self.log_sell_all(orders)
+        return results
+
+    def build_orders(self, recommendations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Converte as recomendações em ordens de compra/venda, registrando as posições mantidas.
+        """
+        orders = []
         for recommendation in recommendations:
             action = recommendation.get("action")
             symbol_base = recommendation["name"]
@@ -62,25 +143,24 @@ class PortfolioAnalysis:
             price = recommendation.get("price")
             quantity = recommendation.get("quantity")
 
-            if action in ["buy", "sell"]:
-                self.order_executor.place_order(
-                    action=action,
-                    symbol=symbol,
-                    quantity=quantity,
-                    price=price,
-                    exchange_info=exchange_info,
-                )
-
-            elif action == "sell_all":
-                self.order_executor.place_order(
-                    action="sell",
-                    symbol=symbol,
-                    quantity=quantity,
-                    price=price,
-                    exchange_info=exchange_info,
+            if action in ["buy", "sell", "sell_all"]:
+                orders.append(
+                    {
+                        "name": symbol_base,
+                        "action": "sell" if action == "sell_all" else action,
+                        "symbol": symbol,
+                        "quantity": quantity,
+                        "price": price,
+                        "sell_all": action == "sell_all",
+                    }
                 )
-                logger.info(f"Executado venda total para {symbol_base}.")
             elif action == "hold":
                 logger.info(f"Mantendo posição para {symbol_base}.")
             else:
                 logger.warning(f"Ação desconhecida para {symbol_base}: {action}")
+        return orders
+
+    def log_sell_all(self, orders: List[Dict[str, Any]]):
+        for order in orders:
+            if order["sell_all"]:
+                logger.info(f"Executado venda total para {order['name']}.")
@@ -4,6 +4,7 @@ from typing import Dict, List, Tuple
 from core.database.crypto_assets_manager import CryptoAssetsManager
 from core.services.binance_private_service import BinancePrivateService
 from core.services.binance_public_service import BinancePublicService
+from core.use_cases.portfolio_valuation import PortfolioValuation
 
 logger = logging.getLogger(__name__)
 
@@ -14,14 +15,24 @@ class PortfolioManager:
         public_service: BinancePublicService,
         private_service: BinancePrivateService,
         crypto_assets_manager: CryptoAssetsManager,
+        balance_source=None,
     ):
         self.public_service = public_service
         self.private_service = private_service
+        # Fonte dos saldos: o user data stream (em memória) ou a API REST
+        self.balance_source = balance_source or private_service
         self.crypto_assets_manager = crypto_assets_manager
+        self.valuation = PortfolioValuation()
+        # Pares já vistos na listagem completa de preços (com e sem cotação)
+        self._priced_symbols = set()
+        self._unpriced_symbols = set()
+        # Quantidades da carteira BNB do último ciclo, somadas aos saldos da Binance
+        self._wallet_quantities: Dict[str, float] = {}
 
-    def get_combined_assets(self) -> Dict[str, float]:
-        logger.info("Buscando ativos na Binance...")
-        binance_assets = self.private_service.get_account_assets()
+    def get_combined_assets(self, binance_assets: List[Dict] = None) -> Dict[str, float]:
+        if binance_assets is None:
+            logger.info("Buscando ativos na Binance...")
+            binance_assets = self.balance_source.get_account_assets()
         binance_asset_dict = {
             asset["asset"].lower(): float(asset["free"]) for asset in binance_assets
         }
@@ -33,6 +44,7 @@ class PortfolioManager:
             for token in bnb_assets
             if token["total_carteira"] is not None
         }
+        self._wallet_quantities = bnb_asset_dict
         combined_assets = binance_asset_dict.copy()
         for token_name, quantity in bnb_asset_dict.items():
             combined_assets[token_name] = combined_assets.get(token_name, 0) + quantity
@@ -40,35 +52,81 @@ class PortfolioManager:
         logger.debug(f"Ativos combinados: {combined_assets}")
         return combined_assets
 
-    def calculate_portfolio_details(
-        self, combined_assets: Dict[str, float]
-    ) -> Tuple[List[Dict[str, float]], float]:
+    def get_prices(self, combined_assets: Dict[str, float] = None) -> Dict[str, float]:
+        """
+        Obtém os preços dos pares do portfólio.
+
+        Sem combined_assets, usa os pares conhecidos do ciclo anterior, o que permite
+        buscar os preços em paralelo com os saldos.
+        """
         logger.info("Obtendo preços atuais da Binance...")
+        known_symbols = self._priced_symbols | self._unpriced_symbols
+        if combined_assets is None:
+            symbols = known_symbols
+        else:
+            symbols = {f"{asset_name.upper()}USDT" for asset_name in combined_assets}
+        if symbols and symbols <= known_symbols:
+            return self.public_service.get_current_prices(
+                symbols=sorted(symbols & self._priced_symbols)
+            )
         all_prices = self.public_service.get_current_prices()
-        portfolio_value = 0.0
-        asset_details = []
+        self._priced_symbols |= {s for s in symbols if s in all_prices}
+        self._unpriced_symbols |= {s for s in symbols if s not in all_prices}
+        return all_prices
 
+    def has_known_prices(self, combined_assets: Dict[str, float]) -> bool:
+        """
+        Indica se todos os pares do portfólio já foram vistos na listagem de preços.
+        """
+        symbols = {f"{asset_name.upper()}USDT" for asset_name in combined_assets}
+        return symbols <= self._priced_symbols | self._unpriced_symbols
+
+    def calculate_portfolio_details(
+        self, combined_assets: Dict[str, float], all_prices: Dict[str, float] = None
+    ) -> Tuple[List[Dict[str, float]], float]:
+        if all_prices is None:
+            all_prices = self.get_prices(combined_assets)
         logger.info("Calculando detalhes do portfólio...")
+        positions = self.valuation.positions
+        held = set()
         for asset_name, total_quantity in combined_assets.items():
             symbol = f"{asset_name.upper()}USDT"
-            if symbol in all_prices:
-                current_price = all_prices[symbol]
-                asset_value = total_quantity * current_price
-                asset_detail = {
-                    "name": asset_name.upper(),
-                    "quantity": total_quantity,
-                    "price": current_price,
-                    "value": asset_value,
-                }
-                portfolio_value += asset_value
-                asset_details.append(asset_detail)
-            else:
+            if symbol not in all_prices:
                 logger.warning(f"Preço para o símbolo {symbol} não encontrado.")
+                continue
+            name = asset_name.upper()
+            held.add(name)
+            price = all_prices[symbol]
+            position = positions.get(name)
+            # Só os ativos que mudaram desde o último ciclo, tick ou evento de saldo
+            if (
+                position is None
+                or position.quantity != total_quantity
+                or position.price != price
+            ):
+                self.valuation.set_position(name, total_quantity, price)
+        for asset_name in [name for name in positions if name not in held]:
+            self.valuation.remove(asset_name)
 
-        if portfolio_value > 0:
-            for asset in asset_details:
-                asset["percentual"] = (asset["value"] / portfolio_value) * 100
-            asset_details.sort(key=lambda x: x["percentual"], reverse=True)
-
+        asset_details = self.valuation.asset_details()
         logger.debug(f"Detalhes dos ativos: {asset_details}")
-        return asset_details, portfolio_value
+        return asset_details, self.valuation.total_value
+
+    def on_price_tick(self, symbol: str, price: float):
+        """
+        Aplica um novo preço do stream ao modelo de valorização em O(1).
+        """
+        if symbol.endswith("USDT"):
+            self.valuation.update_price(symbol[:-4], price)
+
+    def on_balance_change(self, asset: str):
+        """
+        Aplica ao modelo de valorização o saldo de um ativo alterado no user data
+        stream, somado ao da carteira BNB. Ativos ainda sem posição entram no
+        próximo ciclo, quando o preço é conhecido.
+        """
+        balance = self.balance_source.get_balance(asset)
+        free = balance["free"] if balance is not None else 0.0
+        self.valuation.update_quantity(
+            asset, free + self._wallet_quantities.get(asset.lower(), 0.0)
+        )
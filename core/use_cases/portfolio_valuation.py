@@ -0,0 +1,144 @@
+import heapq
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+class AssetPosition:
+    __slots__ = ("name", "quantity", "price", "value")
+
+    def __init__(self, name: str, quantity: float, price: float):
+        self.name = name
+        self.quantity = quantity
+        self.price = price
+        self.value = quantity * price
+
+
+class PortfolioValuation:
+    # Recalcula o total do zero após muitas atualizações, para não acumular erro de arredondamento
+    RESYNC_EVERY = 10000
+
+    def __init__(self):
+        """
+        Modelo incremental de valorização do portfólio.
+
+        Cada mudança de preço ou de saldo atualiza apenas o ativo afetado e o
+        total em O(1). Percentuais e ordenação só são calculados na leitura.
+        """
+        self.positions: Dict[str, AssetPosition] = {}
+        self.total_value = 0.0
+        self.version = 0
+        self._updates = 0
+        self._details_cache: Optional[List[Dict[str, float]]] = None
+        self._details_version = -1
+        self._lock = threading.Lock()
+
+    def set_position(self, name: str, quantity: float, price: float):
+        name = name.upper()
+        with self._lock:
+            position = self.positions.get(name)
+            if position is None:
+                position = AssetPosition(name, quantity, price)
+                self.positions[name] = position
+                self._apply_delta(position.value)
+            else:
+                self._update(position, quantity, price)
+
+    def update_price(self, name: str, price: float) -> bool:
+        """
+        Atualiza o preço de um ativo existente; retorna False se o ativo não existe.
+        """
+        with self._lock:
+            position = self.positions.get(name.upper())
+            if position is None:
+                return False
+            self._update(position, position.quantity, price)
+            return True
+
+    def update_quantity(self, name: str, quantity: float) -> bool:
+        with self._lock:
+            position = self.positions.get(name.upper())
+            if position is None:
+                return False
+            self._update(position, quantity, position.price)
+            return True
+
+    def remove(self, name: str):
+        with self._lock:
+            position = self.positions.pop(name.upper(), None)
+            if position is not None:
+                self._apply_delta(-position.value)
+
+    def _update(self, position: AssetPosition, quantity: float, price: float):
+        new_value = quantity * price
+        delta = new_value - position.value
+        position.quantity = quantity
+        position.price = price
+        position.value = new_value
+        self._apply_delta(delta)
+
+    def _apply_delta(self, delta: float):
+        self.total_value += delta
+        self.version += 1
+        self._updates += 1
+        if self._updates >= self.RESYNC_EVERY:
+            self.total_value = sum(p.value for p in self.positions.values())
+            self._updates = 0
+
+    def resync(self):
+        """
+        Recalcula o total a partir das posições.
+        """
+        with self._lock:
+            self.total_value = sum(p.value for p in self.positions.values())
+            self.version += 1
+            self._updates = 0
+
+    def percentual(self, name: str) -> float:
+        position = self.positions.get(name.upper())
+        if position is None or self.total_value <= 0:
+            return 0.0
+        return position.value / self.total_value * 100
+
+    def snapshot(self) -> Tuple[List[Tuple[str, float, float, float]], float]:
+        """
+        Retorna as posições (nome, quantidade, preço, valor) e o total lidos de
+        uma vez, sem ticks aplicados no meio da leitura.
+        """
+        with self._lock:
+            positions = [
+                (position.name, position.quantity, position.price, position.value)
+                for position in self.positions.values()
+            ]
+            return positions, self.total_value
+
+    def asset_details(self) -> List[Dict[str, float]]:
+        """
+        Retorna os ativos no formato de PortfolioManager.calculate_portfolio_details,
+        ordenados por percentual. A lista é reaproveitada enquanto nada mudar.
+        """
+        with self._lock:
+            if self._details_version == self.version:
+                return self._details_cache
+            details = [
+                {
+                    "name": position.name,
+                    "quantity": position.quantity,
+                    "price": position.price,
+                    "value": position.value,
+                }
+                for position in self.positions.values()
+            ]
+            if self.total_value > 0:
+                for asset in details:
+                    asset["percentual"] = (asset["value"] / self.total_value) * 100
+                details.sort(key=lambda x: x["percentual"], reverse=True)
+            self._details_cache = details
+            self._details_version = self.version
+            return details
+
+    def top(self, n: int) -> List[AssetPosition]:
+        """
+        Retorna os n ativos de maior valor, sem ordenar o portfólio inteiro.
+        """
+        with self._lock:
+            return heapq.nlargest(n, self.positions.values(), key=lambda p: p.value)
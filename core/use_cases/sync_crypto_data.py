@@ -1,16 +1,36 @@
 import math
-import re
+from typing import TYPE_CHECKING, Any, Dict, List
+
 from core.database.crypto_assets_manager import CryptoAssetsManager
-from core.database.google_sheet_crypto_reader import GoogleSheetCryptoReader
+from core.database.google_sheet_crypto_reader import (
+    SHEET_COLUMNS,
+    GoogleSheetCryptoReader,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Campos mantidos pelo bot (atualizar_preco_medio): a planilha só os define
+# para ativos novos e não sobrescreve o valor salvo dos existentes
+BOT_FIELDS = ("preco_medio",)
 
 
-def sync_crypto_data(sheet_url, db_path="crypto_db.json"):
+def sync_crypto_data(
+    sheet_url, db_path="crypto_db.json", remove_missing=True, reader_mode="stream"
+):
     """
     Sincroniza os dados da aba 'Cypto' da planilha com o banco de dados CryptoDBManager.
 
+    Apenas os ativos novos ou alterados são gravados, todos de uma vez.
+
     Args:
         sheet_url (str): URL da planilha Google Sheets.
         db_path (str): Caminho para o banco de dados TinyDB.
+        remove_missing (bool): Remove do banco os ativos que saíram da planilha.
+        reader_mode (str): "stream" lê o CSV sem pandas; "pandas" usa pd.read_csv.
+
+    Returns:
+        dict: Resumo com os ativos adicionados, alterados e removidos, ou None em caso de erro.
     """
     # Instanciar o leitor da planilha e o gerenciador do banco de dados
     crypto_reader = GoogleSheetCryptoReader(sheet_url)
@@ -18,87 +38,189 @@ def sync_crypto_data(sheet_url, db_path="crypto_db.json"):
 
     try:
         # Buscar os dados da planilha
-        crypto_table = crypto_reader.fetch_crypto_table()
-
-        # Filtrar as colunas necessárias
-        columns_to_display = [
-            "Crypto",
-            "Preço Médio",
-            "Percentual",
-            "Pontos",
-            "meta Moeda",
-            "Total (Carteira)",
-        ]
-        filtered_table = crypto_table[columns_to_display]
-
-        # Iterar sobre cada linha da tabela filtrada e salvar no banco de dados
-        for _, row in filtered_table.iterrows():
-            crypto = row["Crypto"]
-            if isinstance(row["Crypto"], str):
-                percentual = _parse_percentual(row["Percentual"])
-                pontos = float(row["Pontos"])
-                meta_moeda = _parse_number(row["meta Moeda"])
-                total_carteira = _parse_number(row["Total (Carteira)"], allow_nan=True)
-                preco_medio = _parse_preco_medio(row["Preço Médio"])
-
-                # Salvar no banco de dados usando o CryptoDBManager
-                crypto_db_manager.save_crypto_asset(
-                    crypto=crypto,
-                    preco_medio=preco_medio,
-                    percentual=percentual,
-                    pontos=pontos,
-                    meta_moeda=meta_moeda,
-                    total_carteira=total_carteira,
-                )
-        print("Dados da planilha sincronizados com sucesso no banco de dados!")
+        if reader_mode == "pandas":
+            parsed_assets = parse_crypto_table(crypto_reader.fetch_crypto_table())
+        else:
+            parsed_assets = crypto_reader.fetch_crypto_assets()
+        changes = apply_crypto_assets(parsed_assets, crypto_db_manager, remove_missing)
+
+        print(
+            "Dados da planilha sincronizados com sucesso no banco de dados! "
+            f"{len(changes['added'])} adicionado(s), {len(changes['changed'])} alterado(s), "
+            f"{len(changes['removed'])} removido(s), {changes['unchanged']} sem alteração."
+        )
+        return changes
 
     except Exception as e:
         print(f"Erro ao sincronizar dados: {e}")
+        return None
 
+    finally:
+        crypto_db_manager.close()
 
-def _parse_percentual(value):
+
+def apply_crypto_assets(
+    parsed_assets: Dict[str, Dict[str, Any]],
+    crypto_db_manager: CryptoAssetsManager,
+    remove_missing: bool = True,
+    max_removed_fraction: float = 1.0,
+) -> Dict[str, Any]:
     """
-    Converte o percentual em string para float, se necessário.
+    Grava no banco apenas as diferenças entre a planilha e os ativos salvos.
+
+    Os campos de BOT_FIELDS dos ativos já salvos são mantidos.
 
     Args:
-        value: Valor do percentual, podendo ser string ou float.
+        parsed_assets (dict): Ativos da planilha, indexados pelo nome.
+        crypto_db_manager (CryptoAssetsManager): Gerenciador do banco de dados.
+        remove_missing (bool): Remove do banco os ativos que saíram da planilha.
+        max_removed_fraction (float): Fração máxima dos ativos salvos que pode
+            ser removida de uma vez; acima dela nada é aplicado.
 
     Returns:
-        float: Percentual convertido.
-    """
-    if isinstance(value, str):
-        return float(value.strip("%").replace(",", "."))
-    return value
-
+        dict: Resumo das alterações (ver diff_assets).
 
-def _parse_number(value, allow_nan=False):
+    Raises:
+        ValueError: Planilha sem ativos ou remoções acima de max_removed_fraction.
+    """
+    # Uma resposta vazia ou só com o cabeçalho removeria todos os ativos,
+    # e o analisador recomendaria vender tudo no ciclo seguinte
+    if not parsed_assets:
+        raise ValueError("Planilha sem ativos; nenhuma alteração aplicada.")
+    stored_assets = crypto_db_manager.get_all_assets()
+    changes = diff_assets(stored_assets, parsed_assets, remove_missing, BOT_FIELDS)
+    if stored_assets and (
+        len(changes["removed"]) > max_removed_fraction * len(stored_assets)
+    ):
+        raise ValueError(
+            f"Planilha removeria {len(changes['removed'])} de {len(stored_assets)} "
+            f"ativo(s), acima do limite de {max_removed_fraction:.0%}; "
+            "nenhuma alteração aplicada."
+        )
+
+    stored = {asset["crypto"]: asset for asset in stored_assets}
+    assets_to_save = [parsed_assets[crypto] for crypto in changes["added"]] + [
+        {
+            **parsed_assets[crypto],
+            **{field: stored[crypto].get(field) for field in BOT_FIELDS},
+        }
+        for crypto in changes["changed"]
+    ]
+    if assets_to_save or changes["removed"]:
+        crypto_db_manager.apply_changes(assets_to_save, changes["removed"])
+    return changes
+
+
+def parse_crypto_table(crypto_table: "pd.DataFrame") -> Dict[str, Dict[str, Any]]:
     """
-    Converte um valor numérico (string ou float) para float.
+    Converte as colunas da planilha de uma vez (sem iterar linha a linha).
 
     Args:
-        value: Valor numérico como string ou float.
-        allow_nan (bool): Se True, permite que NaN seja retornado.
+        crypto_table (pd.DataFrame): Tabela da aba 'Cypto'.
 
     Returns:
-        float: Valor convertido ou None se NaN e allow_nan=True.
+        dict: Ativos indexados pelo nome, no formato salvo no banco de dados.
     """
-    if isinstance(value, str):
-        value = value.replace(",", ".")
-    result = float(value)
-    if math.isnan(result) and allow_nan:
-        return None
-    return result
+    import pandas as pd
+
+    table = crypto_table[list(SHEET_COLUMNS)]
+    # Linhas sem nome de ativo (totais, linhas em branco) são ignoradas
+    table = table[table["Crypto"].map(lambda value: isinstance(value, str))]
+
+    parsed = pd.DataFrame(
+        {
+            "crypto": table["Crypto"],
+            "preco_medio": _to_float(table["Preço Médio"], thousands=True),
+            "percentual": _to_float(table["Percentual"]),
+            "pontos": table["Pontos"].astype(float),
+            "meta_moeda": _to_float(table["meta Moeda"]),
+            "total_carteira": _to_float(table["Total (Carteira)"]),
+        }
+    )
+    records = parsed.to_dict("records")
+    for record in records:
+        if math.isnan(record["total_carteira"]):
+            record["total_carteira"] = None
+    # Em nomes repetidos, vale a última linha (como no upsert linha a linha)
+    return {record["crypto"]: record for record in records}
+
+
+def _to_float(column: "pd.Series", thousands: bool = False) -> "pd.Series":
+    """
+    Converte números no formato brasileiro ("1.234,56", "12,5%", "$10,00") para float.
 
+    Args:
+        column (pd.Series): Coluna com strings e/ou números.
+        thousands (bool): Se True, o ponto é tratado como separador de milhar.
 
-def _parse_preco_medio(value):
+    Returns:
+        pd.Series: Coluna convertida.
     """
-    Remove caracteres não numéricos de valores de preço médio e converte para float.
+    import pandas as pd
+
+    is_text = column.map(lambda value: isinstance(value, str))
+    if not is_text.any():
+        return column.astype(float)
+    text = column[is_text].str.strip().str.replace("%", "", regex=False)
+    text = text.str.replace("$", "", regex=False)
+    if thousands:
+        text = text.str.replace(".", "", regex=False)
+    text = text.str.replace(",", ".", regex=False)
+    result = column.where(~is_text, pd.to_numeric(text, errors="raise"))
+    return result.astype(float)
+
+
+def diff_assets(
+    stored_assets: List[Dict[str, Any]],
+    parsed_assets: Dict[str, Dict[str, Any]],
+    remove_missing: bool = True,
+    ignored_fields=(),
+) -> Dict[str, Any]:
+    """
+    Compara os ativos da planilha com os salvos no banco.
 
     Args:
-        value (str): Valor do preço médio como string.
+        stored_assets (list): Ativos atualmente no banco.
+        parsed_assets (dict): Ativos da planilha, indexados pelo nome.
+        remove_missing (bool): Se True, ativos ausentes da planilha são marcados para remoção.
+        ignored_fields (tuple): Campos não comparados nos ativos já salvos.
 
     Returns:
-        float: Valor convertido.
+        dict: Listas "added", "changed" e "removed" e a contagem "unchanged".
     """
-    return float(value.replace("$", "").replace(".", "").replace(",", "."))
-
+    stored = {asset["crypto"]: asset for asset in stored_assets}
+    added, changed = [], []
+    for crypto, asset in parsed_assets.items():
+        current = stored.get(crypto)
+        if current is None:
+            added.append(crypto)
+        elif any(
+            not _same_value(current.get(field), value)
+            for field, value in asset.items()
+            if field not in ignored_fields
+        ):
+            changed.append(crypto)
+    removed = (
+        [crypto for crypto in stored if crypto not in parsed_assets]
+        if remove_missing
+        else []
+    )
+    return {
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+        "unchanged": len(parsed_assets) - len(added) - len(changed),
+    }
+
+
+def _is_missing(value) -> bool:
+    # Células vazias chegam como NaN dos leitores e podem voltar do banco como None
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _same_value(a, b) -> bool:
+    if _is_missing(a) or _is_missing(b):
+        return _is_missing(a) and _is_missing(b)
+    if isinstance(a, float) or isinstance(b, float):
+        return math.isclose(float(a), float(b), rel_tol=1e-12, abs_tol=0.0)
+    return a == b
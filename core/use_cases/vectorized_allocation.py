@@ -0,0 +1,98 @@
+from typing import Dict
+
+import numpy as np
+
+
+class VectorizedAllocationEngine:
+    def __init__(
+        self,
+        max_percentage_difference: float,
+        min_order_value: float,
+    ):
+        """
+        Motor de alocação vetorizado: calcula todos os ativos de uma vez com NumPy.
+
+        Reproduz as decisões de AssetAnalyzer.analyze_asset_difference_percentual.
+        As metas podem ter uma dimensão extra (perfis x ativos) para avaliar
+        vários perfis no mesmo ciclo.
+
+        :param max_percentage_difference: Desvio percentual que leva a operar.
+        :param min_order_value: Valor mínimo, em dólares, para gerar uma ordem.
+        """
+        self.max_percentage_difference = max_percentage_difference
+        self.min_order_value = min_order_value
+
+    def analyze_percentual(
+        self,
+        quantities: np.ndarray,
+        prices: np.ndarray,
+        target_percentual: np.ndarray,
+        meta_moeda: np.ndarray,
+        preco_medio: np.ndarray,
+        known: np.ndarray = None,
+        weights: np.ndarray = None,
+        portfolio_value: float = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        :param quantities: Quantidade atual de cada ativo.
+        :param prices: Preço atual de cada ativo.
+        :param target_percentual: Percentual alvo (planilha) de cada ativo.
+        :param meta_moeda: Quantidade alvo de cada ativo.
+        :param preco_medio: Preço médio de compra de cada ativo.
+        :param known: Máscara dos ativos presentes no banco; os demais são vendidos.
+        :param weights: Percentual atual de cada ativo, se já calculado.
+        :param portfolio_value: Valor total do portfólio, se já calculado.
+        :return: Arrays com pesos, desvios, deltas em dólar, quantidades e máscaras.
+        """
+        quantities = np.asarray(quantities, dtype=np.float64)
+        prices = np.asarray(prices, dtype=np.float64)
+        target_percentual = np.asarray(target_percentual, dtype=np.float64)
+        meta_moeda = np.asarray(meta_moeda, dtype=np.float64)
+        preco_medio = np.asarray(preco_medio, dtype=np.float64)
+        if known is None:
+            known = np.ones(quantities.shape, dtype=bool)
+
+        if portfolio_value is None:
+            portfolio_value = (quantities * prices).sum(axis=-1, keepdims=True)
+        if weights is None:
+            weights = (quantities * prices / portfolio_value) * 100
+        weights = np.asarray(weights, dtype=np.float64)
+
+        if np.any((target_percentual == 0) & known):
+            raise ZeroDivisionError("Percentual alvo igual a zero.")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drift = (weights / target_percentual - 1) * 100
+        difference_total = meta_moeda - quantities
+        dollar_delta = difference_total * prices
+
+        below_minimum = np.abs(dollar_delta) < self.min_order_value
+        sell = (
+            known
+            & ~below_minimum
+            & (drift > self.max_percentage_difference)
+            & (prices > preco_medio)
+        )
+        buy = known & ~below_minimum & ~sell & (drift < -self.max_percentage_difference)
+        sell_all = ~known & np.ones(drift.shape, dtype=bool)
+        hold = known & ~sell & ~buy
+
+        target_quantity = (target_percentual / 100) * portfolio_value / prices
+        order_quantity = np.where(
+            sell,
+            quantities - target_quantity,
+            np.where(buy, target_quantity - quantities, 0.0),
+        )
+        order_quantity = np.where(sell_all, quantities, order_quantity)
+
+        return {
+            "weights": weights,
+            "drift": drift,
+            "difference_total": difference_total,
+            "dollar_delta": dollar_delta,
+            "quantity": order_quantity,
+            "buy": buy,
+            "sell": sell,
+            "sell_all": sell_all,
+            "hold": hold,
+            "portfolio_value": portfolio_value,
+        }
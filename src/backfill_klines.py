@@ -0,0 +1,44 @@
+import logging
+import sys
+import time
+
+from config import get_config
+
+from core.database.crypto_assets_manager import CryptoAssetsManager
+from core.database.kline_store import KlineStore
+from core.services.binance_public_service import BinancePublicService
+from core.use_cases.kline_backfill import KlineBackfill
+
+# Configuração do logger
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def main(days=30):
+    config = get_config()
+    store = KlineStore(config["kline_store_path"], interval=config["kline_interval"])
+    db_manager = CryptoAssetsManager(config["db_path"])
+    # Pares do portfólio salvo (stablecoins de referência não têm par com USDT)
+    symbols = [
+        f"{asset['crypto'].upper()}USDT"
+        for asset in db_manager.get_all_assets()
+        if asset["crypto"].upper() not in ("USDT", "BRL")
+    ]
+    db_manager.close()
+
+    start_time = int((time.time() - days * 86400) * 1000)
+    logger.info(
+        f"Baixando candles de {config['kline_interval']} para {len(symbols)} par(es), "
+        f"desde {days} dia(s) atrás..."
+    )
+    backfill = KlineBackfill(
+        BinancePublicService(), store, max_workers=config["kline_workers"]
+    )
+    results = backfill.backfill(symbols, start_time)
+    logger.info(f"Candles gravados: {results}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,149 @@
+import argparse
+import csv
+import logging
+import multiprocessing
+import time
+
+import numpy as np
+
+from config import get_config
+
+from core.database.crypto_assets_manager import CryptoAssetsManager
+from core.database.kline_store import KlineStore
+from core.entities.symbol_rules import SymbolRulesIndex
+from core.services.binance_public_service import BinancePublicService
+from core.services.exchange_info_cache import ExchangeInfoCache
+from core.use_cases.backtest_engine import (
+    PAIRS_PER_SECOND,
+    parameter_grid,
+    run_grid,
+)
+
+# Configuração do logger
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def _floats(text):
+    return [float(value) for value in text.split(",")]
+
+
+def main():
+    config = get_config()
+    parser = argparse.ArgumentParser(
+        description="Backtest do rebalanceamento com os candles do histórico local."
+    )
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument(
+        "--max-pct", type=_floats, default=[config["max_percentage_difference"]]
+    )
+    parser.add_argument("--min-order", type=_floats, default=[config["min_order_value"]])
+    parser.add_argument("--max-order", type=_floats, default=[config["max_order_value"]])
+    parser.add_argument("--initial-value", type=float, default=1000.0)
+    parser.add_argument("--fee", type=float, default=0.001)
+    parser.add_argument("--slippage", type=float, default=0.0)
+    parser.add_argument(
+        "--meta",
+        choices=("sheet", "target"),
+        default="sheet",
+        help="sheet: meta_moeda da planilha; target: meta recalculada a cada passo.",
+    )
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--output", help="Arquivo CSV com o resultado de cada conjunto.")
+    args = parser.parse_args()
+
+    # Metas da planilha, apenas para os pares com histórico local
+    store = KlineStore(config["kline_store_path"], interval=config["kline_interval"])
+    db_manager = CryptoAssetsManager(config["db_path"])
+    stored = set(store.symbols())
+    sheet = {
+        f"{asset['crypto'].upper()}USDT": asset
+        for asset in db_manager.get_all_assets()
+        if f"{asset['crypto'].upper()}USDT" in stored and asset["percentual"]
+    }
+    db_manager.close()
+    symbols = sorted(sheet)
+    if not symbols:
+        raise SystemExit("Sem histórico local; rode src/backfill_klines.py antes.")
+    targets = np.array([sheet[s]["percentual"] for s in symbols], dtype=np.float64)
+
+    end = int(time.time() * 1000)
+    _, prices = store.close_matrix(symbols, end - args.days * 86_400_000, end)
+    # Começa quando todos os pares já têm preço
+    complete = ~np.isnan(prices).any(axis=1)
+    prices = prices[np.argmax(complete) :]
+
+    rules = SymbolRulesIndex.from_exchange_info(
+        ExchangeInfoCache(BinancePublicService()).get(symbols)
+    )
+    meta_moeda = None
+    if args.meta == "sheet":
+        missing = [s for s in symbols if not sheet[s].get("meta_moeda")]
+        if missing:
+            raise SystemExit(
+                f"meta_moeda ausente na planilha para {', '.join(missing)}; "
+                "use --meta target."
+            )
+        # Metas da carteira real levadas à escala de --initial-value: o valor
+        # das metas no primeiro candle é o mesmo das posições iniciais
+        meta_moeda = np.array([sheet[s]["meta_moeda"] for s in symbols], dtype=float)
+        allocated = targets.sum() / 100 * args.initial_value
+        meta_moeda *= allocated / float((meta_moeda * prices[0]).sum())
+
+    step_size = [rules.get(s).step_size if rules.get(s) else 1e-8 for s in symbols]
+    min_notional = [rules.get(s).min_notional if rules.get(s) else 0.0 for s in symbols]
+
+    grid = parameter_grid(
+        max_percentage_difference=args.max_pct,
+        min_order_value=args.min_order,
+        max_order_value=args.max_order,
+    )
+    n_params = len(grid["max_percentage_difference"])
+    processes = max(1, min(args.processes or multiprocessing.cpu_count(), n_params))
+    cpu_seconds = len(prices) * n_params / PAIRS_PER_SECOND
+    logger.info(
+        f"Backtest de {len(symbols)} par(es), {len(prices)} candle(s) e "
+        f"{n_params} conjunto(s) de parâmetros: estimativa de {cpu_seconds:.0f}s "
+        f"de CPU (~{PAIRS_PER_SECOND / 1e6:g} milhões de candle x conjunto por "
+        f"segundo por núcleo), ~{cpu_seconds / processes:.0f}s em {processes} "
+        "processo(s)..."
+    )
+    start = time.perf_counter()
+    results = run_grid(
+        {
+            "prices": prices,
+            "target_percentual": targets,
+            "initial_value": args.initial_value,
+            "meta_moeda": meta_moeda,
+            "meta_from_target": args.meta == "target",
+            "step_size": step_size,
+            "min_notional": min_notional,
+            "fee_rate": args.fee,
+            "slippage": args.slippage,
+        },
+        grid,
+        processes=args.processes,
+    )
+    logger.info(f"Backtest concluído em {time.perf_counter() - start:.1f}s.")
+
+    order = np.argsort(-results["return_pct"])
+    for i in order[:10]:
+        logger.info(
+            f"max_pct={results['max_percentage_difference'][i]:g} "
+            f"min_order={results['min_order_value'][i]:g} "
+            f"max_order={results['max_order_value'][i]:g}: "
+            f"retorno {results['return_pct'][i]:.2f}%, "
+            f"drawdown {results['max_drawdown_pct'][i]:.2f}%, "
+            f"{results['trades'][i]} ordem(ns), taxas {results['fees'][i]:.2f} USDT"
+        )
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(list(results))
+            writer.writerows(zip(*(values.tolist() for values in results.values())))
+
+
+if __name__ == "__main__":
+    main()
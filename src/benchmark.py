@@ -0,0 +1,546 @@
+import argparse
+import gzip
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from config import get_config
+
+from core.database.asset_storage import open_storage
+from core.database.cached_asset_storage import CachedAssetStorage
+from core.database.crypto_assets_manager import CryptoAssetsManager
+from core.database.google_sheet_crypto_reader import (
+    SHEET_COLUMNS,
+    GoogleSheetCryptoReader,
+)
+from core.services.binance_payloads import decode_exchange_info, decode_ticker_prices
+from core.services.http_transport import get_http_transport
+from core.use_cases.asset_analyzer import AssetAnalyzer
+from core.use_cases.order_executor import OrderExecutor
+from core.use_cases.portfolio_manager import PortfolioManager
+from core.use_cases.sync_crypto_data import apply_crypto_assets
+
+# Configuração do logger
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Payloads gravados da Binance (ou de src/fake_binance_server.py)
+FIXTURES = {
+    "exchange_info": "/api/v3/exchangeInfo",
+    "ticker_price": "/api/v3/ticker/price",
+}
+
+PORTFOLIO_SIZES = (10, 100, 1000, 5000)
+
+# Pares sintéticos quando não há fixtures gravadas (ordem de grandeza da Binance)
+SYNTHETIC_SYMBOLS = 2500
+
+# Acima disso o TinyDB leva minutos por medida (cada escrita regrava a tabela inteira)
+TINYDB_MAX_SIZE = 1000
+
+
+def _fixture_path(directory: str, name: str) -> str:
+    return os.path.join(directory, f"{name}.json.gz")
+
+
+def record_fixtures(directory: str):
+    """
+    Grava as respostas brutas dos endpoints em FIXTURES.
+
+    O servidor é o de BINANCE_BASE_URL (a Binance ou src/fake_binance_server.py).
+    """
+    os.makedirs(directory, exist_ok=True)
+    base_url = get_config()["base_url"]
+    transport = get_http_transport()
+    for name, endpoint in FIXTURES.items():
+        response = transport.get(base_url + endpoint)
+        response.raise_for_status()
+        with gzip.open(_fixture_path(directory, name), "wb") as file:
+            file.write(response.content)
+        logger.info(f"Fixture {name} gravada ({len(response.content)} bytes).")
+
+
+def synthetic_exchange_info(
+    n_symbols: int = SYNTHETIC_SYMBOLS,
+    seed: int = 0,
+    quotes=("USDT", "BTC", "ETH", "BNB", "FDUSD", "TRY"),
+    prefix: str = "A",
+):
+    """
+    exchangeInfo com o mesmo formato e tamanho aproximado do real.
+    """
+    rng = random.Random(seed)
+    symbols = []
+    for i in range(n_symbols):
+        quote = quotes[i % len(quotes)]
+        step = 10.0 ** -rng.randint(0, 8)
+        tick = 10.0 ** -rng.randint(2, 8)
+        symbols.append(
+            {
+                "symbol": f"{prefix}{i}{quote}",
+                "status": "TRADING",
+                "baseAsset": f"{prefix}{i}",
+                "baseAssetPrecision": 8,
+                "quoteAsset": quote,
+                "quotePrecision": 8,
+                "quoteAssetPrecision": 8,
+                "orderTypes": [
+                    "LIMIT",
+                    "LIMIT_MAKER",
+                    "MARKET",
+                    "STOP_LOSS_LIMIT",
+                    "TAKE_PROFIT_LIMIT",
+                ],
+                "icebergAllowed": True,
+                "ocoAllowed": True,
+                "isSpotTradingAllowed": True,
+                "isMarginTradingAllowed": False,
+                "filters": [
+                    {
+                        "filterType": "PRICE_FILTER",
+                        "minPrice": f"{tick:.8f}",
+                        "maxPrice": "1000000.00000000",
+                        "tickSize": f"{tick:.8f}",
+                    },
+                    {
+                        "filterType": "LOT_SIZE",
+                        "minQty": f"{step:.8f}",
+                        "maxQty": "9000000.00000000",
+                        "stepSize": f"{step:.8f}",
+                    },
+                    {"filterType": "ICEBERG_PARTS", "limit": 10},
+                    {
+                        "filterType": "MARKET_LOT_SIZE",
+                        "minQty": "0.00000000",
+                        "maxQty": "100000.00000000",
+                        "stepSize": "0.00000000",
+                    },
+                    {"filterType": "TRAILING_DELTA", "minTrailingAboveDelta": 10},
+                    {
+                        "filterType": "PERCENT_PRICE_BY_SIDE",
+                        "bidMultiplierUp": "5",
+                        "bidMultiplierDown": "0.2",
+                        "askMultiplierUp": "5",
+                        "askMultiplierDown": "0.2",
+                        "avgPriceMins": 5,
+                    },
+                    {
+                        "filterType": "NOTIONAL",
+                        "minNotional": "5.00000000",
+                        "applyMinToMarket": True,
+                        "maxNotional": "9000000.00000000",
+                        "applyMaxToMarket": False,
+                        "avgPriceMins": 5,
+                    },
+                    {"filterType": "MAX_NUM_ORDERS", "maxNumOrders": 200},
+                ],
+                "permissions": [],
+                "permissionSets": [["SPOT", "MARGIN", "TRD_GRP_004", "TRD_GRP_005"]],
+                "defaultSelfTradePreventionMode": "EXPIRE_MAKER",
+                "allowedSelfTradePreventionModes": [
+                    "EXPIRE_TAKER",
+                    "EXPIRE_MAKER",
+                    "EXPIRE_BOTH",
+                ],
+            }
+        )
+    return {"timezone": "UTC", "serverTime": 0, "rateLimits": [], "symbols": symbols}
+
+
+def load_fixtures(directory: str) -> Dict[str, bytes]:
+    """
+    Carrega as fixtures gravadas; sem elas, gera payloads sintéticos determinísticos.
+
+    :return: Corpo bruto (JSON) de cada endpoint em FIXTURES.
+    """
+    paths = {name: _fixture_path(directory, name) for name in FIXTURES}
+    if all(os.path.exists(path) for path in paths.values()):
+        fixtures = {}
+        for name, path in paths.items():
+            with gzip.open(path, "rb") as file:
+                fixtures[name] = file.read()
+        return fixtures
+
+    logger.info(f"Sem fixtures em {directory}; usando payloads sintéticos.")
+    exchange_info = synthetic_exchange_info()
+    rng = random.Random(1)
+    tickers = [
+        {"symbol": market["symbol"], "price": f"{rng.uniform(0.0001, 50000):.8f}"}
+        for market in exchange_info["symbols"]
+    ]
+    # JSON compacto, como nas respostas da Binance
+    return {
+        "exchange_info": json.dumps(exchange_info, separators=(",", ":")).encode(
+            "utf-8"
+        ),
+        "ticker_price": json.dumps(tickers, separators=(",", ":")).encode("utf-8"),
+    }
+
+
+def synthetic_portfolio(size: int, usdt_symbols: List[str], seed: int = 0):
+    """
+    Carteira com size ativos cotados em USDT: saldos da Binance, ativos salvos e
+    a planilha (CSV) equivalente.
+    """
+    rng = random.Random(seed)
+    names = [symbol[:-4] for symbol in rng.sample(usdt_symbols, size)]
+    binance_assets = [
+        {"asset": name, "free": rng.uniform(0.1, 1000), "locked": 0.0}
+        for name in names
+    ]
+    saved_assets = [
+        {
+            "crypto": name,
+            "preco_medio": rng.uniform(0.01, 100),
+            "percentual": 100 / size,
+            "pontos": float(rng.randint(1, 10)),
+            "meta_moeda": rng.uniform(1, 100),
+            "total_carteira": rng.choice((None, rng.uniform(0, 10))),
+        }
+        for name in names
+    ]
+    header = ",".join(f'"{column}"' for column in SHEET_COLUMNS)
+    rows = [
+        ",".join(
+            (
+                asset["crypto"],
+                f'"R$ {asset["preco_medio"]:.4f}"'.replace(".", ","),
+                f'"{asset["percentual"]:.4f}%"'.replace(".", ","),
+                f'{asset["pontos"]:.0f}',
+                f'"{asset["meta_moeda"]:.6f}"'.replace(".", ","),
+                ""
+                if asset["total_carteira"] is None
+                else f'"{asset["total_carteira"]:.6f}"'.replace(".", ","),
+            )
+        )
+        for asset in saved_assets
+    ]
+    sheet = "\n".join([header] + rows).encode("utf-8")
+    return binance_assets, saved_assets, sheet
+
+
+def measure(func: Callable[[], Any], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    """
+    Executa func repeat vezes (após o aquecimento) e resume os tempos em milissegundos.
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "min_ms": samples[0],
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "mean_ms": statistics.fmean(samples),
+        "runs": repeat,
+    }
+
+
+def run_benchmarks(
+    fixtures: Dict[str, bytes], sizes=PORTFOLIO_SIZES, repeat: int = 5
+) -> Dict[str, Dict[str, float]]:
+    """
+    Mede cada etapa do ciclo separadamente, para cada tamanho de carteira.
+
+    Nada acessa a rede: saldos, preços e exchangeInfo vêm das fixtures e o
+    banco de dados fica em um diretório temporário. O TinyDB só é medido até
+    TINYDB_MAX_SIZE ativos.
+
+    :return: Tempos indexados por "etapa[tamanho]".
+    """
+    results = {}
+
+    def bench(name, func):
+        results[name] = measure(func, repeat)
+        logger.info(f"{name}: mediana {results[name]['median_ms']:.3f} ms")
+
+    bench("decode.ticker_price", lambda: json.loads(fixtures["ticker_price"]))
+    bench("decode.exchange_info", lambda: json.loads(fixtures["exchange_info"]))
+    # Decodificação com projeção de campos, como nos serviços da Binance
+    bench(
+        "decode.ticker_price.projected",
+        lambda: decode_ticker_prices(fixtures["ticker_price"]),
+    )
+    bench(
+        "decode.exchange_info.projected",
+        lambda: decode_exchange_info(fixtures["exchange_info"]),
+    )
+
+    exchange_info = json.loads(fixtures["exchange_info"])
+    prices = {
+        ticker["symbol"]: float(ticker["price"])
+        for ticker in json.loads(fixtures["ticker_price"])
+    }
+    usdt_symbols = sorted(
+        market["symbol"]
+        for market in exchange_info["symbols"]
+        if market["symbol"].endswith("USDT") and market["symbol"] in prices
+    )
+    # A Binance tem poucas centenas de pares USDT; as carteiras maiores usam
+    # mercados sintéticos adicionais
+    missing = max(sizes) - len(usdt_symbols)
+    if missing > 0:
+        extra = synthetic_exchange_info(missing, seed=2, quotes=("USDT",), prefix="X")
+        rng = random.Random(3)
+        for market in extra["symbols"]:
+            prices[market["symbol"]] = rng.uniform(0.0001, 50000)
+            usdt_symbols.append(market["symbol"])
+        exchange_info["symbols"].extend(extra["symbols"])
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            binance_assets, saved_assets, sheet = synthetic_portfolio(
+                size, usdt_symbols
+            )
+            manager = CryptoAssetsManager(
+                storage=open_storage(os.path.join(workdir, f"cycle_{size}.sqlite3"))
+            )
+            manager.apply_changes(saved_assets)
+
+            portfolio_manager = PortfolioManager(None, None, manager)
+            bench(
+                f"get_combined_assets[{size}]",
+                lambda: portfolio_manager.get_combined_assets(binance_assets),
+            )
+            combined = portfolio_manager.get_combined_assets(binance_assets)
+            bench(
+                f"calculate_portfolio_details[{size}]",
+                lambda: portfolio_manager.calculate_portfolio_details(combined, prices),
+            )
+            # Preços alternados: toda execução atualiza as posições do modelo
+            moved = [
+                prices,
+                {symbol: value * 1.001 for symbol, value in prices.items()},
+            ]
+            counter = itertools.count()
+            bench(
+                f"calculate_portfolio_details.changed[{size}]",
+                lambda: portfolio_manager.calculate_portfolio_details(
+                    combined, moved[next(counter) % 2]
+                ),
+            )
+            asset_details, portfolio_value = (
+                portfolio_manager.calculate_portfolio_details(combined, prices)
+            )
+            analyzer = AssetAnalyzer(manager, get_config()["max_percentage_difference"])
+            bench(
+                f"analyze_differences[{size}]",
+                lambda: analyzer.analyze_differences(asset_details, portfolio_value),
+            )
+
+            executor = OrderExecutor(None, manager)
+            symbols = [f"{asset['name']}USDT" for asset in asset_details]
+            # Primeira consulta monta o índice de regras; as seguintes são O(1)
+            bench(
+                f"_get_filters.cold[{size}]",
+                lambda: [
+                    OrderExecutor(None, manager)._get_filters(symbol, exchange_info)
+                    for symbol in symbols[:1]
+                ],
+            )
+            bench(
+                f"_get_filters[{size}]",
+                lambda: [executor._get_filters(s, exchange_info) for s in symbols],
+            )
+            rules_index = executor._get_rules_index(exchange_info)
+            rules = [rules_index.get(symbol) for symbol in symbols]
+            bench(
+                f"SymbolRules.format_quantity[{size}]",
+                lambda: [
+                    symbol_rules.format_quantity(asset["quantity"])
+                    for asset, symbol_rules in zip(asset_details, rules)
+                ],
+            )
+            # Ordens entre os valores mínimo e máximo, como as do ciclo, nos pares
+            # em que esse valor compra ao menos um stepSize
+            config = get_config()
+            order_value = (config["min_order_value"] + config["max_order_value"]) / 2
+            orders = [
+                {
+                    "action": "buy",
+                    "symbol": symbol,
+                    "quantity": order_value / asset["price"],
+                    "price": asset["price"],
+                }
+                for asset, symbol, symbol_rules in zip(asset_details, symbols, rules)
+                if symbol_rules.step_size * asset["price"] <= order_value
+            ]
+            bench(
+                f"prepare_orders[{size}]",
+                lambda: executor.prepare_orders(orders, exchange_info),
+            )
+            manager.close()
+
+            # sync_crypto_data sem a rede: leitura do CSV e gravação das diferenças
+            reader = GoogleSheetCryptoReader("")
+            bench(
+                f"sync_crypto_data.parse[{size}]",
+                lambda: reader.parse_crypto_assets(sheet),
+            )
+            parsed = reader.parse_crypto_assets(sheet)
+            # Alterna os percentuais para que toda execução tenha o que gravar
+            variants = [
+                parsed,
+                {
+                    name: {**asset, "percentual": asset["percentual"] + 1}
+                    for name, asset in parsed.items()
+                },
+            ]
+            backends = ["json", "sqlite3"] if size <= TINYDB_MAX_SIZE else ["sqlite3"]
+            for backend in backends:
+                sync_manager = CryptoAssetsManager(
+                    storage=open_storage(
+                        os.path.join(workdir, f"sync_{size}.{backend}")
+                    )
+                )
+                counter = itertools.count()
+                bench(
+                    f"sync_crypto_data.apply.{backend}[{size}]",
+                    lambda: apply_crypto_assets(
+                        variants[next(counter) % 2], sync_manager
+                    ),
+                )
+                sync_manager.close()
+
+            for backend in backends + ["cached"]:
+                _bench_manager(backend, workdir, size, saved_assets, bench)
+    return results
+
+
+def _bench_manager(backend, workdir, size, saved_assets, bench):
+    """
+    Leituras e escritas do CryptoAssetsManager em cada backend.
+    """
+    extension = "json" if backend == "json" else "sqlite3"
+    path = os.path.join(workdir, f"manager_{backend}_{size}.{extension}")
+    storage = open_storage(path)
+    if backend == "cached":
+        storage = CachedAssetStorage(storage)
+    manager = CryptoAssetsManager(storage=storage)
+    manager.apply_changes(saved_assets)
+    # Operações unitárias limitadas a 50 ativos: no TinyDB cada leitura percorre
+    # a tabela e cada escrita regrava o arquivo inteiro
+    sample = saved_assets[: min(size, 50)]
+    names = [asset["crypto"] for asset in sample]
+
+    bench(f"manager.get_all_assets.{backend}[{size}]", manager.get_all_assets)
+    bench(
+        f"manager.get_asset_data.x{len(names)}.{backend}[{size}]",
+        lambda: [manager.get_asset_data(name) for name in names],
+    )
+    bench(
+        f"manager.save_crypto_asset.x{len(sample)}.{backend}[{size}]",
+        lambda: [manager.save_crypto_asset(**asset) for asset in sample],
+    )
+    bench(
+        f"manager.apply_changes.{backend}[{size}]",
+        lambda: (manager.apply_changes(saved_assets), manager.storage.sync()),
+    )
+    manager.close()
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[Dict[str, Any]]:
+    """
+    Compara as medianas com a linha de base.
+
+    :param threshold: Aumento relativo tolerado (0.2 = 20% mais lento).
+    :return: Regressões, da maior para a menor.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get("median_ms"):
+            continue
+        ratio = current["median_ms"] / previous["median_ms"]
+        current["baseline_median_ms"] = previous["median_ms"]
+        current["ratio"] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(
+                {
+                    "name": name,
+                    "baseline_median_ms": previous["median_ms"],
+                    "median_ms": current["median_ms"],
+                    "ratio": ratio,
+                }
+            )
+    regressions.sort(key=lambda regression: regression["ratio"], reverse=True)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks das etapas do ciclo de rebalanceamento, sem rede."
+    )
+    parser.add_argument("--fixtures", default=os.path.join("benchmarks", "fixtures"))
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="Grava as fixtures a partir da API (BINANCE_BASE_URL) e sai.",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=lambda text: [int(value) for value in text.split(",")],
+        default=list(PORTFOLIO_SIZES),
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument(
+        "--baseline", help="Resultado anterior (JSON) para comparação."
+    )
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(args.fixtures)
+        return
+
+    # Os logs do ciclo distorcem as medidas
+    logging.getLogger("core").setLevel(logging.ERROR)
+    results = run_benchmarks(load_fixtures(args.fixtures), args.sizes, args.repeat)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            regressions = compare(results, json.load(file)["results"], args.threshold)
+        for regression in regressions:
+            logger.warning(
+                f"Regressão em {regression['name']}: "
+                f"{regression['baseline_median_ms']:.3f} -> "
+                f"{regression['median_ms']:.3f} ms ({regression['ratio']:.2f}x)"
+            )
+
+    report = {
+        "created_at": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "threshold": args.threshold,
+        "results": results,
+        "regressions": regressions,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    logger.info(f"Resultados gravados em {args.output}.")
+    if regressions:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
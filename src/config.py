@@ -12,9 +12,56 @@ def get_config():
         "api_secret": os.getenv("BINANCE_API_SECRET"),
         "telegram_bot_token": os.getenv("TELEGRAM_BOT_TOKEN"),
         "telegram_chat_id": os.getenv("TELEGRAM_CHAT_ID"),
-        "base_url": "https://api.binance.com",
+        "base_url": os.getenv("BINANCE_BASE_URL", "https://api.binance.com"),
+        "ws_url": os.getenv("BINANCE_WS_URL", "wss://stream.binance.com:9443/ws"),
+        "price_stream": os.getenv("PRICE_STREAM", ""),
+        "user_data_stream": os.getenv("USER_DATA_STREAM", "").lower()
+        in ("1", "true", "sim"),
+        "balance_reconcile_interval": float(
+            os.getenv("BALANCE_RECONCILE_INTERVAL", 600.0)
+        ),
         "min_order_value": float(os.getenv("MIN_ORDER_VALUE", 6.0)),
         "max_order_value": float(os.getenv("MAX_ORDER_VALUE", 10.0)),
         "max_percentage_difference": float(os.getenv("MAX_PERCENTAGE_DIFFERENCE", 1.0)),
         "planilha": os.getenv("PLANILHA"),
+        "db_path": os.getenv("DB_PATH", "crypto_db.json"),
+        "db_flush_interval": float(os.getenv("DB_FLUSH_INTERVAL", "5")),
+        "kline_store_path": os.getenv("KLINE_STORE_PATH", "klines"),
+        "kline_interval": os.getenv("KLINE_INTERVAL", "1m"),
+        "kline_workers": int(os.getenv("KLINE_WORKERS", "4")),
+        "sheet_reader": os.getenv("SHEET_READER", "stream"),
+        "sheet_watch_interval": float(os.getenv("SHEET_WATCH_INTERVAL", "300")),
+        # Remoções pela planilha em segundo plano só com opt-in
+        "sheet_watch_remove_missing": os.getenv(
+            "SHEET_WATCH_REMOVE_MISSING", ""
+        ).lower()
+        in ("1", "true", "sim"),
+        "sheet_max_removed_fraction": float(
+            os.getenv("SHEET_MAX_REMOVED_FRACTION", "0.2")
+        ),
+        "engine": os.getenv("ENGINE", "sync").lower(),
+        "vectorized_analysis": os.getenv("VECTORIZED_ANALYSIS", "").lower()
+        in ("1", "true", "sim"),
+        "order_workers": int(os.getenv("ORDER_WORKERS", 4)),
+        "accounts_file": os.getenv("ACCOUNTS_FILE", "accounts.json"),
+        "multi_account_processes": int(os.getenv("MULTI_ACCOUNT_PROCESSES", 2)),
+        "multi_account_interval": float(os.getenv("MULTI_ACCOUNT_INTERVAL", 5.0)),
+        "rebalance_drift_fraction": float(os.getenv("REBALANCE_DRIFT_FRACTION", 0.5)),
+        "rebalance_debounce": float(os.getenv("REBALANCE_DEBOUNCE", 0.5)),
+        "rebalance_max_staleness": float(os.getenv("REBALANCE_MAX_STALENESS", 60.0)),
+        "rate_weight_limit": int(os.getenv("RATE_WEIGHT_LIMIT", 6000)),
+        "rate_low_priority_reserve": float(
+            os.getenv("RATE_LOW_PRIORITY_RESERVE", 0.2)
+        ),
+        "http_pool_connections": int(os.getenv("HTTP_POOL_CONNECTIONS", 4)),
+        "http_pool_maxsize": int(os.getenv("HTTP_POOL_MAXSIZE", 10)),
+        "http_connect_timeout": float(os.getenv("HTTP_CONNECT_TIMEOUT", 3.05)),
+        "http_read_timeout": float(os.getenv("HTTP_READ_TIMEOUT", 10.0)),
+        "http_max_retries": int(os.getenv("HTTP_MAX_RETRIES", 3)),
+        "http_backoff_factor": float(os.getenv("HTTP_BACKOFF_FACTOR", 0.3)),
+        "clock_sync_interval": float(os.getenv("CLOCK_SYNC_INTERVAL", 300.0)),
+        "exchange_info_ttl": float(os.getenv("EXCHANGE_INFO_TTL", 3600.0)),
+        "exchange_info_snapshot": os.getenv(
+            "EXCHANGE_INFO_SNAPSHOT", "exchange_info_cache.json"
+        ),
     }
@@ -0,0 +1,748 @@
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import random
+import secrets
+import socketserver
+import struct
+import threading
+import time
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from core.services.rate_governor import weight_for
+
+# Configuração do logger
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Mercados simulados: preço inicial, stepSize, minQty, tickSize e minNotional
+DEFAULT_MARKETS = {
+    "BTCUSDT": (60000.0, "0.00001", "0.00001", "0.01", "5"),
+    "ETHUSDT": (3000.0, "0.0001", "0.0001", "0.01", "5"),
+    "BNBUSDT": (550.0, "0.001", "0.001", "0.01", "5"),
+    "SOLUSDT": (150.0, "0.001", "0.001", "0.01", "5"),
+    "ADAUSDT": (0.45, "0.1", "0.1", "0.0001", "5"),
+    "XRPUSDT": (0.55, "1", "1", "0.0001", "5"),
+    "DOGEUSDT": (0.12, "1", "1", "0.00001", "1"),
+    "USDTBRL": (5.5, "0.1", "0.1", "0.001", "10"),
+}
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, code: int, msg: str, headers=None):
+        super().__init__(msg)
+        self.status = status
+        self.code = code
+        self.msg = msg
+        self.headers = headers or {}
+
+
+class FakeExchange:
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        balances: Dict[str, float],
+        extra_markets: int = 0,
+        weight_limit: int = 6000,
+        order_limit_10s: int = 100,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        volatility: float = 0.001,
+    ):
+        """
+        Estado da corretora simulada: mercados, preços, saldos, ordens e limites.
+
+        :param api_key: API Key aceita nas chamadas privadas.
+        :param api_secret: Segredo usado para validar as assinaturas HMAC.
+        :param balances: Saldos livres iniciais por ativo.
+        :param extra_markets: Pares sintéticos extras (para testar listas grandes).
+        :param weight_limit: Peso máximo por minuto antes de responder 429.
+        :param order_limit_10s: Ordens por 10 segundos antes de responder 429.
+        :param latency_ms: Latência adicionada a cada resposta.
+        :param jitter_ms: Variação aleatória da latência.
+        :param error_rate: Fração das chamadas que falham com HTTP 500.
+        :param volatility: Desvio padrão do passeio aleatório dos preços por tick.
+        """
+        self.api_key = api_key
+        self.api_secret = api_secret.encode("utf-8")
+        self.weight_limit = weight_limit
+        self.order_limit_10s = order_limit_10s
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.volatility = volatility
+
+        self.markets: Dict[str, Dict[str, Any]] = {}
+        for symbol, market in DEFAULT_MARKETS.items():
+            self._add_market(symbol, *market)
+        for i in range(extra_markets):
+            self._add_market(
+                f"SIM{i}USDT", 1.0 + i % 100, "0.01", "0.01", "0.0001", "5"
+            )
+
+        self.balances: Dict[str, List[float]] = {
+            asset: [float(amount), 0.0] for asset, amount in balances.items()
+        }
+        self.open_orders: Dict[int, Dict[str, Any]] = {}
+        self.listen_keys: Dict[str, float] = {}
+        self._next_order_id = 1
+        self._weights: List[Tuple[float, int]] = []
+        self._orders_sent: List[float] = []
+        self._lock = threading.RLock()
+        # Funções chamadas a cada tick de preço / mudança de saldo (WebSocket)
+        self.price_listeners: List[Any] = []
+        self.account_listeners: Dict[str, List[Any]] = {}
+
+    def _add_market(self, symbol, price, step, min_qty, tick, min_notional):
+        if symbol.endswith("USDT"):
+            base, quote = symbol[:-4], "USDT"
+        else:
+            base, quote = "USDT", symbol[4:]
+        self.markets[symbol] = {
+            "symbol": symbol,
+            "base": base,
+            "quote": quote,
+            "price": float(price),
+            "step": Decimal(step),
+            "min_qty": Decimal(min_qty),
+            "tick": Decimal(tick),
+            "min_notional": Decimal(min_notional),
+        }
+
+    # Limites, latência e falhas simuladas
+
+    def admit(self, endpoint: str, params: Dict[str, str]) -> Dict[str, str]:
+        """
+        Contabiliza o peso da chamada e retorna os cabeçalhos X-MBX-*.
+        """
+        delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+        now = time.time()
+        with self._lock:
+            self._weights = [(t, w) for t, w in self._weights if now - t < 60]
+            self._weights.append((now, weight_for(endpoint, params)))
+            used = sum(w for _, w in self._weights)
+            headers = {"X-MBX-USED-WEIGHT-1M": str(used)}
+            if endpoint == "/api/v3/order":
+                self._orders_sent = [t for t in self._orders_sent if now - t < 10]
+                self._orders_sent.append(now)
+                headers["X-MBX-ORDER-COUNT-10S"] = str(len(self._orders_sent))
+                if len(self._orders_sent) > self.order_limit_10s:
+                    headers["Retry-After"] = "10"
+                    raise ApiError(429, -1015, "Too many new orders.", headers)
+        if used > self.weight_limit:
+            oldest = self._weights[0][0]
+            headers["Retry-After"] = str(max(1, int(60 - (now - oldest))))
+            raise ApiError(429, -1003, "Too much request weight used.", headers)
+        if self.error_rate and random.random() < self.error_rate:
+            raise ApiError(500, -1000, "Falha simulada.", headers)
+        return headers
+
+    # Autenticação
+
+    def check_api_key(self, headers) -> None:
+        if headers.get("X-MBX-APIKEY") != self.api_key:
+            raise ApiError(
+                401, -2015, "Invalid API-key, IP, or permissions for action."
+            )
+
+    def check_signature(self, raw_params: str, params: Dict[str, str]) -> None:
+        """
+        Valida a assinatura como a Binance: HMAC-SHA256 da query string (sem o
+        parâmetro signature), na ordem em que foi enviada por create_signature.
+        """
+        signature = params.get("signature")
+        if not signature:
+            raise ApiError(400, -1102, "Mandatory parameter 'signature' was not sent.")
+        payload = "&".join(
+            part for part in raw_params.split("&") if not part.startswith("signature=")
+        )
+        expected = hmac.new(
+            self.api_secret, payload.encode("utf-8"), hashlib.sha256
+        ).hexdigest()
+        if not hmac.compare_digest(expected, signature):
+            raise ApiError(400, -1022, "Signature for this request is not valid.")
+
+        timestamp = int(params.get("timestamp", 0))
+        recv_window = int(params.get("recvWindow", 5000))
+        now = self.server_time()
+        if timestamp > now + 1000 or now - timestamp > recv_window:
+            raise ApiError(
+                400,
+                -1021,
+                "Timestamp for this request is outside of the recvWindow.",
+            )
+
+    # Endpoints públicos
+
+    @staticmethod
+    def server_time() -> int:
+        return int(time.time() * 1000)
+
+    def ticker_price(self, symbol: Optional[str] = None):
+        with self._lock:
+            if symbol:
+                market = self._market(symbol)
+                return {"symbol": symbol, "price": self._fmt_price(market)}
+            return [
+                {"symbol": s, "price": self._fmt_price(m)}
+                for s, m in self.markets.items()
+            ]
+
+    def exchange_info(self, symbols: Optional[List[str]] = None):
+        if symbols:
+            missing = [s for s in symbols if s not in self.markets]
+            if missing:
+                raise ApiError(400, -1121, "Invalid symbol.")
+        selected = symbols or list(self.markets)
+        return {
+            "timezone": "UTC",
+            "serverTime": self.server_time(),
+            "rateLimits": [
+                {
+                    "rateLimitType": "REQUEST_WEIGHT",
+                    "interval": "MINUTE",
+                    "intervalNum": 1,
+                    "limit": self.weight_limit,
+                }
+            ],
+            "symbols": [self._market_info(self.markets[s]) for s in selected],
+        }
+
+    def _market_info(self, market):
+        return {
+            "symbol": market["symbol"],
+            "status": "TRADING",
+            "baseAsset": market["base"],
+            "quoteAsset": market["quote"],
+            "filters": [
+                {
+                    "filterType": "PRICE_FILTER",
+                    "minPrice": str(market["tick"]),
+                    "maxPrice": "1000000.00",
+                    "tickSize": str(market["tick"]),
+                },
+                {
+                    "filterType": "LOT_SIZE",
+                    "minQty": str(market["min_qty"]),
+                    "maxQty": "9000000",
+                    "stepSize": str(market["step"]),
+                },
+                {
+                    "filterType": "NOTIONAL",
+                    "minNotional": str(market["min_notional"]),
+                    "applyMinToMarket": True,
+                    "maxNotional": "9000000.00",
+                    "applyMaxToMarket": False,
+                    "avgPriceMins": 5,
+                },
+            ],
+        }
+
+    # Endpoints privados
+
+    def account(self):
+        with self._lock:
+            return {
+                "makerCommission": 10,
+                "takerCommission": 10,
+                "canTrade": True,
+                "updateTime": self.server_time(),
+                "accountType": "SPOT",
+                "balances": [
+                    {"asset": asset, "free": f"{free:.8f}", "locked": f"{locked:.8f}"}
+                    for asset, (free, locked) in self.balances.items()
+                ],
+            }
+
+    def new_order(self, params: Dict[str, str]):
+        symbol = params.get("symbol", "")
+        side = params.get("side", "").upper()
+        if side not in ("BUY", "SELL"):
+            raise ApiError(400, -1102, "Mandatory parameter 'side' was not sent.")
+        if params.get("type", "LIMIT").upper() != "LIMIT":
+            raise ApiError(400, -1116, "Invalid orderType.")
+        market = self._market(symbol)
+        try:
+            quantity = Decimal(params["quantity"])
+            price = Decimal(params["price"])
+        except Exception:
+            raise ApiError(400, -1100, "Illegal characters found in parameter.")
+
+        # Filtros LOT_SIZE, PRICE_FILTER e NOTIONAL
+        off_step = (quantity - market["min_qty"]) % market["step"]
+        if quantity < market["min_qty"] or off_step:
+            raise ApiError(400, -1013, "Filter failure: LOT_SIZE")
+        if price <= 0 or price % market["tick"]:
+            raise ApiError(400, -1013, "Filter failure: PRICE_FILTER")
+        if quantity * price < market["min_notional"]:
+            raise ApiError(400, -1013, "Filter failure: NOTIONAL")
+
+        quantity_f, price_f = float(quantity), float(price)
+        with self._lock:
+            if side == "BUY":
+                asset, amount = market["quote"], quantity_f * price_f
+            else:
+                asset, amount = market["base"], quantity_f
+            balance = self.balances.setdefault(asset, [0.0, 0.0])
+            if balance[0] + 1e-12 < amount:
+                raise ApiError(
+                    400, -2010, "Account has insufficient balance for requested action."
+                )
+            balance[0] -= amount
+            balance[1] += amount
+            order_id = self._next_order_id
+            self._next_order_id += 1
+            order = {
+                "symbol": symbol,
+                "orderId": order_id,
+                "clientOrderId": secrets.token_hex(8),
+                "transactTime": self.server_time(),
+                "price": params["price"],
+                "origQty": params["quantity"],
+                "executedQty": "0",
+                "status": "NEW",
+                "timeInForce": params.get("timeInForce", "GTC"),
+                "type": "LIMIT",
+                "side": side,
+            }
+            self.open_orders[order_id] = order
+            self._match(order)
+        self._publish_account()
+        return dict(order)
+
+    def _match(self, order: Dict[str, Any]) -> bool:
+        """
+        Executa a ordem se o preço de mercado a alcançou (no preço limite).
+        """
+        market = self.markets[order["symbol"]]
+        price = float(order["price"])
+        quantity = float(order["origQty"])
+        if order["side"] == "BUY" and market["price"] > price:
+            return False
+        if order["side"] == "SELL" and market["price"] < price:
+            return False
+        quote = self.balances.setdefault(market["quote"], [0.0, 0.0])
+        base = self.balances.setdefault(market["base"], [0.0, 0.0])
+        if order["side"] == "BUY":
+            quote[1] -= quantity * price
+            base[0] += quantity
+        else:
+            base[1] -= quantity
+            quote[0] += quantity * price
+        order["status"] = "FILLED"
+        order["executedQty"] = order["origQty"]
+        self.open_orders.pop(order["orderId"], None)
+        return True
+
+    def create_listen_key(self) -> str:
+        listen_key = secrets.token_urlsafe(45)
+        with self._lock:
+            self.listen_keys[listen_key] = time.time()
+        return listen_key
+
+    def keepalive_listen_key(self, listen_key: str):
+        with self._lock:
+            if listen_key not in self.listen_keys:
+                raise ApiError(400, -1125, "This listenKey does not exist.")
+            self.listen_keys[listen_key] = time.time()
+
+    def close_listen_key(self, listen_key: str):
+        with self._lock:
+            self.listen_keys.pop(listen_key, None)
+
+    # Preços
+
+    def tick(self):
+        """
+        Move os preços (passeio aleatório), executa as ordens alcançadas e
+        publica os eventos.
+        """
+        filled = False
+        with self._lock:
+            for market in self.markets.values():
+                market["price"] *= 1 + random.gauss(0, self.volatility)
+                market["price"] = max(market["price"], float(market["tick"]))
+            for order in list(self.open_orders.values()):
+                filled = self._match(order) or filled
+            events = [
+                {
+                    "e": "24hrMiniTicker",
+                    "E": self.server_time(),
+                    "s": symbol,
+                    "c": self._fmt_price(market),
+                    "b": self._fmt_price(market),
+                    "a": self._fmt_price(market),
+                }
+                for symbol, market in self.markets.items()
+            ]
+        for listener in list(self.price_listeners):
+            listener(events)
+        if filled:
+            self._publish_account()
+
+    def _publish_account(self):
+        with self._lock:
+            event = {
+                "e": "outboundAccountPosition",
+                "E": self.server_time(),
+                "u": self.server_time(),
+                "B": [
+                    {"a": asset, "f": f"{free:.8f}", "l": f"{locked:.8f}"}
+                    for asset, (free, locked) in self.balances.items()
+                ],
+            }
+            listeners = [
+                listener
+                for group in self.account_listeners.values()
+                for listener in group
+            ]
+        for listener in listeners:
+            listener(event)
+
+    def _market(self, symbol: str) -> Dict[str, Any]:
+        market = self.markets.get(symbol)
+        if market is None:
+            raise ApiError(400, -1121, "Invalid symbol.")
+        return market
+
+    @staticmethod
+    def _fmt_price(market) -> str:
+        exponent = -market["tick"].as_tuple().exponent
+        return f"{market['price']:.{max(exponent, 0)}f}"
+
+
+def make_http_handler(exchange: FakeExchange):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_POST(self):
+            self._handle("POST")
+
+        def do_PUT(self):
+            self._handle("PUT")
+
+        def do_DELETE(self):
+            self._handle("DELETE")
+
+        def _handle(self, method: str):
+            url = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length).decode("utf-8") if length else ""
+            # A Binance assina query string + corpo concatenados
+            raw_params = "&".join(part for part in (url.query, body) if part)
+            params = dict(parse_qsl(raw_params, keep_blank_values=True))
+            headers = {}
+            try:
+                headers = exchange.admit(url.path, params)
+                status, payload = 200, self._route(method, url.path, raw_params, params)
+            except ApiError as e:
+                headers.update(e.headers)
+                status, payload = e.status, {"code": e.code, "msg": e.msg}
+            self._send(status, payload, headers)
+
+        def _route(self, method, path, raw_params, params):
+            if path == "/api/v3/time" and method == "GET":
+                return {"serverTime": exchange.server_time()}
+            if path == "/api/v3/ticker/price" and method == "GET":
+                return exchange.ticker_price(params.get("symbol"))
+            if path == "/api/v3/exchangeInfo" and method == "GET":
+                symbols = params.get("symbols")
+                if params.get("symbol"):
+                    symbols = [params["symbol"]]
+                elif symbols:
+                    symbols = json.loads(symbols)
+                return exchange.exchange_info(symbols)
+            if path == "/api/v3/userDataStream":
+                exchange.check_api_key(self.headers)
+                if method == "POST":
+                    return {"listenKey": exchange.create_listen_key()}
+                if method == "PUT":
+                    exchange.keepalive_listen_key(params.get("listenKey", ""))
+                    return {}
+                if method == "DELETE":
+                    exchange.close_listen_key(params.get("listenKey", ""))
+                    return {}
+            if path == "/api/v3/account" and method == "GET":
+                exchange.check_api_key(self.headers)
+                exchange.check_signature(raw_params, params)
+                return exchange.account()
+            if path == "/api/v3/order" and method == "POST":
+                exchange.check_api_key(self.headers)
+                exchange.check_signature(raw_params, params)
+                return exchange.new_order(params)
+            raise ApiError(404, -1000, f"Endpoint não simulado: {method} {path}")
+
+        def _send(self, status: int, payload, headers: Dict[str, str]):
+            body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json;charset=UTF-8")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+class _WebSocketConnection:
+    def __init__(self, sock):
+        """
+        Conexão WebSocket mínima (RFC 6455): quadros de texto, ping/pong e close.
+        """
+        self.sock = sock
+        self._send_lock = threading.Lock()
+        self.closed = False
+
+    def send_text(self, text: str):
+        self._send_frame(0x1, text.encode("utf-8"))
+
+    def _send_frame(self, opcode: int, payload: bytes):
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([length])
+        elif length < 1 << 16:
+            header += bytes([126]) + struct.pack("!H", length)
+        else:
+            header += bytes([127]) + struct.pack("!Q", length)
+        with self._send_lock:
+            if self.closed:
+                return
+            try:
+                self.sock.sendall(header + payload)
+            except OSError:
+                self.closed = True
+
+    def _recv_exact(self, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Conexão encerrada.")
+            data += chunk
+        return data
+
+    def receive(self) -> Optional[str]:
+        """
+        Lê a próxima mensagem de texto; retorna None quando a conexão fecha.
+        """
+        while True:
+            first, second = self._recv_exact(2)
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                length = struct.unpack("!H", self._recv_exact(2))[0]
+            elif length == 127:
+                length = struct.unpack("!Q", self._recv_exact(8))[0]
+            mask = self._recv_exact(4) if second & 0x80 else b"\x00\x00\x00\x00"
+            payload = bytes(
+                b ^ mask[i % 4] for i, b in enumerate(self._recv_exact(length))
+            )
+            if opcode == 0x8:
+                self._send_frame(0x8, payload[:2])
+                self.closed = True
+                return None
+            if opcode == 0x9:
+                self._send_frame(0xA, payload)
+                continue
+            if opcode in (0x1, 0x0):
+                return payload.decode("utf-8")
+
+
+def make_ws_handler(exchange: FakeExchange):
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self):
+            request = b""
+            while b"\r\n\r\n" not in request:
+                chunk = self.request.recv(4096)
+                if not chunk:
+                    return
+                request += chunk
+            lines = request.split(b"\r\n\r\n")[0].decode("latin-1").split("\r\n")
+            path = lines[0].split(" ")[1]
+            headers = {
+                name.strip().lower(): value.strip()
+                for name, value in (
+                    line.split(":", 1) for line in lines[1:] if ":" in line
+                )
+            }
+            key = headers.get("sec-websocket-key")
+            if not key:
+                self.request.sendall(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+                return
+            accept = base64.b64encode(
+                hashlib.sha1((key + _WS_GUID).encode("ascii")).digest()
+            ).decode("ascii")
+            self.request.sendall(
+                (
+                    "HTTP/1.1 101 Switching Protocols\r\n"
+                    "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                    f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+                ).encode("ascii")
+            )
+            connection = _WebSocketConnection(self.request)
+            parts = path.strip("/").split("/")
+            listen_key = parts[1] if len(parts) > 1 else None
+            if listen_key and listen_key in exchange.listen_keys:
+                self._serve_user_data(connection, listen_key)
+            else:
+                self._serve_market(connection)
+
+        def _serve_market(self, connection: _WebSocketConnection):
+            streams = set()
+
+            def on_prices(events):
+                for event in events:
+                    symbol = event["s"].lower()
+                    if f"{symbol}@miniticker" in streams:
+                        connection.send_text(json.dumps(event))
+                    if f"{symbol}@bookticker" in streams:
+                        connection.send_text(
+                            json.dumps(
+                                {
+                                    "u": event["E"],
+                                    "s": event["s"],
+                                    "b": event["b"],
+                                    "B": "1",
+                                    "a": event["a"],
+                                    "A": "1",
+                                }
+                            )
+                        )
+
+            exchange.price_listeners.append(on_prices)
+            try:
+                while not connection.closed:
+                    message = connection.receive()
+                    if message is None:
+                        break
+                    request = json.loads(message)
+                    params = [param.lower() for param in request.get("params", [])]
+                    if request.get("method") == "SUBSCRIBE":
+                        streams.update(params)
+                    elif request.get("method") == "UNSUBSCRIBE":
+                        streams.difference_update(params)
+                    connection.send_text(
+                        json.dumps({"result": None, "id": request.get("id")})
+                    )
+            except (ConnectionError, OSError, ValueError):
+                pass
+            finally:
+                exchange.price_listeners.remove(on_prices)
+
+        def _serve_user_data(self, connection: _WebSocketConnection, listen_key: str):
+            def on_account(event):
+                connection.send_text(json.dumps(event))
+
+            exchange.account_listeners.setdefault(listen_key, []).append(on_account)
+            try:
+                while connection.receive() is not None:
+                    pass
+            except (ConnectionError, OSError):
+                pass
+            finally:
+                exchange.account_listeners[listen_key].remove(on_account)
+
+    return Handler
+
+
+class _ThreadingTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def serve(
+    exchange: FakeExchange, host: str, port: int, ws_port: int, tick_interval: float
+):
+    """
+    Sobe o servidor REST, o WebSocket e o gerador de preços; bloqueia até Ctrl+C.
+    """
+    http_server = ThreadingHTTPServer((host, port), make_http_handler(exchange))
+    http_server.daemon_threads = True
+    ws_server = _ThreadingTCPServer((host, ws_port), make_ws_handler(exchange))
+    stop_event = threading.Event()
+
+    def run_ticks():
+        while not stop_event.wait(tick_interval):
+            exchange.tick()
+
+    threads = [
+        threading.Thread(target=http_server.serve_forever, daemon=True),
+        threading.Thread(target=ws_server.serve_forever, daemon=True),
+        threading.Thread(target=run_ticks, daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+    logger.info(
+        f"Binance simulada em http://{host}:{port} e ws://{host}:{ws_port}/ws "
+        f"({len(exchange.markets)} mercados)."
+    )
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        logger.info("Encerrando a Binance simulada.")
+    finally:
+        stop_event.set()
+        http_server.shutdown()
+        ws_server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Servidor local que simula a API da Binance usada pelo projeto."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--ws-port", type=int, default=8082)
+    parser.add_argument("--api-key", default="fake-key")
+    parser.add_argument("--api-secret", default="fake-secret")
+    parser.add_argument(
+        "--usdt", type=float, default=10000.0, help="Saldo inicial em USDT."
+    )
+    parser.add_argument("--extra-markets", type=int, default=0)
+    parser.add_argument("--weight-limit", type=int, default=6000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--volatility", type=float, default=0.001)
+    parser.add_argument("--tick-interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    exchange = FakeExchange(
+        args.api_key,
+        args.api_secret,
+        balances={"USDT": args.usdt},
+        extra_markets=args.extra_markets,
+        weight_limit=args.weight_limit,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        volatility=args.volatility,
+    )
+    serve(exchange, args.host, args.port, args.ws_port, args.tick_interval)
+
+
+if __name__ == "__main__":
+    main()
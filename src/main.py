@@ -1,74 +1,173 @@
 import logging
+import queue
 import threading
-import time
+from logging.handlers import QueueHandler, QueueListener
 
 from config import get_config
 
+from core.database.asset_storage import open_storage
+from core.database.cached_asset_storage import CachedAssetStorage
 from core.database.crypto_assets_manager import CryptoAssetsManager
 from core.services.binance_private_service import BinancePrivateService
+from core.services.binance_price_stream import BinancePriceStream
 from core.services.binance_public_service import BinancePublicService
+from core.services.binance_user_data_stream import BinanceUserDataStream
+from core.services.exchange_info_cache import ExchangeInfoCache
+from core.services.http_transport import get_http_transport
+from core.services.rate_governor import get_rate_governor
+from core.services.rebalance_scheduler import SHEET, RebalanceScheduler
+from core.services.sheet_watcher import SheetWatcher
 
 
 from core.services.state_manager import StateManager
 from core.services.telegram_notifier import TelegramNotifier
 from core.use_cases.sync_crypto_data import sync_crypto_data
+from core.use_cases.async_portfolio_analysis import AsyncPortfolioAnalysis
 from core.use_cases.portfolio_analysis import PortfolioAnalysis
 
-# Configuração do logger
+# Configuração do logger; a escrita acontece em uma thread separada
+# para não atrasar o envio das ordens
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, *logging.root.handlers)
+logging.root.handlers = [QueueHandler(_log_queue)]
+_log_listener.start()
 logger = logging.getLogger(__name__)
 
 
 def main():
     # Inicializa serviços e banco de dados
-    public_service = BinancePublicService()
-    private_service = BinancePrivateService()
-    db_manager = CryptoAssetsManager()
     config = get_config()
-    sync_crypto_data(config["planilha"])
+    price_stream = None
+    if config["price_stream"]:
+        # PRICE_STREAM=miniTicker|bookTicker ativa os preços via WebSocket
+        price_stream = BinancePriceStream(
+            config["ws_url"], stream_type=config["price_stream"]
+        )
+        price_stream.start()
+    public_service = BinancePublicService(price_stream=price_stream)
+    private_service = BinancePrivateService()
+    private_service.clock.start()
+    user_data_stream = None
+    if config["user_data_stream"]:
+        # Saldos mantidos em memória pelo user data stream
+        user_data_stream = BinanceUserDataStream(
+            private_service,
+            config["ws_url"],
+            reconcile_interval=config["balance_reconcile_interval"],
+        )
+        user_data_stream.start()
+    sync_crypto_data(
+        config["planilha"],
+        db_path=config["db_path"],
+        reader_mode=config["sheet_reader"],
+    )
+    # Ativos em memória; as alterações são gravadas em lote no banco
+    asset_storage = CachedAssetStorage(
+        open_storage(config["db_path"]), flush_interval=config["db_flush_interval"]
+    )
+    asset_storage.start()
+    db_manager = CryptoAssetsManager(storage=asset_storage)
     logger.info("Iniciando análise de portfólio...")
 
     # Instancia o gerenciador de estado e o TelegramNotifier
     state_manager = StateManager()
     telegram = TelegramNotifier(config["telegram_bot_token"])
 
+    # Cache do exchangeInfo com snapshot em disco e atualização em segundo plano
+    exchange_info_cache = ExchangeInfoCache(
+        public_service,
+        ttl=config["exchange_info_ttl"],
+        snapshot_path=config["exchange_info_snapshot"],
+    )
+    exchange_info_cache.start()
+
     # Instancia o caso de uso
     analysis = PortfolioAnalysis(
         public_service,
         private_service,
         db_manager,
         config["max_percentage_difference"],
+        exchange_info_cache=exchange_info_cache,
+        balance_source=user_data_stream,
+        order_workers=config["order_workers"],
+        vectorized_analysis=config["vectorized_analysis"],
     )
+    # ENGINE=async executa as etapas de I/O do ciclo em paralelo
+    if config["engine"] == "async":
+        run_cycle = AsyncPortfolioAnalysis(analysis).run_cycle
+    else:
+        run_cycle = analysis.analyze_portfolio
 
     # Executa o monitoramento do Telegram em uma thread separada
     telegram_thread = threading.Thread(
         target=telegram.monitor_telegram,
-        args=(config["telegram_chat_id"], state_manager),
+        # Consultas respondidas com o último ciclo em memória, sem chamar a Binance
+        args=(
+            config["telegram_chat_id"],
+            state_manager,
+            lambda: analysis.last_snapshot,
+        ),
     )
     telegram_thread.daemon = True
     telegram_thread.start()
 
-    while True:
-        if state_manager.is_running():
-            try:
-                # Busca os ativos combinados
-                combined_assets = analysis.analyze_portfolio()
-                logger.info("Ativos combinados obtidos com sucesso:")
-                if combined_assets is not None:
-                    for name, quantity in combined_assets.items():
-                        logger.info(f"{name}: {quantity}")
-
-            except KeyboardInterrupt:
-                logger.info("Execução interrompida pelo usuário.")
-                break
-            except Exception as e:
-                logger.error(f"Erro durante a execução: {e}")
-            finally:
-                time.sleep(5)
-        else:
-            time.sleep(1)  # Pausa breve para evitar uso excessivo de CPU
+    # Agendador por eventos: ticks de preço, saldos e comandos do Telegram
+    def run_and_report():
+        run_cycle()
+        # Notificações das ordens do ciclo saem em um único resumo
+        private_service.notifications.flush()
+        logger.debug(
+            f"Latência HTTP por host: {get_http_transport().get_latency_stats()}"
+        )
+        logger.debug(f"Relógio da Binance: {private_service.clock.get_metrics()}")
+        logger.debug(f"Limites da Binance: {get_rate_governor().get_metrics()}")
+        logger.debug(f"Cache de ativos: {asset_storage.get_metrics()}")
+        logger.debug(f"Telegram: {private_service.notifications.get_metrics()}")
+        if sheet_watcher is not None:
+            logger.debug(f"Planilha: {sheet_watcher.get_metrics()}")
+
+    scheduler = RebalanceScheduler(
+        run_and_report,
+        state_manager,
+        analysis.estimate_max_drift,
+        config["max_percentage_difference"],
+        drift_fraction=config["rebalance_drift_fraction"],
+        debounce=config["rebalance_debounce"],
+        max_staleness=config["rebalance_max_staleness"],
+    )
+    if price_stream is not None:
+        price_stream.add_listener(analysis.portfolio_manager.on_price_tick)
+        price_stream.add_listener(scheduler.on_price_tick)
+    if user_data_stream is not None:
+        # O saldo entra no modelo de valorização antes de o agendador estimar o desvio
+        user_data_stream.add_listener(analysis.portfolio_manager.on_balance_change)
+        user_data_stream.add_listener(scheduler.on_balance_change)
+    sheet_watcher = None
+    if config["sheet_watch_interval"] > 0:
+        # Metas da planilha recarregadas sem reiniciar (SHEET_WATCH_INTERVAL=0 desativa)
+        sheet_watcher = SheetWatcher(
+            config["planilha"],
+            db_manager,
+            interval=config["sheet_watch_interval"],
+            on_change=lambda changes: scheduler.notify(SHEET),
+            reader_mode=config["sheet_reader"],
+            remove_missing=config["sheet_watch_remove_missing"],
+            max_removed_fraction=config["sheet_max_removed_fraction"],
+        )
+        sheet_watcher.start()
+
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        logger.info("Execução interrompida pelo usuário.")
+    finally:
+        private_service.notifications.close()
+        db_manager.close()
+        # Por último, para não perder os logs do encerramento
+        _log_listener.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,14 @@
+import sys
+
+from core.database.asset_storage import migrate_tinydb_to_sqlite
+
+
+def migrate_db(json_path="crypto_db.json", sqlite_path="crypto_db.sqlite3"):
+    # Copia os ativos do TinyDB para o SQLite (modo WAL)
+    total = migrate_tinydb_to_sqlite(json_path, sqlite_path)
+    print(f"{total} ativo(s) migrado(s) de {json_path} para {sqlite_path}.")
+    print(f"Use DB_PATH={sqlite_path} para ativar o backend SQLite.")
+
+
+if __name__ == "__main__":
+    migrate_db(*sys.argv[1:3])
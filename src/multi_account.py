@@ -0,0 +1,34 @@
+import logging
+
+from config import get_config
+
+from core.use_cases.multi_account_runner import MultiAccountRunner, load_accounts
+
+# Configuração do logger
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    config = get_config()
+    accounts = load_accounts(config["accounts_file"])
+    logger.info(
+        f"Iniciando {len(accounts)} conta(s) em {config['multi_account_processes']} processo(s)..."
+    )
+    runner = MultiAccountRunner(
+        accounts,
+        processes=config["multi_account_processes"],
+        interval=config["multi_account_interval"],
+        weight_limit=config["rate_weight_limit"],
+        max_percentage_difference=config["max_percentage_difference"],
+    )
+    try:
+        runner.run()
+    except KeyboardInterrupt:
+        logger.info("Execução interrompida pelo usuário.")
+
+
+if __name__ == "__main__":
+    main()
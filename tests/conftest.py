@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Os scripts rodam de src/ (python src/main.py), onde fica o módulo config
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
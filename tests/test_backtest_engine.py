@@ -0,0 +1,174 @@
+import numpy as np
+import pytest
+
+from core.entities.symbol_rules import SymbolRules
+from core.use_cases.asset_analyzer import AssetAnalyzer
+from core.use_cases.backtest_engine import BacktestEngine
+
+
+def _drifting_prices(n_steps=500):
+    # Um ativo sobe 0,5% por candle e o outro fica parado: os pesos se afastam
+    # do alvo e o rebalanceamento precisa operar
+    steps = np.arange(n_steps)
+    return np.column_stack([100 * 1.005**steps, np.full(n_steps, 100.0)])
+
+
+def test_drifting_prices_produce_trades():
+    engine = BacktestEngine(
+        prices=_drifting_prices(),
+        target_percentual=[45.0, 45.0],
+        initial_value=1000.0,
+        meta_from_target=True,
+    )
+    results = engine.run([5.0, 10.0], [1.0, 1.0], [50.0, 50.0])
+
+    assert np.all(results["trades"] > 0)
+    assert np.all(results["fees"] > 0)
+
+
+def test_meta_moeda_is_required():
+    with pytest.raises(ValueError):
+        BacktestEngine(prices=_drifting_prices(), target_percentual=[45.0, 45.0])
+
+
+def _replay(prices, targets, rules, max_pct, min_order, max_order, fee, slippage):
+    # Ciclo a ciclo pelo caminho de produção: analisador escalar, ajustes do
+    # OrderExecutor e SymbolRules.format_quantity, com a execução do backtest
+    analyzer = AssetAnalyzer(None, max_pct)
+    quantities = targets / 100 * 1000.0 / prices[0]
+    cash = 1000.0 - float((quantities * prices[0]).sum())
+    preco_medio = prices[0].copy()
+    fills = []
+    for step_prices in prices:
+        holdings = quantities * step_prices
+        portfolio_value = holdings.sum() + cash
+        saved = {
+            rule.symbol.lower(): {
+                "percentual": targets[i],
+                "meta_moeda": targets[i] / 100 * portfolio_value / step_prices[i],
+                "preco_medio": preco_medio[i],
+            }
+            for i, rule in enumerate(rules)
+        }
+        orders = []
+        for i, rule in enumerate(rules):
+            asset = {
+                "name": rule.symbol,
+                "quantity": quantities[i],
+                "price": step_prices[i],
+                "percentual": holdings[i] / portfolio_value * 100,
+            }
+            recommendation = analyzer.analyze_asset_difference_percentual(
+                asset, saved, portfolio_value
+            )
+            action = recommendation["action"]
+            if action not in ("buy", "sell"):
+                continue
+            quantity = abs(recommendation["quantity"])
+            if quantity * step_prices[i] < min_order:
+                continue
+            if quantity * step_prices[i] > max_order:
+                quantity = max_order / step_prices[i]
+            quantity = float(rule.format_quantity(quantity))
+            if quantity <= 0 or quantity * step_prices[i] < rule.min_notional:
+                continue
+            if action == "sell" and quantity > quantities[i]:
+                continue
+            cost = quantity * step_prices[i] * (1 + slippage) * (1 + fee)
+            if action == "buy" and cost > cash:
+                continue
+            orders.append((i, action, quantity))
+        if not orders:
+            continue
+
+        for i, action, quantity in orders:
+            if action == "sell":
+                value = quantity * step_prices[i] * (1 - slippage)
+                cash += value - value * fee
+                quantities[i] -= quantity
+        # Compras na ordem dos ativos; o custo das rejeitadas também conta
+        available, spent = cash, 0.0
+        for i, action, quantity in orders:
+            if action != "buy":
+                continue
+            fill_price = step_prices[i] * (1 + slippage)
+            cost = quantity * fill_price * (1 + fee)
+            spent += cost
+            if spent > available:
+                continue
+            new_quantity = quantities[i] + quantity
+            preco_medio[i] = (
+                quantities[i] * preco_medio[i] + quantity * fill_price
+            ) / new_quantity
+            quantities[i] = new_quantity
+            cash -= cost
+        fills.append((quantities.copy(), cash))
+    return fills
+
+
+def test_matches_step_by_step_replay(monkeypatch):
+    monkeypatch.setenv("MIN_ORDER_VALUE", "6")
+    rng = np.random.default_rng(7)
+    steps = 400
+    prices = np.column_stack(
+        [
+            start * np.exp(np.cumsum(rng.normal(0, 0.01, steps)))
+            for start in (60000.0, 150.0, 0.5)
+        ]
+    )
+    targets = np.array([30.0, 30.0, 30.0])
+    rules = [
+        SymbolRules("BTCUSDT", "0.00001", "0.00001", "5", "inf", "0.01"),
+        SymbolRules("SOLUSDT", "0.001", "0.001", "5", "inf", "0.01"),
+        SymbolRules("ADAUSDT", "0.1", "0.1", "5", "inf", "0.0001"),
+    ]
+    fee, slippage = 0.001, 0.0005
+    grid = {"max_pct": [3.0, 8.0], "min_order": [6.0, 6.0], "max_order": [20.0, 50.0]}
+
+    # Registra as posições após cada ordem executada pelo backtest
+    engine_fills = {0: [], 1: []}
+    fill = BacktestEngine._fill
+
+    def recording_fill(self, prices, orders, state, rows):
+        before = state["quantities"][rows].copy()
+        fill(self, prices, orders, state, rows)
+        for j, row in enumerate(rows):
+            if np.any(state["quantities"][row] != before[j]):
+                engine_fills[row].append(
+                    (state["quantities"][row].copy(), state["cash"][row])
+                )
+
+    monkeypatch.setattr(BacktestEngine, "_fill", recording_fill)
+    engine = BacktestEngine(
+        prices=prices,
+        target_percentual=targets,
+        meta_from_target=True,
+        step_size=[rule.step_size for rule in rules],
+        min_notional=[rule.min_notional for rule in rules],
+        fee_rate=fee,
+        slippage=slippage,
+    )
+    results = engine.run(grid["max_pct"], grid["min_order"], grid["max_order"])
+
+    for row in (0, 1):
+        expected = _replay(
+            prices,
+            targets,
+            rules,
+            grid["max_pct"][row],
+            grid["min_order"][row],
+            grid["max_order"][row],
+            fee,
+            slippage,
+        )
+        assert len(expected) > 5
+        assert len(engine_fills[row]) == len(expected)
+        for (quantities, cash), (expected_quantities, expected_cash) in zip(
+            engine_fills[row], expected
+        ):
+            np.testing.assert_allclose(quantities, expected_quantities, rtol=1e-9)
+            assert cash == pytest.approx(expected_cash)
+        final_quantities, final_cash = expected[-1]
+        assert results["final_value"][row] == pytest.approx(
+            float((final_quantities * prices[-1]).sum()) + final_cash
+        )
@@ -0,0 +1,90 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from core.services.binance_price_stream import BinancePriceStream
+from fake_binance_server import (
+    FakeExchange,
+    _ThreadingTCPServer,
+    make_ws_handler,
+)
+
+
+@pytest.fixture
+def exchange():
+    return FakeExchange(api_key="key", api_secret="secret", balances={})
+
+
+@pytest.fixture
+def server(exchange):
+    # Guarda os sockets aceitos para o teste poder derrubar a conexão
+    handler = make_ws_handler(exchange)
+    sockets = []
+
+    class RecordingHandler(handler):
+        def setup(self):
+            sockets.append(self.request)
+
+    server = _ThreadingTCPServer(("127.0.0.1", 0), RecordingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.sockets = sockets
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def stream(server):
+    host, port = server.server_address
+    stream = BinancePriceStream(ws_url=f"ws://{host}:{port}/ws", max_backoff=1.0)
+    yield stream
+    stream.stop()
+
+
+def _tick_until(exchange, condition, timeout=5.0):
+    # Os preços só são publicados a cada tick; avança até a condição valer
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        exchange.tick()
+        time.sleep(0.02)
+    return condition()
+
+
+def _price(exchange, symbol):
+    return float(exchange._fmt_price(exchange.markets[symbol]))
+
+
+def test_subscribe_and_tick(exchange, stream):
+    received = []
+    stream.add_listener(lambda symbol, price: received.append((symbol, price)))
+    stream.subscribe(["btcusdt"])
+    stream.start()
+
+    assert _tick_until(exchange, lambda: stream.get_price("BTCUSDT") is not None)
+    assert stream.get_price("BTCUSDT") == pytest.approx(
+        _price(exchange, "BTCUSDT"), rel=0.01
+    )
+    assert received and received[0][0] == "BTCUSDT"
+
+    # Assinatura feita com a conexão aberta também passa a receber ticks
+    stream.subscribe(["ETHUSDT"])
+    assert _tick_until(exchange, lambda: stream.get_price("ETHUSDT") is not None)
+    assert stream.get_price("SOLUSDT") is None
+
+
+def test_reconnect_resubscribes(exchange, server, stream):
+    stream.subscribe(["BTCUSDT"])
+    stream.start()
+    assert _tick_until(exchange, lambda: stream.get_price("BTCUSDT") is not None)
+
+    server.sockets[-1].shutdown(socket.SHUT_RDWR)
+    assert _tick_until(exchange, lambda: stream.reconnects == 1)
+    assert _tick_until(exchange, lambda: len(server.sockets) == 2 and stream.connected)
+
+    # A nova conexão começa sem streams: o preço só chega se houve nova assinatura
+    stream.prices.clear()
+    assert _tick_until(exchange, lambda: stream.get_price("BTCUSDT") is not None)
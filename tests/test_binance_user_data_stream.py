@@ -0,0 +1,52 @@
+from core.services.binance_user_data_stream import BalanceBook
+
+
+def _book(free=15.0, update_time=1000):
+    book = BalanceBook()
+    book.apply_snapshot(
+        [{"asset": "USDT", "free": str(free), "locked": "0"}], update_time
+    )
+    return book
+
+
+def _deposit(amount, clear_time):
+    return {"e": "balanceUpdate", "a": "USDT", "d": str(amount), "T": clear_time}
+
+
+def _position(free, update_time):
+    return {
+        "e": "outboundAccountPosition",
+        "u": update_time,
+        "B": [{"a": "USDT", "f": str(free), "l": "0"}],
+    }
+
+
+def test_balance_update_is_applied_once():
+    book = _book()
+    book.apply_balance_update(_deposit(5, 2000))
+    book.apply_balance_update(_deposit(5, 2000))
+
+    assert book.balances["USDT"]["free"] == 20.0
+
+
+def test_balance_update_after_account_position_is_not_counted_twice():
+    book = _book()
+    book.apply_account_position(_position(20, 2000))
+    book.apply_balance_update(_deposit(5, 2000))
+
+    assert book.balances["USDT"]["free"] == 20.0
+
+
+def test_balance_update_already_in_snapshot_is_ignored():
+    book = _book(free=20.0, update_time=3000)
+    book.apply_balance_update(_deposit(5, 2000))
+
+    assert book.balances["USDT"]["free"] == 20.0
+
+
+def test_late_account_position_does_not_overwrite_newer_state():
+    book = _book()
+    book.apply_account_position(_position(30, 3000))
+    book.apply_account_position(_position(20, 2000))
+
+    assert book.balances["USDT"]["free"] == 30.0
@@ -0,0 +1,32 @@
+import numpy as np
+
+from core.database.kline_store import KlineStore
+
+
+def _klines(start, count):
+    return [
+        [start + i * 60_000, 1.0 + i, 2.0 + i, 0.5 + i, 1.5 + i, 10.0 + i]
+        for i in range(count)
+    ]
+
+
+def test_torn_write_is_repaired(tmp_path):
+    store = KlineStore(str(tmp_path), interval="1m")
+    store.append("BTCUSDT", _klines(0, 3))
+
+    # Anexação interrompida: as demais colunas ganharam a linha inteira e o
+    # open_time (gravado por último) só 3 bytes
+    torn = np.array(_klines(180_000, 1)[0][1:], dtype=np.float64)
+    for column, value in zip(("open", "high", "low", "close", "volume"), torn):
+        with open(store._column_path("BTCUSDT", column), "ab") as file:
+            file.write(value.tobytes())
+    with open(store._column_path("BTCUSDT", "open_time"), "ab") as file:
+        file.write(np.int64(180_000).tobytes()[:3])
+
+    store = KlineStore(str(tmp_path), interval="1m")
+    assert store.count("BTCUSDT") == 3
+    assert store.last_open_time("BTCUSDT") == 120_000
+
+    assert store.append("BTCUSDT", _klines(180_000, 2)) == 2
+    assert store.count("BTCUSDT") == 5
+    assert store.last_open_time("BTCUSDT") == 240_000
@@ -0,0 +1,61 @@
+import pytest
+
+from core.database.asset_storage import TinyDBAssetStorage
+from core.database.crypto_assets_manager import CryptoAssetsManager
+from core.database.google_sheet_crypto_reader import GoogleSheetCryptoReader
+from core.use_cases.sync_crypto_data import apply_crypto_assets
+
+HEADER = "Crypto,Preço Médio,Percentual,Pontos,meta Moeda,Total (Carteira)\n"
+
+
+def _asset(crypto, preco_medio=10.0, percentual=50.0):
+    return {
+        "crypto": crypto,
+        "preco_medio": preco_medio,
+        "percentual": percentual,
+        "pontos": 1.0,
+        "meta_moeda": 2.0,
+        "total_carteira": None,
+    }
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = CryptoAssetsManager(
+        storage=TinyDBAssetStorage(str(tmp_path / "crypto_db.json"))
+    )
+    manager.apply_changes([_asset("BTC"), _asset("ETH")])
+    yield manager
+    manager.close()
+
+
+@pytest.mark.parametrize("body", [b"", HEADER.encode("utf-8")])
+def test_empty_sheet_is_not_applied(manager, body):
+    parsed = GoogleSheetCryptoReader("").parse_crypto_assets(body)
+
+    with pytest.raises(ValueError):
+        apply_crypto_assets(parsed, manager)
+    assert {asset["crypto"] for asset in manager.get_all_assets()} == {"BTC", "ETH"}
+
+
+def test_removals_above_limit_are_not_applied(manager):
+    with pytest.raises(ValueError):
+        apply_crypto_assets({"BTC": _asset("BTC")}, manager, max_removed_fraction=0.2)
+    assert len(manager.get_all_assets()) == 2
+
+    changes = apply_crypto_assets({"BTC": _asset("BTC")}, manager, remove_missing=False)
+    assert changes["removed"] == []
+
+
+def test_sheet_does_not_override_preco_medio(manager):
+    # Preço médio atualizado pelo bot depois de uma compra
+    manager.apply_changes([_asset("BTC", preco_medio=12.5)])
+
+    changes = apply_crypto_assets(
+        {"BTC": _asset("BTC", percentual=60.0), "ETH": _asset("ETH")}, manager
+    )
+
+    assert changes["changed"] == ["BTC"]
+    btc = manager.get_asset_data("BTC")
+    assert btc["percentual"] == 60.0
+    assert btc["preco_medio"] == 12.5
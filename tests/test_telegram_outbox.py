@@ -0,0 +1,67 @@
+import pytest
+import requests
+
+from core.services import telegram_outbox
+from core.services.telegram_outbox import TelegramOutbox
+
+
+class _FakeNotifier:
+    def __init__(self, *failures):
+        # Falhas devolvidas nas primeiras chamadas, na ordem
+        self.failures = list(failures)
+        self.calls = 0
+
+    def deliver(self, message, chat_id):
+        self.calls += 1
+        if self.failures:
+            failure = self.failures.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            return failure
+        return None
+
+
+def _http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.exceptions.HTTPError(f"HTTP {status_code}", response=response)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(telegram_outbox.time, "sleep", lambda seconds: None)
+
+
+def _send(notifier):
+    outbox = TelegramOutbox(notifier, min_interval=0.0)
+    outbox.enqueue("Ordem executada", chat_id=1)
+    outbox.close()
+    return outbox
+
+
+@pytest.mark.parametrize(
+    "failure",
+    [
+        1.0,
+        _http_error(502),
+        requests.exceptions.ConnectionError("reset"),
+        requests.exceptions.Timeout("timeout"),
+    ],
+)
+def test_transient_errors_are_retried(failure):
+    notifier = _FakeNotifier(failure)
+    outbox = _send(notifier)
+
+    assert notifier.calls == 2
+    assert outbox.sent == 1
+    assert outbox.dropped == 0
+
+
+@pytest.mark.parametrize("status_code", [400, 403])
+def test_client_errors_are_dropped_at_once(status_code):
+    notifier = _FakeNotifier(_http_error(status_code))
+    outbox = _send(notifier)
+
+    assert notifier.calls == 1
+    assert outbox.sent == 0
+    assert outbox.dropped == 1
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from config import get_config
+from core.use_cases.asset_analyzer import AssetAnalyzer
+
+MAX_PERCENTAGE_DIFFERENCE = 10.0
+
+
+class _SavedAssets:
+    def __init__(self, assets):
+        self.assets = assets
+
+    def get_all_assets(self):
+        return self.assets
+
+
+def _random_portfolio(rng):
+    # Ativos fora do banco, quantidades zeradas e preço médio acima do atual
+    # (que bloqueia a venda) aparecem em boa parte das carteiras
+    asset_details, saved_assets = [], []
+    for i in range(rng.randint(1, 12)):
+        name = f"COIN{i}"
+        price = 10 ** rng.uniform(-3, 4)
+        quantity = 0.0 if rng.random() < 0.15 else 10 ** rng.uniform(-2, 2) / price
+        asset_details.append({"name": name, "quantity": quantity, "price": price})
+        if rng.random() < 0.15:
+            continue
+        saved_assets.append(
+            {
+                "crypto": name,
+                "preco_medio": price * rng.uniform(0.5, 1.5),
+                "percentual": rng.uniform(1.0, 30.0),
+                "pontos": 1.0,
+                "meta_moeda": quantity * rng.uniform(0.0, 2.0),
+                "total_carteira": None,
+            }
+        )
+
+    portfolio_value = sum(a["quantity"] * a["price"] for a in asset_details)
+    for asset in asset_details:
+        value = asset["quantity"] * asset["price"]
+        asset["percentual"] = value / portfolio_value * 100 if portfolio_value else 0.0
+    return asset_details, saved_assets, portfolio_value
+
+
+def test_vectorized_matches_scalar_on_random_portfolios():
+    rng = random.Random(42)
+    seen = set()
+    for _ in range(300):
+        asset_details, saved_assets, portfolio_value = _random_portfolio(rng)
+        if portfolio_value == 0:
+            continue
+        db_manager = _SavedAssets(saved_assets)
+        scalar = AssetAnalyzer(
+            db_manager, MAX_PERCENTAGE_DIFFERENCE
+        ).analyze_differences(asset_details, portfolio_value)
+        vectorized = AssetAnalyzer(
+            db_manager, MAX_PERCENTAGE_DIFFERENCE, vectorized=True
+        ).analyze_differences(asset_details, portfolio_value)
+
+        assert len(vectorized) == len(scalar)
+        saved = {s["crypto"].lower(): s for s in saved_assets}
+        for asset, expected, actual in zip(asset_details, scalar, vectorized):
+            assert actual["name"] == expected["name"]
+            assert actual["action"] == expected["action"]
+            assert actual["price"] == expected["price"]
+            if "quantity" in expected:
+                assert actual["quantity"] == pytest.approx(expected["quantity"])
+
+            seen.add(expected["action"])
+            if asset["quantity"] == 0:
+                seen.add("zero_quantity")
+            saved_asset = saved.get(asset["name"].lower())
+            if (
+                saved_asset
+                and expected["action"] == "hold"
+                and expected["difference"] > MAX_PERCENTAGE_DIFFERENCE
+                and asset["price"] <= saved_asset["preco_medio"]
+                and abs(expected["difference_total"] * asset["price"])
+                >= get_config()["min_order_value"]
+            ):
+                seen.add("preco_medio_guard")
+
+    assert seen >= {"buy", "sell", "hold", "sell_all", "zero_quantity"}
+    assert "preco_medio_guard" in seen